@@ -0,0 +1,66 @@
+import asyncio
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+from ulid import ulid
+
+from src.auth.authorization import AUTH_PATH, EnforcerRegistry, get_enforcer
+from src.schemas.users import RoleEnum, UserDB
+
+
+def make_user(role: RoleEnum) -> UserDB:
+    return UserDB(
+        id=ulid(),
+        username=f'{role.value}-{ulid()}',
+        password='hash',
+        role=role,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+async def enforce_uncached(subject, resource) -> bool:
+    enforcer = await get_enforcer(
+        str(AUTH_PATH / 'models' / 'user_model.conf'),
+        str(AUTH_PATH / 'policies' / 'user_policy.csv'),
+    )
+    return enforcer.enforce(subject, resource, 'update')
+
+
+async def enforce_cached(registry: EnforcerRegistry, subject, resource):
+    enforcer = await registry.get('user')
+    return enforcer.enforce(subject, resource, 'update')
+
+
+async def measure(label: str, decisions: int, decide) -> float:
+    start = time.perf_counter()
+    for _ in range(decisions):
+        await decide()
+    elapsed = time.perf_counter() - start
+    rate = decisions / elapsed
+    print(f'{label:<10} {decisions:>8} decisões  {rate:>12.0f} decisões/s')
+    return rate
+
+
+async def main(decisions: int):
+    admin = make_user(RoleEnum.ADMIN)
+    reader = make_user(RoleEnum.READER)
+    registry = EnforcerRegistry()
+
+    before = await measure(
+        'antes', decisions, lambda: enforce_uncached(admin, reader)
+    )
+    after = await measure(
+        'depois', decisions, lambda: enforce_cached(registry, admin, reader)
+    )
+    print(f'ganho: {after / before:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Decisões de autorização por segundo com e sem cache'
+    )
+    parser.add_argument('--decisions', type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.decisions))
@@ -0,0 +1,75 @@
+import random
+import string
+import time
+from argparse import ArgumentParser
+
+from benchmarks.common import format_summary, summarize
+from src.autocomplete import TitleIndex, normalize_title
+
+
+def make_titles(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    words = [
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(5_000)
+    ]
+    return [
+        dict(
+            _id=f'{index:026d}',
+            title=' '.join(rng.choices(words, k=rng.randint(1, 4))).title(),
+            alternatives_titles=[' '.join(rng.choices(words, k=2))],
+        )
+        for index in range(count)
+    ]
+
+
+def measure_lookups(
+    index: TitleIndex, prefixes: list[str], limit: int
+) -> list[float]:
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        index.search(normalize_title(prefix), limit)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main(titles: int, lookups: int, limit: int):
+    documents = make_titles(titles, seed=42)
+
+    start = time.perf_counter()
+    index = TitleIndex.build(documents)
+    print(
+        f'build de {titles} títulos  {time.perf_counter() - start:.2f}s '
+        f'({len(index)} chaves)'
+    )
+
+    rng = random.Random(7)
+    prefixes = [
+        document['title'][: rng.randint(1, 6)]
+        for document in rng.choices(documents, k=lookups)
+    ]
+    latencies = measure_lookups(index, prefixes, limit)
+    print(format_summary('busca por prefixo', summarize(latencies)))
+    print(
+        f'média da busca           '
+        f'{sum(latencies) / len(latencies) * 1e6:.1f}µs/operação'
+    )
+
+    start = time.perf_counter()
+    for document in documents[:1_000]:
+        title = f'Renamed {document["_id"]}'
+        index.add(document['_id'], title, [normalize_title(title)])
+    print(
+        f'add (atualização)        '
+        f'{(time.perf_counter() - start) * 1e3:.3f}µs/operação'
+    )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Latência do índice de autocomplete')
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+    main(args.titles, args.lookups, args.limit)
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from argparse import ArgumentParser
+
+import httpx
+from ulid import ulid
+
+from src.app import app
+from src.database import create_db_client, create_indexes, get_db
+
+BULK_SIZE = 1_000
+
+
+def make_input(position: int) -> dict:
+    return dict(
+        title=f'Importado {position} {ulid()}',
+        alternativesTitles=[f'Alternativo {position}'],
+        description='Descrição importada. ' * 20,
+        originalLanguage='ja',
+        status='ongoing',
+        contentRating='safe',
+        year=2000 + position % 25,
+    )
+
+
+async def single_inserts(
+    client: httpx.AsyncClient, documents: int, concurrency: int
+) -> float:
+    inputs = iter([make_input(n) for n in range(documents)])
+
+    async def worker():
+        for manga in inputs:
+            await client.post('/mangas/', json=manga)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def bulk_inserts(client: httpx.AsyncClient, documents: int) -> float:
+    inputs = [make_input(n) for n in range(documents)]
+
+    start = time.perf_counter()
+    for offset in range(0, documents, BULK_SIZE):
+        await client.post(
+            '/mangas/bulk', json=inputs[offset : offset + BULK_SIZE]
+        )
+    return time.perf_counter() - start
+
+
+async def main(database: str, documents: int, concurrency: int):
+    db_client = create_db_client()
+    await db_client.drop_database(database)
+    db = db_client.get_database(database)
+    await create_indexes(db)
+
+    app.state.db_client = db_client
+    app.dependency_overrides[get_db] = lambda: db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench', timeout=None
+    ) as client:
+        single = await single_inserts(client, documents, concurrency)
+        bulk = await bulk_inserts(client, documents)
+
+    print(f'POST /mangas/      {documents / single:>10.0f} documentos/s')
+    print(f'POST /mangas/bulk  {documents / bulk:>10.0f} documentos/s')
+    print(f'ganho: {single / bulk:.1f}x')
+
+    app.dependency_overrides.clear()
+    await db_client.drop_database(database)
+    await db_client.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Vazão de importação: inserções unitárias contra bulk'
+    )
+    parser.add_argument('--database', default='mangify_bench_bulk')
+    parser.add_argument('--documents', type=int, default=10_000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.database, args.documents, args.concurrency))
@@ -0,0 +1,147 @@
+import asyncio
+from argparse import ArgumentParser
+from collections import Counter
+from contextlib import AsyncExitStack
+
+import httpx
+
+from benchmarks.common import format_summary, summarize, timed_request
+from src.rate_limit import login_concurrency
+
+USERNAME = 'bench-login-flood'
+PASSWORD = 'bench-password'
+PROBE_ADDRESS = ('127.0.0.1', 40_000)
+
+
+def worker_address(number: int) -> tuple[str, int]:
+    return f'10.0.{number // 250}.{number % 250 + 1}', 40_000
+
+
+def make_client(
+    base_url: str | None, app, address: tuple[str, int]
+) -> httpx.AsyncClient:
+    if app is None:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+    # Em processo, cada worker sai de um IP próprio, como clientes
+    # distintos; com um IP só, o limite por IP barraria quase tudo antes do
+    # limite por username e do argon2.
+    transport = httpx.ASGITransport(app=app, client=address)
+    return httpx.AsyncClient(
+        transport=transport, base_url='http://bench', timeout=60
+    )
+
+
+async def probe_catalog(
+    client: httpx.AsyncClient, stop: asyncio.Event, interval: float
+) -> tuple[list[float], list[int]]:
+    # Em processo, a ocupação de login_concurrency mostra se o argon2 está
+    # de fato saturado enquanto o catálogo é medido.
+    latencies, active = [], []
+    while not stop.is_set():
+        elapsed, _ = await timed_request(client, 'GET', '/mangas/')
+        latencies.append(elapsed)
+        active.append(login_concurrency.active)
+        await asyncio.sleep(interval)
+    return latencies, active
+
+
+async def flood_logins(
+    clients: list[httpx.AsyncClient], logins: int, usernames: int
+) -> Counter:
+    statuses = Counter()
+    queue = iter(range(logins))
+
+    async def worker(client: httpx.AsyncClient):
+        for attempt in queue:
+            # Com --usernames > 1 simula credential stuffing: a maioria dos
+            # nomes não existe e cada tentativa usa um nome diferente.
+            username = (
+                USERNAME
+                if usernames == 1
+                else f'stuffing-{attempt % usernames}'
+            )
+            response = await client.post(
+                '/auth/token',
+                data={'username': username, 'password': PASSWORD},
+            )
+            statuses[response.status_code] += 1
+
+    await asyncio.gather(*(worker(client) for client in clients))
+    return statuses
+
+
+async def main(
+    base_url: str | None,
+    logins: int,
+    concurrency: int,
+    probes: int,
+    usernames: int,
+):
+    async with AsyncExitStack() as stack:
+        app = None
+        if base_url is None:
+            from src.app import app  # noqa: PLC0415
+
+            await stack.enter_async_context(app.router.lifespan_context(app))
+
+        client = await stack.enter_async_context(
+            make_client(base_url, app, PROBE_ADDRESS)
+        )
+        workers = [
+            await stack.enter_async_context(
+                make_client(base_url, app, worker_address(number))
+            )
+            for number in range(concurrency)
+        ]
+        await client.post(
+            '/users/', json=dict(username=USERNAME, password=PASSWORD)
+        )
+
+        idle = []
+        for _ in range(probes):
+            elapsed, _ = await timed_request(client, 'GET', '/mangas/')
+            idle.append(elapsed)
+        print(format_summary('GET /mangas/ ocioso', summarize(idle)))
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_catalog(client, stop, 0.01))
+        statuses = await flood_logins(workers, logins, usernames)
+        stop.set()
+        loaded, active = await probe
+
+        print(format_summary('GET /mangas/ sob logins', summarize(loaded)))
+        print('respostas de /auth/token:', dict(statuses))
+        if base_url is None and active:
+            saturated = sum(
+                value >= login_concurrency.limit for value in active
+            )
+            print(
+                f'argon2 ocupado: {max(active)}/{login_concurrency.limit} '
+                f'no pico, saturado em {saturated / len(active):.0%} '
+                'das sondas'
+            )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Latência de GET /mangas/ durante uma onda de logins'
+    )
+    parser.add_argument(
+        '--base-url',
+        help='Servidor remoto; sem ele a app roda em processo com um IP '
+        'por worker. Remotamente todas as tentativas saem de um IP só',
+    )
+    parser.add_argument('--logins', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--probes', type=int, default=100)
+    parser.add_argument('--usernames', type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.base_url,
+            args.logins,
+            args.concurrency,
+            args.probes,
+            args.usernames,
+        )
+    )
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from argparse import ArgumentParser
+from types import SimpleNamespace
+
+from src.metrics import CommandMetrics, MetricsMiddleware, registry
+
+ROUTE = SimpleNamespace(path='/mangas/{manga_id}')
+
+
+async def endpoint(scope, receive, send):
+    scope['route'] = ROUTE
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'{}'})
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b''}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {'type': 'http', 'method': 'GET', 'path': '/mangas/1'}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def measure_listener(events: int) -> float:
+    listener = CommandMetrics()
+    event = SimpleNamespace(duration_micros=1200, command_name='find')
+    start = time.perf_counter()
+    for _ in range(events):
+        listener.succeeded(event)
+    return (time.perf_counter() - start) / events
+
+
+async def main(requests: int):
+    bare = await measure(endpoint, requests)
+    instrumented = await measure(MetricsMiddleware(endpoint), requests)
+    print(f'sem middleware          {bare * 1e6:.2f}µs/requisição')
+    print(f'com MetricsMiddleware   {instrumented * 1e6:.2f}µs/requisição')
+    print(f'custo do middleware     {(instrumented - bare) * 1e6:.2f}µs')
+    print(f'CommandListener         {measure_listener(requests) * 1e6:.2f}µs')
+
+    start = time.perf_counter()
+    body = registry.render()
+    print(
+        f'render de /metrics      {(time.perf_counter() - start) * 1e3:.2f}ms '
+        f'({len(body)} bytes)'
+    )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Custo da instrumentação por request')
+    parser.add_argument('--requests', type=int, default=200_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+import httpx
+from ulid import ulid
+
+from benchmarks.common import format_summary, summarize
+from src.app import app
+from src.database import create_db_client, create_indexes, get_db
+from src.schemas.mangas import (
+    ContentRatingEnum,
+    DemographicEnum,
+    MangaType,
+    StateEnum,
+    StatusEnum,
+)
+
+LIST_FIELDS = 'title,status,contentRating'
+
+
+def make_manga(position: int) -> MangaType:
+    return MangaType(
+        _id=ulid(),
+        title=f'Manga de benchmark {position}',
+        alternatives_titles=[f'Título alternativo {n}' for n in range(8)],
+        description='Uma descrição longa de manga. ' * 60,
+        original_language='ja',
+        publication_demographic=DemographicEnum.SEINEN,
+        status=StatusEnum.ONGOING,
+        year=2000 + position % 25,
+        content_rating=ContentRatingEnum.SAFE,
+        state=StateEnum.PUBLISHED,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+async def seed(db, documents: int, batch_size: int = 5_000):
+    collection = db.get_collection('mangas')
+    existing = await collection.estimated_document_count()
+    for start in range(existing, documents, batch_size):
+        await collection.insert_many([
+            make_manga(position)
+            for position in range(start, min(start + batch_size, documents))
+        ])
+
+
+async def walk_pages(
+    client: httpx.AsyncClient, pages: int, limit: int, fields: str | None
+):
+    latencies, sizes = [], []
+    params = dict(limit=limit)
+    if fields is not None:
+        params['fields'] = fields
+
+    for _ in range(pages):
+        start = time.perf_counter()
+        response = await client.get('/mangas/', params=params)
+        latencies.append(time.perf_counter() - start)
+        sizes.append(len(response.content))
+        params['after'] = response.json()['nextCursor']
+        if params['after'] is None:
+            params.pop('after')
+    return latencies, sizes
+
+
+async def stream_catalog(client: httpx.AsyncClient, fields: str | None):
+    params = dict(stream=True)
+    if fields is not None:
+        params['fields'] = fields
+
+    start = time.perf_counter()
+    size = 0
+    async with client.stream('GET', '/mangas/', params=params) as response:
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+    return time.perf_counter() - start, size
+
+
+async def main(database: str, documents: int, pages: int, limit: int):
+    db_client = create_db_client()
+    db = db_client.get_database(database)
+    await create_indexes(db)
+    await seed(db, documents)
+
+    app.state.db_client = db_client
+    app.dependency_overrides[get_db] = lambda: db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench', timeout=None
+    ) as client:
+        for label, fields in [('completo', None), ('fields=', LIST_FIELDS)]:
+            latencies, sizes = await walk_pages(client, pages, limit, fields)
+            print(
+                format_summary(f'página ({label})', summarize(latencies)),
+                f'bytes/página={sum(sizes) / len(sizes):.0f}',
+            )
+            elapsed, size = await stream_catalog(client, fields)
+            print(
+                f'{"catálogo (" + label + ")":<24} {elapsed:.2f}s '
+                f'{size / 1_000_000:.1f}MB'
+            )
+
+    app.dependency_overrides.clear()
+    await db_client.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Tamanho e latência das listagens com e sem fields='
+    )
+    parser.add_argument('--database', default='mangify_bench')
+    parser.add_argument('--documents', type=int, default=100_000)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.database, args.documents, args.pages, args.limit))
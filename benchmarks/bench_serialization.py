@@ -0,0 +1,72 @@
+import json
+import time
+from argparse import ArgumentParser
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.bench_projection import make_manga
+from src.responses import ModelResponse, get_adapter
+from src.schemas.mangas import MangaList
+
+
+def response_model_path(page: dict) -> bytes:
+    # O que o FastAPI faz com um dict retornado e response_model=MangaList:
+    # valida, converte para tipos JSON em Python e codifica com json.dumps.
+    adapter = get_adapter(MangaList)
+    value = adapter.validate_python(page)
+    content = adapter.dump_python(value, mode='json', by_alias=True)
+    return JSONResponse(content).body
+
+
+def jsonable_encoder_path(page: dict) -> bytes:
+    model = MangaList.model_validate(page)
+    return JSONResponse(jsonable_encoder(model, by_alias=True)).body
+
+
+def model_response_path(page: dict) -> bytes:
+    return ModelResponse(MangaList, page).body
+
+
+PATHS = {
+    'response_model': response_model_path,
+    'jsonable_encoder': jsonable_encoder_path,
+    'model_response': model_response_path,
+}
+
+
+def measure(render, page: dict, rounds: int) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        render(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = ArgumentParser(
+        description='Custo de serialização de páginas de mangas.'
+    )
+    parser.add_argument('--documents', type=int, default=1_000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    page = dict(data=[make_manga(n) for n in range(args.documents)])
+    outputs = {name: json.loads(render(page)) for name, render in PATHS.items()}
+    assert all(
+        output == outputs['response_model'] for output in outputs.values()
+    )
+
+    baseline = measure(response_model_path, page, args.rounds)
+    for name, render in PATHS.items():
+        elapsed = measure(render, page, args.rounds)
+        per_thousand = elapsed * 1000 / args.documents * 1000
+        print(
+            f'{name:<18} {per_thousand:7.2f}ms/1k docs '
+            f'({baseline / elapsed:.2f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import asyncio
+import random
+import time
+from argparse import ArgumentParser
+
+from src.view_counter import ViewCounter
+
+
+class CountingCollection:
+    def __init__(self):
+        self.round_trips = 0
+        self.operations = 0
+
+    async def bulk_write(self, operations, ordered):
+        self.round_trips += 1
+        self.operations += len(operations)
+
+
+def make_views(views: int, mangas: int, skew: float, seed: int) -> list[str]:
+    # Popularidade em lei de potência: poucos mangas concentram as visitas.
+    rng = random.Random(seed)
+    weights = [1 / (rank**skew) for rank in range(1, mangas + 1)]
+    return [
+        str(index) for index in rng.choices(range(mangas), weights, k=views)
+    ]
+
+
+async def main(  # noqa: PLR0913, PLR0917
+    views: int,
+    mangas: int,
+    rate: float,
+    flush_seconds: float,
+    max_pending: int,
+    skew: float,
+):
+    stream = make_views(views, mangas, skew, seed=42)
+    counter = ViewCounter(flush_seconds, max_pending)
+    collection = CountingCollection()
+
+    # O relógio é simulado: `rate` visualizações por segundo, flush quando
+    # a janela fecha ou quando o buffer enche, como no loop do ViewCounter.
+    per_window = max(1, int(rate * flush_seconds))
+    start = time.perf_counter()
+    for position, manga_id in enumerate(stream, start=1):
+        counter.increment(manga_id)
+        if position % per_window == 0 or counter.pending_total >= max_pending:
+            await counter.flush(collection)
+    await counter.flush(collection)
+    elapsed = time.perf_counter() - start
+
+    print(f'visualizações            {views}')
+    print(f'$inc por requisição      {views} escritas, {views} round-trips')
+    label = f'buffer de {flush_seconds:g}s'
+    print(
+        f'{label:<25}{collection.operations} escritas, '
+        f'{collection.round_trips} round-trips'
+    )
+    print(f'amplificação             {collection.operations / views:.4f}')
+    print(f'custo do increment       {elapsed / views * 1e6:.2f}µs')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Escritas geradas pelos contadores de visualização'
+    )
+    parser.add_argument('--views', type=int, default=1_000_000)
+    parser.add_argument('--mangas', type=int, default=100_000)
+    parser.add_argument('--rate', type=float, default=2_000)
+    parser.add_argument('--flush-seconds', type=float, default=5)
+    parser.add_argument('--max-pending', type=int, default=10_000)
+    parser.add_argument('--skew', type=float, default=1.1)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.views,
+            args.mangas,
+            args.rate,
+            args.flush_seconds,
+            args.max_pending,
+            args.skew,
+        )
+    )
@@ -0,0 +1,34 @@
+import time
+from statistics import quantiles
+
+import httpx
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    if len(latencies) < 2:  # noqa: PLR2004
+        value = latencies[0] * 1000 if latencies else 0.0
+        return dict(count=len(latencies), p50=value, p95=value, p99=value)
+
+    cuts = quantiles(latencies, n=100, method='inclusive')
+    return dict(
+        count=len(latencies),
+        p50=cuts[49] * 1000,
+        p95=cuts[94] * 1000,
+        p99=cuts[98] * 1000,
+    )
+
+
+def format_summary(label: str, summary: dict[str, float]) -> str:
+    return (
+        f'{label:<24} n={summary["count"]:<6} '
+        f'p50={summary["p50"]:.1f}ms p95={summary["p95"]:.1f}ms '
+        f'p99={summary["p99"]:.1f}ms'
+    )
+
+
+async def timed_request(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs
+) -> tuple[float, httpx.Response]:
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return time.perf_counter() - start, response
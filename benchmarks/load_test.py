@@ -0,0 +1,410 @@
+"""Teste de carga reproduzível da API.
+
+Sobe um MongoDB descartável com testcontainers (ou usa --database-url),
+popula usuários e mangas, e dispara requisições concorrentes contra as
+rotas de auth, users e mangas. O resultado é gravado em JSON e pode ser
+comparado com um baseline:
+
+    python -m benchmarks.load_test run --output atual.json
+    python -m benchmarks.load_test compare baseline.json atual.json
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from pathlib import Path
+
+import httpx
+from ulid import ulid
+
+from benchmarks.bench_projection import make_manga
+from benchmarks.common import format_summary, summarize
+from src.database import create_db_client, create_indexes
+from src.rate_limit import login_ip_limiter, login_username_limiter
+from src.schemas.users import RoleEnum, UserType
+from src.security import get_password_hash
+from src.settings import settings
+
+MONGO_IMAGE = 'mongo:8.0'
+PASSWORD = 'bench-password'
+SEARCH_TERMS = ('benchmark', 'manga', 'alternativo')
+
+
+@dataclass
+class LoadContext:
+    user_ids: list[str]
+    manga_ids: list[str]
+    tokens: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def login_ids(self) -> list[str]:
+        # Usuários com sessão podem trocar de username em users.update,
+        # então os logins usam os demais.
+        return self.user_ids[len(self.tokens) :] or self.user_ids
+
+    def auth(self, user_id: str) -> dict[str, str]:
+        return {'Authorization': f'Bearer {self.tokens[user_id]}'}
+
+
+async def login(client: httpx.AsyncClient, context, rng):
+    user_id = rng.choice(context.login_ids)
+    return await client.post(
+        '/auth/token',
+        data={'username': f'bench-{user_id}', 'password': PASSWORD},
+    )
+
+
+async def me(client: httpx.AsyncClient, context, rng):
+    user_id = rng.choice(list(context.tokens))
+    return await client.get('/auth/me', headers=context.auth(user_id))
+
+
+async def refresh(client: httpx.AsyncClient, context, rng):
+    user_id = rng.choice(list(context.tokens))
+    return await client.post('/auth/refresh', headers=context.auth(user_id))
+
+
+async def list_users(client: httpx.AsyncClient, context, rng):
+    return await client.get('/users/', params=dict(limit=20))
+
+
+async def show_user(client: httpx.AsyncClient, context, rng):
+    return await client.get(f'/users/{rng.choice(context.user_ids)}')
+
+
+async def update_user(client: httpx.AsyncClient, context, rng):
+    user_id = rng.choice(list(context.tokens))
+    return await client.put(
+        f'/users/{user_id}',
+        json=dict(username=f'bench-{user_id}-{rng.randrange(1_000_000)}'),
+        headers=context.auth(user_id),
+    )
+
+
+async def list_mangas(client: httpx.AsyncClient, context, rng):
+    return await client.get('/mangas/', params=dict(limit=20))
+
+
+async def filter_mangas(client: httpx.AsyncClient, context, rng):
+    return await client.get(
+        '/mangas/',
+        params=dict(status='ongoing', year_from=2000 + rng.randrange(25)),
+    )
+
+
+async def search_mangas(client: httpx.AsyncClient, context, rng):
+    return await client.get(
+        '/mangas/search', params=dict(q=rng.choice(SEARCH_TERMS))
+    )
+
+
+async def show_manga(client: httpx.AsyncClient, context, rng):
+    return await client.get(f'/mangas/{rng.choice(context.manga_ids)}')
+
+
+async def update_manga(client: httpx.AsyncClient, context, rng):
+    return await client.put(
+        f'/mangas/{rng.choice(context.manga_ids)}',
+        json=dict(year=1900 + rng.randrange(125)),
+    )
+
+
+# Pesos aproximam o tráfego real: muitas leituras de catálogo, poucas
+# escritas e logins (que são caros por causa do argon2).
+SCENARIOS = {
+    'auth.login': (login, 1),
+    'auth.me': (me, 5),
+    'auth.refresh': (refresh, 2),
+    'users.list': (list_users, 3),
+    'users.show': (show_user, 5),
+    'users.update': (update_user, 1),
+    'mangas.list': (list_mangas, 20),
+    'mangas.filter': (filter_mangas, 10),
+    'mangas.search': (search_mangas, 10),
+    'mangas.show': (show_manga, 40),
+    'mangas.update': (update_manga, 3),
+}
+
+
+@contextmanager
+def mongo_container():
+    from testcontainers.mongodb import MongoDbContainer  # noqa: PLC0415
+
+    with MongoDbContainer(MONGO_IMAGE) as container:
+        yield container.get_connection_url()
+
+
+async def seed(db, users: int, mangas: int, batch_size: int = 5_000):
+    # Todos os usuários compartilham a mesma senha: calcular um hash
+    # argon2 por usuário tornaria a carga inicial lenta demais.
+    password = get_password_hash(PASSWORD)
+    now = datetime.now(timezone.utc)
+    user_ids = [ulid() for _ in range(users)]
+    for start in range(0, users, batch_size):
+        await db.get_collection('users').insert_many([
+            UserType(
+                _id=user_id,
+                username=f'bench-{user_id}',
+                password=password,
+                role=RoleEnum.READER,
+                token_version=0,
+                created_at=now,
+                updated_at=now,
+            )
+            for user_id in user_ids[start : start + batch_size]
+        ])
+
+    manga_ids = []
+    for start in range(0, mangas, batch_size):
+        batch = [
+            make_manga(position)
+            for position in range(start, min(start + batch_size, mangas))
+        ]
+        await db.get_collection('mangas').insert_many(batch)
+        manga_ids.extend(manga['_id'] for manga in batch)
+
+    return LoadContext(user_ids=user_ids, manga_ids=manga_ids)
+
+
+async def authenticate(client: httpx.AsyncClient, context, sessions: int):
+    for user_id in context.user_ids[:sessions]:
+        response = await client.post(
+            '/auth/token',
+            data={'username': f'bench-{user_id}', 'password': PASSWORD},
+        )
+        response.raise_for_status()
+        context.tokens[user_id] = response.json()['accessToken']
+
+
+async def generate_load(  # noqa: PLR0913, PLR0917
+    client: httpx.AsyncClient,
+    context: LoadContext,
+    scenarios: dict,
+    concurrency: int,
+    duration: float,
+    seed_value: int,
+):
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    names = list(scenarios)
+    weights = [scenarios[name][1] for name in names]
+    deadline = time.perf_counter() + duration
+
+    async def worker(rng: random.Random):
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await scenarios[name][0](client, context, rng)
+                status = response.status_code
+            except httpx.HTTPError as error:
+                status = type(error).__name__
+            latencies[name].append(time.perf_counter() - start)
+            statuses[name][status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            worker(random.Random(seed_value + number))
+            for number in range(concurrency)
+        )
+    )
+    return latencies, statuses, time.perf_counter() - start
+
+
+def build_report(latencies, statuses, elapsed: float, args: Namespace):
+    scenarios = {}
+    for name, values in sorted(latencies.items()):
+        errors = sum(
+            count
+            for status, count in statuses[name].items()
+            if not isinstance(status, int) or status >= 500  # noqa: PLR2004
+        )
+        scenarios[name] = dict(
+            **summarize(values),
+            throughput=len(values) / elapsed,
+            errors=errors,
+            throttled=statuses[name][HTTPStatus.TOO_MANY_REQUESTS],
+            statuses={str(k): v for k, v in statuses[name].items()},
+        )
+
+    every = [value for values in latencies.values() for value in values]
+    return dict(
+        meta=dict(
+            users=args.users,
+            mangas=args.mangas,
+            concurrency=args.concurrency,
+            duration=elapsed,
+            seed=args.seed,
+            created_at=datetime.now(timezone.utc).isoformat(),
+        ),
+        total=dict(**summarize(every), throughput=len(every) / elapsed),
+        scenarios=scenarios,
+    )
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    pairs = [('total', current['total'], baseline['total'])] + [
+        (name, result, baseline['scenarios'][name])
+        for name, result in current['scenarios'].items()
+        if name in baseline['scenarios']
+    ]
+    for name, result, reference in pairs:
+        for metric in ('p50', 'p95', 'p99'):
+            if result[metric] > reference[metric] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {metric} {reference[metric]:.1f}ms -> '
+                    f'{result[metric]:.1f}ms'
+                )
+        if result['throughput'] < reference['throughput'] * (1 - tolerance):
+            regressions.append(
+                f'{name}: throughput {reference["throughput"]:.1f}/s -> '
+                f'{result["throughput"]:.1f}/s'
+            )
+    return regressions
+
+
+def print_report(report: dict):
+    for name, result in report['scenarios'].items():
+        print(
+            format_summary(name, result),
+            f'{result["throughput"]:.1f}/s erros={result["errors"]} '
+            f'limitadas={result.get("throttled", 0)}',
+        )
+    print(
+        format_summary('total', report['total']),
+        f'{report["total"]["throughput"]:.1f}/s',
+    )
+
+
+def report_regressions(current: dict, baseline_path: Path, tolerance: float):
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    regressions = compare(current, baseline, tolerance)
+    for regression in regressions:
+        print('REGRESSÃO', regression)
+    if regressions:
+        sys.exit(1)
+    print(f'Sem regressões acima de {tolerance:.0%}')
+
+
+async def run_target(client: httpx.AsyncClient, context, args: Namespace):
+    scenarios = {name: SCENARIOS[name] for name in args.scenarios or SCENARIOS}
+    await authenticate(client, context, args.sessions)
+    if args.warmup:
+        await generate_load(
+            client, context, scenarios, args.concurrency, args.warmup, 0
+        )
+    latencies, statuses, elapsed = await generate_load(
+        client, context, scenarios, args.concurrency, args.duration, args.seed
+    )
+    return build_report(latencies, statuses, elapsed, args)
+
+
+async def run(args: Namespace, database_url: str) -> dict:
+    from src.app import app  # noqa: PLC0415
+
+    settings.DATABASE_URL = database_url
+    settings.DATABASE_NAME = args.database
+
+    db_client = create_db_client()
+    db = db_client.get_database(args.database)
+    await db_client.drop_database(args.database)
+    await create_indexes(db)
+    context = await seed(db, args.users, args.mangas)
+    await db_client.close()
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with AsyncExitStack() as stack:
+        if args.base_url is None:
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            # Em processo tudo sai de 127.0.0.1 e os mesmos usernames se
+            # repetem; o teste mede o login, não os limitadores de tentativas.
+            for limiter in (login_ip_limiter, login_username_limiter):
+                limiter.rate = 0
+            transport = httpx.ASGITransport(app=app)
+            base_url = 'http://bench'
+        else:
+            transport, base_url = None, args.base_url
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                transport=transport,
+                base_url=base_url,
+                limits=limits,
+                timeout=60,
+            )
+        )
+        return await run_target(client, context, args)
+
+
+def run_command(args: Namespace):
+    if args.base_url is not None and args.database_url is None:
+        sys.exit('--base-url exige --database-url do servidor alvo')
+
+    if args.database_url is None:
+        with mongo_container() as database_url:
+            report = asyncio.run(run(args, database_url))
+    else:
+        report = asyncio.run(run(args, args.database_url))
+
+    print_report(report)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.baseline is not None:
+        report_regressions(report, args.baseline, args.tolerance)
+
+
+def compare_command(args: Namespace):
+    current = json.loads(args.current.read_text(encoding='utf-8'))
+    print_report(current)
+    report_regressions(current, args.baseline, args.tolerance)
+
+
+def build_parser() -> ArgumentParser:
+    parser = ArgumentParser(description='Teste de carga da API do Mangify')
+    subparsers = parser.add_subparsers(required=True)
+
+    run_parser = subparsers.add_parser('run', help='Executa a carga')
+    run_parser.add_argument('--database-url', help='Usa um Mongo existente')
+    run_parser.add_argument('--database', default='mangify_load')
+    run_parser.add_argument(
+        '--base-url', help='Servidor alvo (padrão: app em processo)'
+    )
+    run_parser.add_argument('--users', type=int, default=1_000)
+    run_parser.add_argument('--mangas', type=int, default=10_000)
+    run_parser.add_argument('--sessions', type=int, default=50)
+    run_parser.add_argument('--concurrency', type=int, default=50)
+    run_parser.add_argument('--duration', type=float, default=30)
+    run_parser.add_argument('--warmup', type=float, default=5)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS))
+    run_parser.add_argument('--output', type=Path)
+    run_parser.add_argument('--baseline', type=Path)
+    run_parser.add_argument('--tolerance', type=float, default=0.1)
+    run_parser.set_defaults(handler=run_command)
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='Compara um resultado com o baseline'
+    )
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('current', type=Path)
+    compare_parser.add_argument('--tolerance', type=float, default=0.1)
+    compare_parser.set_defaults(handler=compare_command)
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from src.routers import auth, mangas, users
+from src.autocomplete import TitleIndexRefresher, title_index
+from src.database import (
+    create_db_client,
+    create_indexes,
+    get_db,
+    get_manga_collection,
+    get_manga_counts_collection,
+)
+from src.facets import ensure_facet_counts
+from src.manga_cache import ChangeStreamWatcher, manga_cache
+from src.metrics import MetricsMiddleware
+from src.routers import admin, auth, mangas, metrics, users
 from src.schemas.base import MessageResponse
+from src.security import get_dummy_hash, password_hasher
+from src.settings import settings
+from src.timing import ServerTimingMiddleware
+from src.view_counter import view_counter
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.db_client = create_db_client()
+    db = get_db(app.state.db_client)
+    mangas = await get_manga_collection(db)
+    watcher = ChangeStreamWatcher(mangas, manga_cache)
+    refresher = TitleIndexRefresher(
+        mangas,
+        title_index,
+        settings.AUTOCOMPLETE_REFRESH_SECONDS,
+    )
+    try:
+        if settings.DATABASE_CREATE_INDEXES:
+            await create_indexes(db)
+        # Catálogos anteriores aos contadores não têm o documento ainda.
+        await ensure_facet_counts(mangas, await get_manga_counts_collection(db))
+        await asyncio.to_thread(get_dummy_hash)
+        if manga_cache.enabled:
+            watcher.start()
+        if settings.AUTOCOMPLETE_PRELOAD:
+            refresher.start()
+        view_counter.start(mangas)
+        yield
+    finally:
+        await view_counter.stop()
+        await refresher.stop()
+        await watcher.stop()
+        password_hasher.shutdown()
+        await app.state.db_client.close()
+
 
 app = FastAPI(
     title='Mangify',
     description='Descubra, leia e viva histórias incríveis em um só app',
     version='0.1.0',
+    lifespan=lifespan,
 )
 
 
@@ -18,3 +69,14 @@ async def root():
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(mangas.router)
+app.include_router(admin.router)
+
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        slow_request_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    )
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
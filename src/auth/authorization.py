@@ -1,3 +1,4 @@
+import asyncio
 from http import HTTPStatus
 from pathlib import Path
 
@@ -5,6 +6,9 @@ import casbin
 from fastapi import HTTPException
 
 from src.security import CurrentUser
+from src.timing import phase
+
+AUTH_PATH = Path(__file__).resolve().parent
 
 
 async def get_enforcer(model_path: str, policy_path: str):
@@ -13,14 +17,60 @@ async def get_enforcer(model_path: str, policy_path: str):
     return enforcer
 
 
+class EnforcerRegistry:
+    def __init__(self, base_path: Path = AUTH_PATH):
+        self.base_path = base_path
+        self._enforcers: dict[
+            str, tuple[tuple[int, int], casbin.AsyncEnforcer]
+        ] = {}
+        self._lock = asyncio.Lock()
+
+    def get_paths(self, resource_type: str) -> tuple[Path, Path]:
+        return (
+            self.base_path / 'models' / f'{resource_type}_model.conf',
+            self.base_path / 'policies' / f'{resource_type}_policy.csv',
+        )
+
+    def _get_mtimes(self, resource_type: str) -> tuple[int, int]:
+        model_path, policy_path = self.get_paths(resource_type)
+        return model_path.stat().st_mtime_ns, policy_path.stat().st_mtime_ns
+
+    async def get(self, resource_type: str) -> casbin.AsyncEnforcer:
+        mtimes = self._get_mtimes(resource_type)
+        cached = self._enforcers.get(resource_type)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+
+        async with self._lock:
+            cached = self._enforcers.get(resource_type)
+            if cached is not None and cached[0] == mtimes:
+                return cached[1]
+
+            model_path, policy_path = self.get_paths(resource_type)
+            enforcer = await get_enforcer(str(model_path), str(policy_path))
+            self._enforcers[resource_type] = (mtimes, enforcer)
+            return enforcer
+
+    async def reload(self, resource_type: str | None = None) -> list[str]:
+        resource_types = (
+            [resource_type] if resource_type else list(self._enforcers)
+        )
+        for name in resource_types:
+            self._enforcers.pop(name, None)
+            await self.get(name)
+        return resource_types
+
+
+enforcer_registry = EnforcerRegistry()
+
+
 async def get_authorization(
     user: CurrentUser, resource, action, resource_type: str
 ):
-    enforcer = await get_enforcer(
-        f'{Path.cwd()}/src/auth/models/{resource_type}_model.conf',
-        f'{Path.cwd()}/src/auth/policies/{resource_type}_policy.csv',
-    )
-    if not enforcer.enforce(user, resource, action):
+    with phase('authz'):
+        enforcer = await enforcer_registry.get(resource_type)
+        allowed = enforcer.enforce(user, resource, action)
+    if not allowed:
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN, detail='Ação não autorizada'
         )
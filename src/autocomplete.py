@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import PyMongoError
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TITLE_KEYS_FIELD = 'title_keys'
+
+
+def normalize_title(title: str) -> str:
+    if title.isascii():
+        return ' '.join(title.lower().split())
+    decomposed = unicodedata.normalize('NFKD', title)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.casefold().split())
+
+
+def get_title_keys(title: str, alternatives_titles: Iterable[str]) -> list[str]:
+    keys = (normalize_title(value) for value in (title, *alternatives_titles))
+    return list(dict.fromkeys(key for key in keys if key))
+
+
+# Pares (título normalizado, id) ordenados para o bisect; `documents`
+# guarda título e chaves de cada manga para remover as entradas antigas.
+class TitleIndex:
+    def __init__(self):
+        self.entries: list[tuple[str, str]] = []
+        self.documents: dict[str, tuple[str, list[str]]] = {}
+        self.ready = False
+        # Escritas locais feitas enquanto um índice novo é construído;
+        # `replace` as reaplica sobre ele.
+        self.journal: list[tuple[str, tuple | None]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, manga_id: str, title: str, keys: list[str]):
+        if self.journal is not None:
+            self.journal.append((manga_id, (title, keys)))
+        self.discard(manga_id)
+        self.documents[manga_id] = (title, keys)
+        for key in keys:
+            insort(self.entries, (key, manga_id))
+
+    def remove(self, manga_id: str):
+        if self.journal is not None:
+            self.journal.append((manga_id, None))
+        self.discard(manga_id)
+
+    def discard(self, manga_id: str):
+        document = self.documents.pop(manga_id, None)
+        if document is None:
+            return
+        for key in document[1]:
+            del self.entries[bisect_left(self.entries, (key, manga_id))]
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        found = {}
+        position = bisect_left(self.entries, (prefix,))
+        while len(found) < limit and position < len(self.entries):
+            key, manga_id = self.entries[position]
+            if not key.startswith(prefix):
+                break
+            if manga_id not in found:
+                found[manga_id] = dict(
+                    _id=manga_id, title=self.documents[manga_id][0]
+                )
+            position += 1
+        return list(found.values())
+
+    def start_journal(self):
+        self.journal = []
+
+    def replace(self, other: 'TitleIndex'):
+        journal, self.journal = self.journal or [], None
+        for manga_id, document in journal:
+            if document is None:
+                other.remove(manga_id)
+            else:
+                other.add(manga_id, *document)
+        self.entries = other.entries
+        self.documents = other.documents
+        self.ready = True
+
+    def clear(self):
+        self.entries, self.documents = [], {}
+        self.ready = False
+        self.journal = None
+
+    @classmethod
+    def build(cls, documents: Iterable[dict]) -> 'TitleIndex':
+        index = cls()
+        for document in documents:
+            keys = get_title_keys(
+                document['title'], document.get('alternatives_titles', ())
+            )
+            index.documents[document['_id']] = (document['title'], keys)
+            index.entries.extend((key, document['_id']) for key in keys)
+
+        index.entries.sort()
+        return index
+
+
+async def load_title_index(collection: AsyncCollection) -> TitleIndex:
+    cursor = collection.find(
+        {}, {'title': True, 'alternatives_titles': True}
+    ).batch_size(settings.STREAM_BATCH_SIZE)
+    async with cursor:
+        documents = [document async for document in cursor]
+    # Normalizar e ordenar 1M de títulos leva segundos de CPU; numa thread
+    # o event loop continua atendendo requisições enquanto isso.
+    return await asyncio.to_thread(TitleIndex.build, documents)
+
+
+async def find_by_prefix(
+    collection: AsyncCollection, prefix: str, limit: int
+) -> list[dict]:
+    # Regex ancorada e sensível a maiúsculas sobre o campo normalizado: o
+    # MongoDB converte em um intervalo do índice idx_title_keys.
+    cursor = (
+        collection
+        .find(
+            {TITLE_KEYS_FIELD: {'$regex': f'^{re.escape(prefix)}'}},
+            {'title': True},
+        )
+        .sort(TITLE_KEYS_FIELD, ASCENDING)
+        .limit(limit)
+    )
+    return await cursor.to_list()
+
+
+async def backfill_title_keys(
+    collection: AsyncCollection, batch_size: int
+) -> int:
+    updated = 0
+    operations = []
+    cursor = collection.find(
+        {TITLE_KEYS_FIELD: {'$exists': False}},
+        {'title': True, 'alternatives_titles': True},
+    ).batch_size(batch_size)
+    async with cursor:
+        async for document in cursor:
+            keys = get_title_keys(
+                document['title'], document.get('alternatives_titles', ())
+            )
+            operations.append(
+                UpdateOne(
+                    {'_id': document['_id']},
+                    {'$set': {TITLE_KEYS_FIELD: keys}},
+                )
+            )
+            if len(operations) == batch_size:
+                updated += (
+                    await collection.bulk_write(operations, ordered=False)
+                ).modified_count
+                operations.clear()
+
+    if operations:
+        updated += (
+            await collection.bulk_write(operations, ordered=False)
+        ).modified_count
+    return updated
+
+
+# Escritas deste worker já atualizam o índice; a reconstrução periódica
+# traz as dos outros.
+class TitleIndexRefresher:
+    def __init__(
+        self, collection: AsyncCollection, index: TitleIndex, interval: float
+    ):
+        self.collection = collection
+        self.index = index
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        while True:
+            self.index.start_journal()
+            try:
+                self.index.replace(await load_title_index(self.collection))
+            except PyMongoError as error:
+                logger.warning('Falha ao carregar títulos: %s', error)
+            finally:
+                self.index.journal = None
+            await asyncio.sleep(self.interval)
+
+
+title_index = TitleIndex()
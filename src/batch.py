@@ -0,0 +1,48 @@
+from collections.abc import Iterable
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Query
+from pymongo.asynchronous.collection import AsyncCollection
+
+from src.settings import settings
+
+
+def check_batch_ids(ids: Iterable[str]) -> list[str]:
+    unique = list(dict.fromkeys(filter(None, map(str.strip, ids))))
+    if not unique:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Informe ao menos um id'
+        )
+    if len(unique) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f'Limite de {settings.BATCH_MAX_IDS} ids excedido',
+        )
+    return unique
+
+
+def get_batch_ids(
+    ids: Annotated[
+        list[str],
+        Query(description='Ids separados por vírgula ou parâmetro repetido'),
+    ],
+) -> list[str]:
+    return check_batch_ids(_id for value in ids for _id in value.split(','))
+
+
+BatchIds = Annotated[list[str], Depends(get_batch_ids)]
+
+
+async def find_batch(
+    collection: AsyncCollection, ids: list[str], projection: dict | None
+) -> tuple[list[dict], list[str]]:
+    # Um único `$in` para todos os ids; a resposta segue a ordem pedida.
+    documents = await collection.find(
+        {'_id': {'$in': ids}}, projection
+    ).to_list()
+    found = {document['_id']: document for document in documents}
+    return (
+        [found[_id] for _id in ids if _id in found],
+        [_id for _id in ids if _id not in found],
+    )
@@ -0,0 +1,37 @@
+from itertools import batched
+
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+async def insert_unordered(
+    collection: AsyncCollection,
+    documents: list[tuple[int, dict]],
+    batch_size: int,
+) -> tuple[list[tuple[int, str]], list[tuple[int, int, str]]]:
+    created, failed = [], []
+    for batch in batched(documents, batch_size):
+        failed_positions = set()
+        try:
+            await collection.insert_many(
+                [document for _, document in batch], ordered=False
+            )
+        except BulkWriteError as error:
+            for write_error in error.details['writeErrors']:
+                position = write_error['index']
+                failed_positions.add(position)
+                failed.append((
+                    batch[position][0],
+                    write_error['code'],
+                    write_error['errmsg'],
+                ))
+
+        created += [
+            (index, document['_id'])
+            for position, (index, document) in enumerate(batch)
+            if position not in failed_positions
+        ]
+
+    return created, failed
@@ -0,0 +1,164 @@
+import gzip
+import io
+import os
+from collections.abc import Iterator
+from itertools import batched
+from pathlib import Path
+from typing import IO
+
+from bson import json_util
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError, PyMongoError
+
+JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+
+class CatalogError(RuntimeError):
+    pass
+
+
+def get_compression(path: Path, compression: str = 'auto') -> str:
+    if compression != 'auto':
+        return compression
+    if path.suffix == '.gz':
+        return 'gzip'
+    if path.suffix == '.zst':
+        return 'zstd'
+    return 'none'
+
+
+def open_catalog(path: Path, mode: str, compression: str = 'auto') -> IO[str]:
+    compression = get_compression(path, compression)
+    if compression == 'gzip':
+        return gzip.open(path, f'{mode}t', encoding='utf-8')
+    if compression == 'zstd':
+        try:
+            import zstandard  # noqa: PLC0415
+        except ImportError:
+            raise RuntimeError(
+                'Compressão zstd requer o pacote opcional mangify[zstd]'
+            )
+
+        if mode == 'r':
+            stream = zstandard.ZstdDecompressor().stream_reader(
+                open(path, 'rb'), read_across_frames=True, closefd=True
+            )
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(
+                open(path, f'{mode}b'), closefd=True
+            )
+        return io.TextIOWrapper(stream, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def read_checkpoint(path: Path | None) -> str | None:
+    if path is None or not path.exists():
+        return None
+    return path.read_text(encoding='utf-8').strip() or None
+
+
+def write_checkpoint(path: Path | None, document_id: str):
+    if path is None:
+        return
+    temporary_path = path.with_name(f'{path.name}.tmp')
+    temporary_path.write_text(document_id, encoding='utf-8')
+    os.replace(temporary_path, path)
+
+
+async def export_collection(
+    db: AsyncDatabase,
+    collection_name: str,
+    output: IO[str],
+    batch_size: int,
+    checkpoint: Path | None = None,
+) -> int:
+    query = {}
+    last_id = read_checkpoint(checkpoint)
+    if last_id is not None:
+        query['_id'] = {'$gt': last_id}
+
+    exported = 0
+    batch = []
+    cursor = (
+        db
+        .get_collection(collection_name)
+        .find(query)
+        .sort('_id', ASCENDING)
+        .batch_size(batch_size)
+    )
+    try:
+        async with cursor:
+            async for document in cursor:
+                batch.append(
+                    json_util.dumps(document, json_options=JSON_OPTIONS)
+                )
+                last_id = document['_id']
+                if len(batch) == batch_size:
+                    exported += flush_lines(output, batch, checkpoint, last_id)
+    except PyMongoError as error:
+        raise CatalogError(
+            f'Falha ao exportar {collection_name} após {exported} '
+            f'documentos: {error}'
+        ) from error
+
+    if batch:
+        exported += flush_lines(output, batch, checkpoint, last_id)
+    return exported
+
+
+def flush_lines(
+    output: IO[str], lines: list[str], checkpoint: Path | None, last_id: str
+) -> int:
+    output.write('\n'.join(lines) + '\n')
+    output.flush()
+    write_checkpoint(checkpoint, last_id)
+    written = len(lines)
+    lines.clear()
+    return written
+
+
+def iter_documents(source: IO[str], after: str | None) -> Iterator[dict]:
+    for line in source:
+        if not line.strip():
+            continue
+        document = json_util.loads(line, json_options=JSON_OPTIONS)
+        if after is None or document['_id'] > after:
+            yield document
+
+
+async def import_collection(
+    db: AsyncDatabase,
+    collection_name: str,
+    source: IO[str],
+    batch_size: int,
+    checkpoint: Path | None = None,
+) -> int:
+    collection = db.get_collection(collection_name)
+    imported = 0
+    documents = iter_documents(source, read_checkpoint(checkpoint))
+    for batch in batched(documents, batch_size):
+        try:
+            await collection.bulk_write(
+                [
+                    ReplaceOne({'_id': document['_id']}, document, upsert=True)
+                    for document in batch
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as error:
+            write_error = error.details['writeErrors'][0]
+            offset = imported + write_error['index']
+            raise CatalogError(
+                f'Falha ao importar {collection_name} no documento {offset} '
+                f'(_id {batch[write_error["index"]]["_id"]}): '
+                f'{write_error.get("errmsg")}'
+            ) from error
+        except PyMongoError as error:
+            raise CatalogError(
+                f'Falha ao importar {collection_name} a partir do documento '
+                f'{imported}: {error}'
+            ) from error
+        write_checkpoint(checkpoint, batch[-1]['_id'])
+        imported += len(batch)
+    return imported
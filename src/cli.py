@@ -0,0 +1,154 @@
+import asyncio
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from pymongo.errors import PyMongoError
+
+from src.autocomplete import backfill_title_keys
+from src.catalog import export_collection, import_collection, open_catalog
+from src.database import (
+    COLLECTIONS,
+    create_db_client,
+    create_indexes,
+    get_db,
+    get_manga_collection,
+    get_manga_counts_collection,
+    migrate_updated_at,
+)
+from src.facets import rebuild_facet_counts
+
+COMPRESSIONS = ('auto', 'none', 'gzip', 'zstd')
+
+
+async def run_create_indexes(args):
+    client = create_db_client()
+    try:
+        await create_indexes(get_db(client))
+    finally:
+        await client.close()
+
+
+async def run_export(args):
+    client = create_db_client()
+    mode = 'a' if args.checkpoint and args.checkpoint.exists() else 'w'
+    try:
+        with open_catalog(args.output, mode, args.compression) as output:
+            exported = await export_collection(
+                get_db(client),
+                args.collection,
+                output,
+                args.batch_size,
+                args.checkpoint,
+            )
+    finally:
+        await client.close()
+    print(f'{exported} documentos exportados de {args.collection}')
+
+
+async def run_import(args):
+    client = create_db_client()
+    try:
+        with open_catalog(args.input, 'r', args.compression) as source:
+            imported = await import_collection(
+                get_db(client),
+                args.collection,
+                source,
+                args.batch_size,
+                args.checkpoint,
+            )
+        if args.collection == 'mangas':
+            db = get_db(client)
+            await rebuild_facet_counts(
+                await get_manga_collection(db),
+                await get_manga_counts_collection(db),
+            )
+    finally:
+        await client.close()
+    print(f'{imported} documentos importados em {args.collection}')
+
+
+async def run_backfill_title_keys(args):
+    client = create_db_client()
+    try:
+        updated = await backfill_title_keys(
+            await get_manga_collection(get_db(client)), args.batch_size
+        )
+    finally:
+        await client.close()
+    print(f'{updated} mangas atualizados')
+
+
+async def run_migrate_updated_at(args):
+    client = create_db_client()
+    try:
+        db = get_db(client)
+        for collection_name in COLLECTIONS:
+            updated = await migrate_updated_at(
+                db.get_collection(collection_name), args.batch_size
+            )
+            print(f'{updated} documentos convertidos em {collection_name}')
+    finally:
+        await client.close()
+
+
+def add_transfer_arguments(parser: ArgumentParser):
+    parser.add_argument('collection', choices=COLLECTIONS)
+    parser.add_argument(
+        '--compression',
+        choices=COMPRESSIONS,
+        default='auto',
+        help='Padrão: deduzida da extensão (.gz, .zst)',
+    )
+    parser.add_argument('--batch-size', type=int, default=1_000)
+    parser.add_argument(
+        '--checkpoint',
+        type=Path,
+        help='Arquivo com o último _id processado, usado para retomar',
+    )
+
+
+def main(argv: list[str] | None = None):
+    parser = ArgumentParser(prog='mangify')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser(
+        'create-indexes', help='Cria os índices declarados em src.database'
+    ).set_defaults(handler=run_create_indexes)
+
+    export_parser = commands.add_parser(
+        'export', help='Exporta uma coleção para NDJSON'
+    )
+    add_transfer_arguments(export_parser)
+    export_parser.add_argument('output', type=Path)
+    export_parser.set_defaults(handler=run_export)
+
+    import_parser = commands.add_parser(
+        'import', help='Importa uma coleção a partir de NDJSON'
+    )
+    add_transfer_arguments(import_parser)
+    import_parser.add_argument('input', type=Path)
+    import_parser.set_defaults(handler=run_import)
+
+    backfill_parser = commands.add_parser(
+        'backfill-title-keys',
+        help='Preenche title_keys nos mangas criados antes do autocomplete',
+    )
+    backfill_parser.add_argument('--batch-size', type=int, default=1_000)
+    backfill_parser.set_defaults(handler=run_backfill_title_keys)
+
+    migrate_parser = commands.add_parser(
+        'migrate-updated-at',
+        help='Converte updated_at gravado como string ISO em data',
+    )
+    migrate_parser.add_argument('--batch-size', type=int, default=1_000)
+    migrate_parser.set_defaults(handler=run_migrate_updated_at)
+
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(args.handler(args))
+    except (RuntimeError, PyMongoError) as error:
+        sys.exit(str(error))
+
+
+if __name__ == '__main__':
+    main()
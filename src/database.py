@@ -1,17 +1,49 @@
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends
-from pymongo import AsyncMongoClient
+from fastapi import Depends, Request
+from pymongo import (
+    ASCENDING,
+    DESCENDING,
+    TEXT,
+    AsyncMongoClient,
+    IndexModel,
+    UpdateOne,
+)
 from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.asynchronous.database import AsyncDatabase
 
+from src.metrics import CommandMetrics, PoolMetrics
 from src.schemas.mangas import MangaType
 from src.schemas.users import UserType
 from src.settings import settings
-
-
-def get_db_client():
-    return AsyncMongoClient(settings.DATABASE_URL)
+from src.timing import QueryTimings
+
+
+def create_db_client(**kwargs) -> AsyncMongoClient:
+    options = dict(
+        maxPoolSize=settings.DATABASE_MAX_POOL_SIZE,
+        minPoolSize=settings.DATABASE_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.DATABASE_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=settings.DATABASE_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=settings.DATABASE_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=settings.DATABASE_SOCKET_TIMEOUT_MS,
+    )
+    if settings.DATABASE_COMPRESSORS:
+        options['compressors'] = settings.DATABASE_COMPRESSORS
+    listeners = []
+    if settings.METRICS_ENABLED:
+        listeners += [CommandMetrics(), PoolMetrics()]
+    if settings.SERVER_TIMING_ENABLED:
+        listeners.append(QueryTimings())
+    if listeners:
+        options['event_listeners'] = listeners
+    options.update(kwargs)
+    return AsyncMongoClient(settings.DATABASE_URL, **options)
+
+
+def get_db_client(request: Request) -> AsyncMongoClient:
+    return request.app.state.db_client
 
 
 DBClient = Annotated[AsyncMongoClient, Depends(get_db_client)]
@@ -23,14 +55,93 @@ def get_db(client: DBClient):
 
 Database = Annotated[AsyncDatabase, Depends(get_db)]
 
+COLLECTIONS = ('users', 'mangas')
+
+INDEXES: dict[str, list[IndexModel]] = {
+    'users': [
+        IndexModel('username', name='idx_username', unique=True),
+    ],
+    'mangas': [
+        IndexModel('title', name='idx_title', unique=True),
+        IndexModel('title_keys', name='idx_title_keys'),
+        IndexModel(
+            [
+                ('title', TEXT),
+                ('alternatives_titles', TEXT),
+                ('description', TEXT),
+            ],
+            name='idx_text_search',
+            weights={'title': 10, 'alternatives_titles': 5, 'description': 1},
+            default_language='none',
+        ),
+        IndexModel(
+            [
+                ('state', ASCENDING),
+                ('content_rating', ASCENDING),
+                ('_id', ASCENDING),
+            ],
+            name='idx_state_content_rating',
+        ),
+        IndexModel(
+            [('status', ASCENDING), ('_id', ASCENDING)], name='idx_status'
+        ),
+        IndexModel(
+            [('publication_demographic', ASCENDING), ('_id', ASCENDING)],
+            name='idx_publication_demographic',
+        ),
+        IndexModel([('year', ASCENDING), ('_id', ASCENDING)], name='idx_year'),
+        IndexModel(
+            [('views', DESCENDING), ('_id', ASCENDING)], name='idx_views'
+        ),
+    ],
+}
+
+
+async def create_indexes(db: AsyncDatabase):
+    for collection_name, indexes in INDEXES.items():
+        await db.get_collection(collection_name).create_indexes(indexes)
+
+
+async def migrate_updated_at(
+    collection: AsyncCollection, batch_size: int
+) -> int:
+    # O filtro inclui o valor antigo para não sobrescrever uma atualização
+    # feita entre a leitura e a escrita.
+    updated = 0
+    operations = []
+    cursor = collection.find(
+        {'updated_at': {'$type': 'string'}}, {'updated_at': True}
+    ).batch_size(batch_size)
+    async with cursor:
+        async for document in cursor:
+            operations.append(
+                UpdateOne(
+                    {
+                        '_id': document['_id'],
+                        'updated_at': document['updated_at'],
+                    },
+                    {
+                        '$set': {
+                            'updated_at': datetime.fromisoformat(
+                                document['updated_at']
+                            )
+                        }
+                    },
+                )
+            )
+            if len(operations) == batch_size:
+                result = await collection.bulk_write(operations, ordered=False)
+                updated += result.modified_count
+                operations.clear()
+
+    if operations:
+        result = await collection.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+    return updated
+
 
 async def get_user_collection(db: Database):
     collection: AsyncCollection[UserType] = db.get_collection('users')
-    if 'idx_username' not in await collection.index_information():
-        await collection.create_index(
-            'username', name='idx_username', unique=True
-        )
-
     return collection
 
 
@@ -41,12 +152,18 @@ UserCollection = Annotated[
 
 async def get_manga_collection(db: Database):
     collection: AsyncCollection[MangaType] = db.get_collection('mangas')
-    if 'idx_title' not in await collection.index_information():
-        await collection.create_index('title', name='idx_title', unique=True)
-
     return collection
 
 
 MangaCollection = Annotated[
     AsyncCollection[MangaType], Depends(get_manga_collection)
 ]
+
+
+async def get_manga_counts_collection(db: Database):
+    return db.get_collection('manga_counts')
+
+
+MangaCountsCollection = Annotated[
+    AsyncCollection, Depends(get_manga_counts_collection)
+]
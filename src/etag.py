@@ -0,0 +1,148 @@
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, Header, HTTPException, Response
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MILLISECOND = timedelta(milliseconds=1)
+
+IfMatch = Annotated[str | None, Header()]
+
+
+def as_utc(value: datetime | str) -> datetime:
+    # Versões antigas gravavam updated_at como string ISO; o comando
+    # `mangify migrate-updated-at` converte esses documentos para datas.
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def make_etag(document_id: str, updated_at: datetime) -> str:
+    # O MongoDB guarda datas com precisão de milissegundos, então a ETag
+    # usa a mesma resolução para poder ser convertida de volta em filtro.
+    version = (as_utc(updated_at) - EPOCH) // MILLISECOND
+    return f'"{document_id}.{version:x}"'
+
+
+def parse_etag(etag: str) -> tuple[str, datetime] | None:
+    etag = etag.strip()
+    if len(etag) < 2 or etag[0] != '"' or etag[-1] != '"':  # noqa: PLR2004
+        return None
+    document_id, _, version = etag[1:-1].rpartition('.')
+    try:
+        return document_id, EPOCH + int(version, 16) * MILLISECOND
+    except ValueError:
+        return None
+
+
+def split_etags(header: str) -> list[str]:
+    return [etag.strip() for etag in header.split(',')]
+
+
+def legacy_version_pattern(version: datetime) -> re.Pattern:
+    # Casa o updated_at ainda gravado como string ISO no mesmo milissegundo;
+    # sem fração, isoformat() vai direto ao fuso ("...:15+00:00").
+    milliseconds = version.microsecond // 1000
+    fraction = rf'\.{milliseconds:03d}' if milliseconds else r'(\.000|\+)'
+    return re.compile(
+        f'^{re.escape(version.strftime("%Y-%m-%dT%H:%M:%S"))}{fraction}'
+    )
+
+
+def build_if_match_filter(if_match: str | None, document_id: str) -> dict:
+    if if_match is None or if_match.strip() == '*':
+        return {}
+    versions = [
+        parsed[1]
+        for parsed in map(parse_etag, split_etags(if_match))
+        if parsed is not None and parsed[0] == document_id
+    ]
+    return {
+        'updated_at': {
+            '$in': [*versions, *map(legacy_version_pattern, versions)]
+        }
+    }
+
+
+def if_match_satisfied(
+    if_match: str | None, document_id: str, updated_at: datetime
+) -> bool:
+    if if_match is None or if_match.strip() == '*':
+        return True
+    return make_etag(document_id, updated_at) in split_etags(if_match)
+
+
+def precondition_failed() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.PRECONDITION_FAILED,
+        detail='O recurso foi modificado por outra requisição',
+    )
+
+
+def get_cache_headers(document: dict) -> dict[str, str]:
+    updated_at = as_utc(document['updated_at'])
+    return {
+        'ETag': make_etag(document['_id'], updated_at),
+        'Last-Modified': format_datetime(updated_at, usegmt=True),
+    }
+
+
+class ConditionalGet:
+    def __init__(
+        self, if_none_match: str | None, if_modified_since: str | None
+    ):
+        self.if_none_match = if_none_match
+        self.if_modified_since = parse_http_date(if_modified_since)
+
+    @property
+    def is_conditional(self) -> bool:
+        return (
+            self.if_none_match is not None or self.if_modified_since is not None
+        )
+
+    def is_not_modified(self, document: dict) -> bool:
+        # If-Modified-Since é ignorado quando If-None-Match está presente
+        # (RFC 9110, seção 13.1.3).
+        if self.if_none_match is not None:
+            if self.if_none_match.strip() == '*':
+                return True
+            etag = make_etag(document['_id'], document['updated_at'])
+            return etag in {
+                tag.removeprefix('W/')
+                for tag in split_etags(self.if_none_match)
+            }
+        if self.if_modified_since is not None:
+            updated_at = as_utc(document['updated_at']).replace(microsecond=0)
+            return updated_at <= self.if_modified_since
+        return False
+
+
+def parse_http_date(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    try:
+        return as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_conditional_get(
+    if_none_match: Annotated[str | None, Header()] = None,
+    if_modified_since: Annotated[str | None, Header()] = None,
+) -> ConditionalGet:
+    return ConditionalGet(if_none_match, if_modified_since)
+
+
+Conditional = Annotated[ConditionalGet, Depends(get_conditional_get)]
+
+
+def not_modified(document: dict) -> Response:
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED,
+        headers=get_cache_headers(document),
+    )
@@ -0,0 +1,137 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from enum import Enum
+
+from pymongo.asynchronous.collection import AsyncCollection
+
+FACET_FIELDS = ('status', 'content_rating', 'state', 'publication_demographic')
+COUNTS_ID = 'mangas'
+NO_VALUE = 'none'
+# Só documentos gravados por `rebuild_facet_counts` têm o campo; um `$inc`
+# sobre um catálogo nunca contado cria o documento sem ele.
+REBUILT_FIELD = 'rebuilt_at'
+
+
+def facet_key(value) -> str:
+    if value is None:
+        return NO_VALUE
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def get_increments(document: dict, amount: int) -> Counter:
+    increments = Counter({'total': amount})
+    for field in FACET_FIELDS:
+        increments[f'{field}.{facet_key(document.get(field))}'] += amount
+    return increments
+
+
+async def apply_increments(counts: AsyncCollection, increments: Counter):
+    changed = {key: amount for key, amount in increments.items() if amount}
+    if changed:
+        await counts.update_one(
+            {'_id': COUNTS_ID}, {'$inc': changed}, upsert=True
+        )
+
+
+async def count_created(counts: AsyncCollection, documents: Iterable[dict]):
+    increments = Counter()
+    for document in documents:
+        increments.update(get_increments(document, 1))
+    await apply_increments(counts, increments)
+
+
+async def count_deleted(counts: AsyncCollection, document: dict):
+    await apply_increments(counts, get_increments(document, -1))
+
+
+async def count_updated(counts: AsyncCollection, before: dict, after: dict):
+    increments = get_increments(after, 1)
+    increments.update(get_increments(before, -1))
+    await apply_increments(counts, increments)
+
+
+def is_facet_change(updated_data: dict) -> bool:
+    return not updated_data.keys().isdisjoint(FACET_FIELDS)
+
+
+async def find_counts(counts: AsyncCollection) -> dict | None:
+    return await counts.find_one({
+        '_id': COUNTS_ID,
+        REBUILT_FIELD: {'$exists': True},
+    })
+
+
+async def get_facet_counts(counts: AsyncCollection) -> dict:
+    document = await find_counts(counts) or {}
+    return dict(
+        total=document.get('total', 0),
+        **{field: document.get(field, {}) for field in FACET_FIELDS},
+    )
+
+
+async def count_mangas(
+    collection: AsyncCollection, counts: AsyncCollection, query: dict
+) -> int | None:
+    # Sem filtro, usa os metadados da coleção; com um único facet, soma os
+    # contadores. O resto exigiria `count_documents`, então fica sem total.
+    if not query:
+        return await collection.estimated_document_count()
+    if len(query) != 1:
+        return None
+
+    field, condition = next(iter(query.items()))
+    if field not in FACET_FIELDS:
+        return None
+    document = await find_counts(counts)
+    if document is None:
+        return None
+    values = condition['$in'] if isinstance(condition, dict) else [condition]
+    facets = document.get(field, {})
+    return sum(facets.get(facet_key(value), 0) for value in values)
+
+
+async def rebuild_facet_counts(
+    collection: AsyncCollection, counts: AsyncCollection
+) -> dict:
+    # Escritas concorrentes com a varredura podem se perder; rode de novo se
+    # os contadores divergirem de `count_documents`.
+    cursor = await collection.aggregate([
+        {
+            '$facet': {
+                'total': [{'$count': 'count'}],
+                **{
+                    field: [
+                        {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}}
+                    ]
+                    for field in FACET_FIELDS
+                },
+            }
+        }
+    ])
+    result = (await cursor.to_list())[0]
+
+    document = dict(
+        total=result['total'][0]['count'] if result['total'] else 0,
+        **{
+            field: {
+                facet_key(group['_id']): group['count']
+                for group in result[field]
+            }
+            for field in FACET_FIELDS
+        },
+    )
+    document[REBUILT_FIELD] = datetime.now(timezone.utc)
+    await counts.replace_one({'_id': COUNTS_ID}, document, upsert=True)
+    return document
+
+
+async def ensure_facet_counts(
+    collection: AsyncCollection, counts: AsyncCollection
+) -> bool:
+    if await find_counts(counts) is not None:
+        return False
+    await rebuild_facet_counts(collection, counts)
+    return True
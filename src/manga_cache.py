@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import math
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import OperationFailure, PyMongoError
+
+from src.cache import TTLCache
+from src.settings import settings
+from src.view_counter import VIEWS_FIELD
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAM_HISTORY_LOST = 286
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+CLEARING_EVENTS = frozenset({'drop', 'dropDatabase', 'rename', 'invalidate'})
+RETRY_DELAY_SECONDS = 0.5
+RETRY_DELAY_MAX_SECONDS = 30
+# Cada flush do ViewCounter gera um update por manga visto; invalidar por
+# eles esvaziaria o cache justamente dos mangas mais lidos. Em troca, o
+# detalhe servido do cache mantém o `views` lido na carga até a entrada
+# ser despejada ou outro campo mudar, enquanto /mangas/popular lê o valor
+# atual do banco.
+UPDATED_FIELD_NAMES = {
+    '$map': {
+        'input': {'$objectToArray': '$updateDescription.updatedFields'},
+        'in': '$$this.k',
+    }
+}
+IGNORE_VIEWS_ONLY_UPDATES = {
+    '$match': {
+        '$expr': {
+            '$not': [
+                {
+                    '$and': [
+                        {'$eq': ['$operationType', 'update']},
+                        {'$eq': [UPDATED_FIELD_NAMES, [VIEWS_FIELD]]},
+                        {'$eq': ['$updateDescription.removedFields', []]},
+                    ]
+                }
+            ]
+        }
+    }
+}
+
+
+# Sem TTL: uma entrada só sai por eviction ou pelo change stream, então o
+# cache só responde enquanto o watcher está em dia (`ready`).
+class MangaCache:
+    def __init__(self, max_size: int):
+        self._entries = TTLCache(max_size=max_size, ttl=math.inf)
+        self.generation = 0
+        self.ready = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._entries.enabled
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self.ready
+
+    def get(self, key: Hashable) -> Any | None:
+        if not self.active:
+            return None
+        return self._entries.get(key)
+
+    def set(self, key: Hashable, value: Any, generation: int):
+        # Uma invalidação ocorrida durante a leitura no banco pode ter
+        # chegado antes do set; nesse caso o documento lido já está velho.
+        if self.active and generation == self.generation:
+            self._entries.set(key, value)
+
+    def invalidate(self, key: Hashable):
+        self.generation += 1
+        self._entries.invalidate(key)
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._entries.stats()
+
+    def apply_change(self, change: Mapping[str, Any]):
+        if change['operationType'] in CLEARING_EVENTS:
+            self.clear()
+        elif 'documentKey' in change:
+            self.invalidate(change['documentKey']['_id'])
+
+    async def find_one(self, collection: AsyncCollection, key: str):
+        document = self.get(key)
+        if document is None:
+            generation = self.generation
+            document = await collection.find_one({'_id': key})
+            if document is not None:
+                self.set(key, document, generation)
+        return document
+
+
+class ChangeStreamWatcher:
+    def __init__(
+        self,
+        collection: AsyncCollection,
+        cache: MangaCache,
+        resume_token: Mapping[str, Any] | None = None,
+    ):
+        self.collection = collection
+        self.cache = cache
+        self.resume_token = resume_token
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.cache.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        delay = RETRY_DELAY_SECONDS
+        while True:
+            try:
+                await self.watch()
+            except OperationFailure as error:
+                if error.code == CHANGE_STREAM_NOT_SUPPORTED:
+                    logger.error('Change streams indisponíveis: %s', error)
+                    return
+                if error.code == CHANGE_STREAM_HISTORY_LOST:
+                    # O token saiu do oplog: eventos foram perdidos e nada
+                    # no cache é confiável.
+                    logger.warning('Histórico do change stream perdido')
+                    self.resume_token = None
+                    self.cache.clear()
+                else:
+                    logger.warning('Falha no change stream: %s', error)
+            except PyMongoError as error:
+                logger.warning('Falha no change stream: %s', error)
+            else:
+                delay = RETRY_DELAY_SECONDS
+                continue
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RETRY_DELAY_MAX_SECONDS)
+
+    async def watch(self):
+        # start_after (e não resume_after) também aceita o token de um
+        # evento invalidate, emitido quando a coleção é removida.
+        pipeline = [
+            IGNORE_VIEWS_ONLY_UPDATES,
+            {'$project': {'operationType': 1, 'documentKey': 1}},
+        ]
+        try:
+            async with await self.collection.watch(
+                pipeline, start_after=self.resume_token
+            ) as stream:
+                while stream.alive:
+                    change = await stream.try_next()
+                    if change is None:
+                        # Todos os eventos até aqui foram aplicados; só
+                        # agora o cache pode responder leituras.
+                        self.cache.ready = True
+                    else:
+                        self.cache.apply_change(change)
+                    self.resume_token = stream.resume_token
+        finally:
+            self.cache.ready = False
+
+
+manga_cache = MangaCache(settings.MANGA_CACHE_MAX_SIZE)
@@ -0,0 +1,277 @@
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+
+from pymongo import monitoring
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{escape_label(value)}"'
+        for name, value in zip(names, values, strict=True)
+    )
+    return f'{{{pairs}}}'
+
+
+def format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+
+    def header(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} {self.kind}'
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for labels, value in self.values.items():
+            yield (
+                f'{self.name}{format_labels(self.labels, labels)} '
+                f'{format_value(value)}'
+            )
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+        # Por série: contagem por bucket (não acumulada), soma e total.
+        self.series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[0][index] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        names = (*self.labels, 'le')
+        for labels, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                bucket_labels = format_labels(names, (*labels, repr(bound)))
+                yield f'{self.name}_bucket{bucket_labels} {cumulative}'
+            bucket_labels = format_labels(names, (*labels, '+Inf'))
+            yield f'{self.name}_bucket{bucket_labels} {count}'
+            series_labels = format_labels(self.labels, labels)
+            yield f'{self.name}_sum{series_labels} {total!r}'
+            yield f'{self.name}_count{series_labels} {count}'
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def register[M: Metric](self, metric: M) -> M:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self.metrics for line in metric.render()]
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        for metric in self.metrics:
+            if isinstance(metric, Histogram):
+                metric.series.clear()
+            else:
+                metric.values.clear()
+
+
+registry = Registry()
+http_request_duration = registry.register(
+    Histogram(
+        'mangify_http_request_duration_seconds',
+        'Duração das requisições HTTP por rota e status.',
+        ('method', 'route', 'status'),
+    )
+)
+http_requests_in_progress = registry.register(
+    Gauge(
+        'mangify_http_requests_in_progress',
+        'Requisições HTTP em andamento.',
+    )
+)
+password_hash_duration = registry.register(
+    Histogram(
+        'mangify_password_hash_duration_seconds',
+        'Tempo de CPU gasto pelo argon2 por operação.',
+        ('operation',),
+    )
+)
+mongodb_command_duration = registry.register(
+    Histogram(
+        'mangify_mongodb_command_duration_seconds',
+        'Duração dos comandos do MongoDB por comando e resultado.',
+        ('command', 'outcome'),
+    )
+)
+mongodb_checkout_duration = registry.register(
+    Histogram(
+        'mangify_mongodb_pool_checkout_duration_seconds',
+        'Espera para obter uma conexão do pool do MongoDB.',
+        ('outcome',),
+    )
+)
+mongodb_connections = registry.register(
+    Gauge(
+        'mangify_mongodb_pool_connections',
+        'Conexões do pool do MongoDB por estado.',
+        ('state',),
+    )
+)
+
+
+# ASGI puro, sem o custo do BaseHTTPMiddleware. O rótulo usa o template
+# de `scope['route']`, o que limita a cardinalidade.
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = '500'
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = str(message['status'])
+            await send(message)
+
+        http_requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get('route')
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope['method'],
+                getattr(route, 'path', UNMATCHED_ROUTE),
+                status,
+            )
+            http_requests_in_progress.dec()
+
+
+class CommandMetrics(monitoring.CommandListener):
+    def __init__(self, duration: Histogram = mongodb_command_duration):
+        self.duration = duration
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.duration.observe(
+            event.duration_micros / 1_000_000, event.command_name, 'succeeded'
+        )
+
+    def failed(self, event):
+        self.duration.observe(
+            event.duration_micros / 1_000_000, event.command_name, 'failed'
+        )
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(
+        self,
+        checkout_duration: Histogram = mongodb_checkout_duration,
+        connections: Gauge = mongodb_connections,
+    ):
+        self.checkout_duration = checkout_duration
+        self.connections = connections
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.connections.inc('open')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.connections.dec('open')
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkout_duration.observe(event.duration or 0, 'failed')
+
+    def connection_checked_out(self, event):
+        self.checkout_duration.observe(event.duration or 0, 'succeeded')
+        self.connections.inc('checked_out')
+
+    def connection_checked_in(self, event):
+        self.connections.dec('checked_out')
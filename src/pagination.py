@@ -0,0 +1,93 @@
+import binascii
+from base64 import b64decode, urlsafe_b64encode
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+
+from src.settings import settings
+
+
+class PaginationQuery(BaseModel):
+    limit: int = Field(
+        default=settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX
+    )
+    after: str | None = None
+    before: str | None = None
+
+
+def get_pagination(
+    limit: Annotated[
+        int, Query(ge=1, le=settings.PAGE_SIZE_MAX)
+    ] = settings.PAGE_SIZE_DEFAULT,
+    after: str | None = None,
+    before: str | None = None,
+) -> PaginationQuery:
+    return PaginationQuery(limit=limit, after=after, before=before)
+
+
+Pagination = Annotated[PaginationQuery, Depends(get_pagination)]
+
+
+def encode_cursor(value: str) -> str:
+    return urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        return b64decode(
+            cursor + padding, altchars=b'-_', validate=True
+        ).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Cursor inválido'
+        )
+
+
+async def paginate(
+    collection: AsyncCollection,
+    pagination: PaginationQuery,
+    query: dict | None = None,
+    projection: dict | None = None,
+):
+    if pagination.after is not None and pagination.before is not None:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Use apenas um dos cursores: after ou before',
+        )
+
+    query = dict(query or {})
+    backwards = pagination.before is not None
+    if pagination.after is not None:
+        query['_id'] = {'$gt': decode_cursor(pagination.after)}
+    elif backwards:
+        query['_id'] = {'$lt': decode_cursor(pagination.before)}
+
+    documents = (
+        await collection
+        .find(query, projection)
+        .sort('_id', DESCENDING if backwards else ASCENDING)
+        .limit(pagination.limit + 1)
+        .to_list()
+    )
+    has_more = len(documents) > pagination.limit
+    documents = documents[: pagination.limit]
+
+    if backwards:
+        documents.reverse()
+        has_next, has_previous = bool(documents), has_more
+    else:
+        has_next = has_more
+        has_previous = pagination.after is not None and bool(documents)
+
+    return dict(
+        data=documents,
+        next_cursor=(encode_cursor(documents[-1]['_id']) if has_next else None),
+        previous_cursor=(
+            encode_cursor(documents[0]['_id']) if has_previous else None
+        ),
+    )
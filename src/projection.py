@@ -0,0 +1,148 @@
+from functools import cache
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, create_model
+
+from src.responses import ModelResponse
+from src.schemas.base import BatchSchema, ModelSchema, PageSchema
+
+
+def parse_fields(
+    fields: str | None, schema: type[ModelSchema]
+) -> tuple[str, ...] | None:
+    if fields is None:
+        return None
+
+    names = {}
+    for name, field in schema.model_fields.items():
+        names[name] = name
+        names[field.alias or name] = name
+
+    selected = {'id'}
+    for raw_field in map(str.strip, fields.split(',')):
+        if not raw_field:
+            continue
+        if raw_field not in names:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=f'Campo inválido: {raw_field}',
+            )
+        selected.add(names[raw_field])
+
+    return tuple(sorted(selected))
+
+
+@cache
+def get_partial_schema(
+    schema: type[ModelSchema], fields: tuple[str, ...]
+) -> type[ModelSchema]:
+    return create_model(
+        f'{schema.__name__}Partial',
+        __base__=ModelSchema,
+        **{
+            name: (schema.model_fields[name].annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in fields and name != 'id'
+        },
+    )
+
+
+@cache
+def get_partial_page(schema: type[ModelSchema]) -> type[BaseModel]:
+    return create_model(
+        f'{schema.__name__}List', __base__=PageSchema, data=list[schema]
+    )
+
+
+@cache
+def get_partial_batch(schema: type[ModelSchema]) -> type[BaseModel]:
+    return create_model(
+        f'{schema.__name__}Batch', __base__=BatchSchema, data=list[schema]
+    )
+
+
+@cache
+def get_partial_response(schema: type[ModelSchema]) -> type[BaseModel]:
+    return create_model(f'{schema.__name__}Response', data=schema)
+
+
+class FieldSelection:
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        schema: type[ModelSchema],
+        fields: tuple[str, ...] | None,
+        excluded: tuple[str, ...] = (),
+        page_model: type[BaseModel] | None = None,
+        response_model: type[BaseModel] | None = None,
+        batch_model: type[BaseModel] | None = None,
+    ):
+        self.fields = fields
+        if fields is None:
+            self.schema = schema
+            self.projection = {name: 0 for name in excluded} or None
+            self.page_model = page_model or get_partial_page(schema)
+            self.response_model = response_model or get_partial_response(schema)
+            self.batch_model = batch_model or get_partial_batch(schema)
+        else:
+            self.schema = get_partial_schema(schema, fields)
+            self.projection = {'_id': 1} | {
+                name: 1 for name in fields if name != 'id'
+            }
+            self.page_model = get_partial_page(self.schema)
+            self.response_model = get_partial_response(self.schema)
+            self.batch_model = get_partial_batch(self.schema)
+
+    @property
+    def is_partial(self) -> bool:
+        return self.fields is not None
+
+    def projection_with(self, *names: str) -> dict | None:
+        if not self.is_partial:
+            return self.projection
+        return self.projection | {name: 1 for name in names}
+
+    def render_page(
+        self, page: dict, headers: dict | None = None
+    ) -> ModelResponse:
+        return ModelResponse(self.page_model, page, headers=headers)
+
+    def render_batch(
+        self, documents: list[dict], missing: list[str]
+    ) -> ModelResponse:
+        return ModelResponse(
+            self.batch_model, dict(data=documents, missing=missing)
+        )
+
+    def render_one(
+        self, document: dict, headers: dict | None = None
+    ) -> ModelResponse:
+        return ModelResponse(
+            self.response_model, dict(data=document), headers=headers
+        )
+
+
+def select_fields(
+    schema: type[ModelSchema],
+    excluded: tuple[str, ...] = (),
+    page_model: type[BaseModel] | None = None,
+    response_model: type[BaseModel] | None = None,
+    batch_model: type[BaseModel] | None = None,
+):
+    def dependency(
+        fields: Annotated[
+            str | None,
+            Query(description='Campos da resposta, separados por vírgula'),
+        ] = None,
+    ) -> FieldSelection:
+        return FieldSelection(
+            schema,
+            parse_fields(fields, schema),
+            excluded,
+            page_model,
+            response_model,
+            batch_model,
+        )
+
+    return dependency
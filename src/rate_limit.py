@@ -0,0 +1,97 @@
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from src.settings import settings
+
+
+# Token bucket por chave num LRU de `max_keys`: uma chave despejada volta
+# com o balde cheio, o que só atinge as paradas há mais tempo.
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_keys: int,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.timer = timer
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = (
+            OrderedDict()
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.burst > 0 and self.max_keys > 0
+
+    # Devolve 0 ao consumir um token, ou os segundos até o próximo.
+    def acquire(self, key: Hashable) -> float:
+        if not self.enabled:
+            return 0.0
+
+        now = self.timer()
+        tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+
+    async def __aenter__(self):
+        if self.limit and self.active >= self.limit:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Serviço temporariamente indisponível',
+                headers={'Retry-After': '1'},
+            )
+        self.active += 1
+
+    async def __aexit__(self, *exc_info):
+        self.active -= 1
+
+
+def too_many_requests(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        detail='Muitas tentativas. Tente novamente mais tarde',
+        headers={'Retry-After': str(math.ceil(wait))},
+    )
+
+
+login_ip_limiter = RateLimiter(
+    rate=settings.LOGIN_IP_RATE_PER_SECOND,
+    burst=settings.LOGIN_IP_BURST,
+    max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+)
+login_username_limiter = RateLimiter(
+    rate=settings.LOGIN_USERNAME_RATE_PER_SECOND,
+    burst=settings.LOGIN_USERNAME_BURST,
+    max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS,
+)
+login_concurrency = ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENCY)
@@ -0,0 +1,32 @@
+from functools import cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from src.timing import phase
+
+
+@cache
+def get_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+# Validada uma vez e serializada direto em bytes; por ser uma Response, o
+# FastAPI pula o `response_model`, que fica só para o OpenAPI.
+class ModelResponse(Response):
+    media_type = 'application/json'
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        content: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ):
+        adapter = get_adapter(model)
+        with phase('serialize'):
+            body = adapter.dump_json(
+                adapter.validate_python(content), by_alias=True
+            )
+        super().__init__(body, status_code=status_code, headers=headers)
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.auth.authorization import enforcer_registry
+from src.database import MangaCollection, MangaCountsCollection
+from src.facets import rebuild_facet_counts
+from src.manga_cache import manga_cache
+from src.schemas.admin import CacheStatsResponse
+from src.schemas.base import MessageResponse
+from src.schemas.mangas import MangaFacetsResponse
+from src.security import AdminUser, principal_cache
+
+router = APIRouter(prefix='/admin', tags=['Admin'])
+
+
+@router.post('/policies/reload', response_model=MessageResponse)
+async def reload_policies(
+    user: AdminUser,
+    resource_type: Annotated[str | None, Query(pattern=r'^[a-z_]+$')] = None,
+):
+    try:
+        await enforcer_registry.reload(resource_type)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Política não encontrada',
+        )
+
+    return dict(message='Políticas recarregadas')
+
+
+@router.get('/caches', response_model=CacheStatsResponse)
+async def cache_stats(user: AdminUser):
+    return dict(
+        data=dict(
+            principals=principal_cache.stats(), mangas=manga_cache.stats()
+        )
+    )
+
+
+@router.post('/facets/rebuild', response_model=MangaFacetsResponse)
+async def rebuild_facets(
+    user: AdminUser,
+    collection: MangaCollection,
+    counts: MangaCountsCollection,
+):
+    return dict(data=await rebuild_facet_counts(collection, counts))
@@ -1,44 +1,76 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.database import UserCollection
+from src.rate_limit import (
+    login_concurrency,
+    login_ip_limiter,
+    login_username_limiter,
+    too_many_requests,
+)
 from src.schemas.base import TokenSchema
-from src.schemas.users import UserResponse
-from src.security import CurrentUser, create_access_token, verify_password
+from src.schemas.users import Principal, UserResponse
+from src.security import (
+    CurrentProfile,
+    CurrentUser,
+    create_access_token,
+    get_dummy_hash,
+    get_token_claims,
+    password_hasher,
+)
 
 router = APIRouter(prefix='/auth', tags=['Auth'])
 
 OAuthForm = Annotated[OAuth2PasswordRequestForm, Depends()]
 
 
-@router.post('/token', response_model=TokenSchema)
+async def check_login_rate(request: Request, form_data: OAuthForm):
+    # async para rodar no loop: os limitadores não são seguros entre threads.
+    client_ip = request.client.host if request.client else None
+    wait = login_ip_limiter.acquire(client_ip)
+    if not wait:
+        wait = login_username_limiter.acquire(form_data.username.casefold())
+    if wait:
+        raise too_many_requests(wait)
+
+
+@router.post(
+    '/token',
+    response_model=TokenSchema,
+    dependencies=[Depends(check_login_rate)],
+)
 async def login_for_access_token(
     form_data: OAuthForm, collection: UserCollection
 ):
-    user = await collection.find_one({'username': form_data.username})
+    async with login_concurrency:
+        user = await collection.find_one({'username': form_data.username})
+        hashed_password = get_dummy_hash() if user is None else user['password']
+        verified = await password_hasher.verify(
+            form_data.password, hashed_password
+        )
 
-    if user is None or not verify_password(
-        form_data.password, user['password']
-    ):
+    if user is None or not verified:
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Nome de usuário ou senha incorretos',
             headers={'WWW-Authenticate': 'Bearer'},
         )
 
-    access_token = create_access_token(dict(sub=user['_id']))
+    access_token = create_access_token(
+        get_token_claims(Principal.model_validate(user))
+    )
     return dict(access_token=access_token, token_type='bearer')
 
 
 @router.post('/refresh', response_model=TokenSchema)
 async def refresh_access_token(user: CurrentUser):
-    new_access_token = create_access_token(dict(sub=user['_id']))
+    new_access_token = create_access_token(get_token_claims(user))
     return dict(access_token=new_access_token, token_type='bearer')
 
 
 @router.get('/me', response_model=UserResponse)
-async def get_me(user: CurrentUser):
+async def get_me(user: CurrentProfile):
     return dict(data=user)
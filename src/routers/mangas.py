@@ -1,114 +1,559 @@
+import json
 from datetime import datetime, timezone
 from http import HTTPStatus
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from pydantic import ValidationError
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 from ulid import ulid
 
-from src.database import MangaCollection
-from src.schemas.base import MessageResponse
+from src.autocomplete import (
+    TITLE_KEYS_FIELD,
+    find_by_prefix,
+    get_title_keys,
+    normalize_title,
+    title_index,
+)
+from src.batch import BatchIds, check_batch_ids, find_batch
+from src.bulk import DUPLICATE_KEY_ERROR, insert_unordered
+from src.database import MangaCollection, MangaCountsCollection
+from src.etag import (
+    Conditional,
+    IfMatch,
+    build_if_match_filter,
+    get_cache_headers,
+    if_match_satisfied,
+    make_etag,
+    not_modified,
+    precondition_failed,
+)
+from src.facets import (
+    FACET_FIELDS,
+    count_created,
+    count_deleted,
+    count_mangas,
+    count_updated,
+    get_facet_counts,
+    is_facet_change,
+)
+from src.manga_cache import manga_cache
+from src.pagination import Pagination, paginate
+from src.projection import FieldSelection, select_fields
+from src.responses import ModelResponse
+from src.schemas.base import BatchInput, MessageResponse
 from src.schemas.mangas import (
+    ContentRatingEnum,
+    DemographicEnum,
+    MangaBatch,
+    MangaBulkResponse,
     MangaCreateInput,
+    MangaFacetsResponse,
+    MangaFilters,
     MangaList,
     MangaResponse,
+    MangaSchema,
+    MangaSuggestionList,
     MangaType,
     MangaUpdateInput,
+    StateEnum,
+    StatusEnum,
 )
+from src.search import text_search
+from src.settings import settings
+from src.streaming import (
+    NDJSON_MEDIA_TYPE,
+    StreamMediaType,
+    read_body,
+    read_ndjson,
+    stream_documents,
+)
+from src.view_counter import VIEWS_FIELD, find_popular, view_counter
 
 router = APIRouter(prefix='/mangas', tags=['Mangas'])
 
+MangaFields = Annotated[
+    FieldSelection,
+    Depends(
+        select_fields(
+            MangaSchema,
+            page_model=MangaList,
+            response_model=MangaResponse,
+            batch_model=MangaBatch,
+        )
+    ),
+]
+
+FILTER_FIELDS = ('status', 'content_rating', 'state', 'publication_demographic')
+
+
+def get_manga_filters(  # noqa: PLR0913, PLR0917
+    status: Annotated[list[StatusEnum] | None, Query()] = None,
+    content_rating: Annotated[list[ContentRatingEnum] | None, Query()] = None,
+    state: Annotated[list[StateEnum] | None, Query()] = None,
+    publication_demographic: Annotated[
+        list[DemographicEnum] | None, Query()
+    ] = None,
+    year_from: Annotated[int | None, Query(ge=1900)] = None,
+    year_to: Annotated[int | None, Query(ge=1900)] = None,
+) -> MangaFilters:
+    return MangaFilters(
+        status=status,
+        content_rating=content_rating,
+        state=state,
+        publication_demographic=publication_demographic,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+
+MangaFilterParams = Annotated[MangaFilters, Depends(get_manga_filters)]
+
+
+def build_manga_filter(filters: MangaFilters) -> dict:
+    query = {}
+    for field in FILTER_FIELDS:
+        values = getattr(filters, field)
+        if values:
+            query[field] = values[0] if len(values) == 1 else {'$in': values}
+
+    year = {}
+    if filters.year_from is not None:
+        year['$gte'] = filters.year_from
+    if filters.year_to is not None:
+        year['$lte'] = filters.year_to
+    if year:
+        query['year'] = year
+
+    return query
+
 
 @router.get('/', response_model=MangaList)
-async def index_mangas(collection: MangaCollection):
-    list_mangas = await collection.find().to_list()
-    return dict(data=list_mangas)
+async def index_mangas(  # noqa: PLR0913, PLR0917
+    collection: MangaCollection,
+    counts: MangaCountsCollection,
+    pagination: Pagination,
+    filters: MangaFilterParams,
+    selection: MangaFields,
+    media_type: StreamMediaType,
+):
+    query = build_manga_filter(filters)
+    if media_type is not None:
+        return stream_documents(
+            collection,
+            selection.schema,
+            media_type,
+            query=query,
+            projection=selection.projection,
+        )
+
+    page = await paginate(
+        collection, pagination, query, projection=selection.projection
+    )
+    total = await count_mangas(collection, counts, query)
+    return selection.render_page(
+        page, {'X-Total-Count': str(total)} if total is not None else None
+    )
+
+
+@router.get('/facets', response_model=MangaFacetsResponse)
+async def show_manga_facets(counts: MangaCountsCollection):
+    return ModelResponse(
+        MangaFacetsResponse, dict(data=await get_facet_counts(counts))
+    )
+
+
+@router.get('/search', response_model=MangaList)
+async def search_mangas(
+    q: Annotated[str, Query(min_length=1)],
+    collection: MangaCollection,
+    selection: MangaFields,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.PAGE_SIZE_MAX)
+    ] = settings.PAGE_SIZE_DEFAULT,
+    after: str | None = None,
+):
+    return selection.render_page(
+        await text_search(
+            collection, q, limit, after, projection=selection.projection
+        )
+    )
+
+
+@router.get('/batch', response_model=MangaBatch)
+async def batch_mangas(
+    ids: BatchIds, collection: MangaCollection, selection: MangaFields
+):
+    return selection.render_batch(
+        *await find_batch(collection, ids, selection.projection)
+    )
+
+
+@router.post('/batch', response_model=MangaBatch)
+async def batch_mangas_by_body(
+    batch: BatchInput, collection: MangaCollection, selection: MangaFields
+):
+    return selection.render_batch(
+        *await find_batch(
+            collection, check_batch_ids(batch.ids), selection.projection
+        )
+    )
+
+
+@router.get('/popular', response_model=MangaList)
+async def popular_mangas(
+    collection: MangaCollection,
+    selection: MangaFields,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.PAGE_SIZE_MAX)
+    ] = settings.PAGE_SIZE_DEFAULT,
+    after: str | None = None,
+):
+    return selection.render_page(
+        await find_popular(
+            collection,
+            limit,
+            after,
+            projection=selection.projection_with(VIEWS_FIELD),
+        )
+    )
+
+
+@router.get('/autocomplete', response_model=MangaSuggestionList)
+async def autocomplete_mangas(
+    prefix: Annotated[str, Query(min_length=1, max_length=100)],
+    collection: MangaCollection,
+    limit: Annotated[int, Query(ge=1, le=settings.AUTOCOMPLETE_LIMIT_MAX)] = 10,
+):
+    normalized = normalize_title(prefix)
+    if not normalized:
+        suggestions = []
+    elif title_index.ready:
+        suggestions = title_index.search(normalized, limit)
+    else:
+        suggestions = await find_by_prefix(collection, normalized, limit)
+
+    return ModelResponse(MangaSuggestionList, dict(data=suggestions))
 
 
 @router.get('/{manga_id}', response_model=MangaResponse)
-async def show_manga(manga_id: str, collection: MangaCollection):
-    manga = await collection.find_one({'_id': manga_id})
+async def show_manga(
+    manga_id: str,
+    collection: MangaCollection,
+    selection: MangaFields,
+    conditional: Conditional,
+):
+    if manga_cache.active:
+        manga = await manga_cache.find_one(collection, manga_id)
+        if manga is not None and conditional.is_not_modified(manga):
+            return not_modified(manga)
+    else:
+        if conditional.is_conditional:
+            version = await collection.find_one(
+                {'_id': manga_id}, projection={'updated_at': True}
+            )
+            if version is not None and conditional.is_not_modified(version):
+                return not_modified(version)
+
+        manga = await collection.find_one(
+            {'_id': manga_id}, selection.projection_with('updated_at')
+        )
+
     if manga is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Manga não encontrado'
         )
-    return dict(data=manga)
+
+    # Só conta a visualização quando a representação completa é enviada;
+    # revalidações (304) vêm de clientes consultando o detalhe em polling.
+    # `views` não altera updated_at, então a ETag segue válida enquanto o
+    # contador sobe.
+    view_counter.increment(manga_id)
+
+    return selection.render_one(manga, get_cache_headers(manga))
+
+
+def build_manga(manga_data: MangaCreateInput) -> MangaType:
+    return MangaType(
+        _id=ulid(),
+        title=manga_data.title,
+        alternatives_titles=manga_data.alternatives_titles,
+        description=manga_data.description,
+        original_language=manga_data.original_language,
+        publication_demographic=manga_data.publication_demographic,
+        status=manga_data.status,
+        year=manga_data.year,
+        content_rating=manga_data.content_rating,
+        state=manga_data.state,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+        title_keys=get_title_keys(
+            manga_data.title, manga_data.alternatives_titles
+        ),
+        views=0,
+    )
+
+
+def index_title(manga: MangaType):
+    title_index.add(manga['_id'], manga['title'], manga[TITLE_KEYS_FIELD])
 
 
 @router.post(
     '/', status_code=HTTPStatus.CREATED, response_model=MessageResponse
 )
 async def create_manga(
-    collection: MangaCollection, manga_data: MangaCreateInput
+    collection: MangaCollection,
+    counts: MangaCountsCollection,
+    manga_data: MangaCreateInput,
 ):
+    manga = build_manga(manga_data)
     try:
-        await collection.insert_one(
-            MangaType(
-                _id=ulid(),
-                title=manga_data.title,
-                alternatives_titles=manga_data.alternatives_titles,
-                description=manga_data.description,
-                original_language=manga_data.original_language,
-                publication_demographic=manga_data.publication_demographic,
-                status=manga_data.status,
-                year=manga_data.year,
-                content_rating=manga_data.content_rating,
-                state=manga_data.state,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc),
-            )
-        )
+        await collection.insert_one(manga)
     except DuplicateKeyError:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='Manga com esse título já existe!',
         )
 
+    index_title(manga)
+    await count_created(counts, [manga])
     return dict(message='Manga criado')
 
 
-@router.put('/{manga_id}', response_model=MessageResponse)
-async def update_manga(
-    manga_id: str, collection: MangaCollection, manga_data: MangaUpdateInput
-):
-    manga = await collection.find_one({'_id': manga_id})
-    if manga is None:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail='Manga não encontrado'
-        )
-    updated_data = manga_data.model_dump(
-        exclude_none=True, exclude_unset=True
-    ).copy()
+def validate_bulk_item(validate, value) -> MangaCreateInput | ValidationError:
+    try:
+        return validate(value)
+    except ValidationError as error:
+        return error
 
-    is_updated = any(manga.get(k) != v for k, v in updated_data.items())
-    if is_updated:
-        updated_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-    else:
-        raise HTTPException(
-            status_code=HTTPStatus.BAD_REQUEST, detail='Nada a ser atualizado!'
-        )
+
+async def read_bulk_items(
+    request: Request,
+) -> list[MangaCreateInput | ValidationError]:
+    too_large = HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail=f'Limite de {settings.BULK_MAX_ITEMS} itens excedido',
+    )
+
+    max_bytes = settings.BULK_MAX_ITEMS * settings.BULK_MAX_ITEM_BYTES
+    if NDJSON_MEDIA_TYPE in request.headers.get('content-type', ''):
+        items = []
+        async for line in read_ndjson(request, max_bytes):
+            if len(items) == settings.BULK_MAX_ITEMS:
+                raise too_large
+            items.append(
+                validate_bulk_item(MangaCreateInput.model_validate_json, line)
+            )
+        return items
 
     try:
-        await collection.update_one(
-            {'_id': manga_id},
-            {'$set': updated_data},
-        )
-    except DuplicateKeyError:
+        raw_items = json.loads(await read_body(request, max_bytes))
+    except ValueError:
+        raw_items = None
+    if not isinstance(raw_items, list):
         raise HTTPException(
-            status_code=HTTPStatus.CONFLICT,
-            detail='Manga com esse título já existe!',
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='O corpo deve ser uma lista JSON ou NDJSON',
         )
+    if len(raw_items) > settings.BULK_MAX_ITEMS:
+        raise too_large
 
+    return [
+        validate_bulk_item(MangaCreateInput.model_validate, raw_item)
+        for raw_item in raw_items
+    ]
+
+
+@router.post(
+    '/bulk',
+    response_model=MangaBulkResponse,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/json': {
+                    'schema': {
+                        'type': 'array',
+                        'items': {
+                            '$ref': '#/components/schemas/MangaCreateInput'
+                        },
+                    }
+                },
+                NDJSON_MEDIA_TYPE: {
+                    'schema': {'$ref': '#/components/schemas/MangaCreateInput'}
+                },
+            },
+        }
+    },
+)
+async def bulk_create_mangas(
+    request: Request,
+    collection: MangaCollection,
+    counts: MangaCountsCollection,
+):
+    documents, errors = [], []
+    for index, item in enumerate(await read_bulk_items(request)):
+        if isinstance(item, ValidationError):
+            errors.append(
+                dict(
+                    index=index,
+                    detail=item.errors(
+                        include_url=False,
+                        include_context=False,
+                        include_input=False,
+                    ),
+                )
+            )
+        else:
+            documents.append((index, build_manga(item)))
+
+    created, failed = await insert_unordered(
+        collection, documents, settings.BULK_BATCH_SIZE
+    )
+    mangas = dict(documents)
+    for index, _ in created:
+        index_title(mangas[index])
+    await count_created(counts, (mangas[index] for index, _ in created))
+    conflicts = []
+    for index, code, message in failed:
+        if code == DUPLICATE_KEY_ERROR:
+            conflicts.append(
+                dict(index=index, detail='Manga com esse título já existe!')
+            )
+        else:
+            errors.append(dict(index=index, detail=message))
+
+    return dict(
+        created=[dict(index=index, id=_id) for index, _id in created],
+        conflicts=conflicts,
+        errors=sorted(errors, key=lambda error: error['index']),
+    )
+
+
+@router.put('/{manga_id}', response_model=MessageResponse)
+async def update_manga(  # noqa: PLR0913, PLR0917
+    manga_id: str,
+    collection: MangaCollection,
+    counts: MangaCountsCollection,
+    manga_data: MangaUpdateInput,
+    response: Response,
+    if_match: IfMatch = None,
+):
+    updated_data = manga_data.model_dump(exclude_none=True, exclude_unset=True)
+
+    previous = None
+    updated_at = datetime.now(timezone.utc)
+    titles_changed = bool(
+        updated_data.keys() & {'title', 'alternatives_titles'}
+    )
+    facets_changed = is_facet_change(updated_data)
+    if updated_data:
+        query = {
+            '_id': manga_id,
+            '$or': [{k: {'$ne': v}} for k, v in updated_data.items()],
+            **build_if_match_filter(if_match, manga_id),
+        }
+        # O documento anterior traz só os campos que o título e os
+        # contadores precisam; o novo é ele mesclado com o que foi gravado.
+        projection = ['_id']
+        if titles_changed:
+            projection += ['title', 'alternatives_titles']
+        if facets_changed:
+            projection += FACET_FIELDS
+        try:
+            previous = await collection.find_one_and_update(
+                query,
+                {'$set': {**updated_data, 'updated_at': updated_at}},
+                projection=projection,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT,
+                detail='Manga com esse título já existe!',
+            )
+
+    if previous is None:
+        raise await get_update_error(collection, manga_id, if_match)
+
+    manga = {**previous, **updated_data}
+    if titles_changed:
+        await update_title_keys(collection, manga, updated_at)
+    if facets_changed:
+        await count_updated(counts, previous, manga)
+    manga_cache.invalidate(manga_id)
+    response.headers['ETag'] = make_etag(manga_id, updated_at)
     return dict(message='Manga atualizado')
 
 
+async def update_title_keys(
+    collection: MangaCollection, manga: dict, updated_at: datetime
+):
+    # As chaves dependem do título e dos alternativos juntos, e a
+    # requisição pode ter alterado só um deles. Só grava sobre a versão
+    # que as originou; se outra atualização chegou antes, relê e recalcula.
+    while True:
+        title_keys = get_title_keys(
+            manga['title'], manga.get('alternatives_titles', ())
+        )
+        result = await collection.update_one(
+            {'_id': manga['_id'], 'updated_at': updated_at},
+            {'$set': {TITLE_KEYS_FIELD: title_keys}},
+        )
+        if result.matched_count:
+            break
+        manga = await collection.find_one(
+            {'_id': manga['_id']},
+            ['title', 'alternatives_titles', 'updated_at'],
+        )
+        if manga is None:
+            return
+        updated_at = manga['updated_at']
+    title_index.add(manga['_id'], manga['title'], title_keys)
+
+
+async def get_update_error(
+    collection: MangaCollection, manga_id: str, if_match: str | None
+) -> HTTPException:
+    manga = await collection.find_one(
+        {'_id': manga_id}, projection={'updated_at': True}
+    )
+    if manga is None:
+        return HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Manga não encontrado'
+        )
+    if not if_match_satisfied(if_match, manga_id, manga['updated_at']):
+        return precondition_failed()
+    return HTTPException(
+        status_code=HTTPStatus.BAD_REQUEST, detail='Nada a ser atualizado!'
+    )
+
+
 @router.delete('/{manga_id}', response_model=MessageResponse)
-async def delete_manga(manga_id: str, collection: MangaCollection):
-    result = await collection.delete_one({'_id': manga_id})
+async def delete_manga(
+    manga_id: str,
+    collection: MangaCollection,
+    counts: MangaCountsCollection,
+):
+    manga = await collection.find_one_and_delete(
+        {'_id': manga_id}, projection=FACET_FIELDS
+    )
 
-    if result.deleted_count == 0:
+    if manga is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Manga não encontrado!',
         )
 
+    manga_cache.invalidate(manga_id)
+    title_index.remove(manga_id)
+    await count_deleted(counts, manga)
     return dict(message='Manga deletado')
@@ -1,43 +1,120 @@
 from datetime import datetime, timezone
 from http import HTTPStatus
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 from ulid import ulid
 
 from src.auth.authorization import get_authorization
+from src.batch import BatchIds, check_batch_ids, find_batch
 from src.database import UserCollection
-from src.schemas.base import MessageResponse
+from src.etag import (
+    Conditional,
+    IfMatch,
+    get_cache_headers,
+    if_match_satisfied,
+    make_etag,
+    not_modified,
+    precondition_failed,
+)
+from src.pagination import Pagination, paginate
+from src.projection import FieldSelection, select_fields
+from src.schemas.base import BatchInput, MessageResponse
 from src.schemas.users import (
     RoleEnum,
+    UserBatch,
     UserCreateInput,
     UserDB,
     UserList,
     UserResponse,
+    UserSchema,
     UserType,
     UserUpdateInput,
 )
-from src.security import CurrentUser, get_password_hash, verify_password
+from src.security import CurrentUser, invalidate_user, password_hasher
+from src.streaming import StreamMediaType, stream_documents
 
 router = APIRouter(prefix='/users', tags=['Users'])
 
+UserFields = Annotated[
+    FieldSelection,
+    Depends(
+        select_fields(
+            UserSchema,
+            excluded=('password',),
+            page_model=UserList,
+            response_model=UserResponse,
+            batch_model=UserBatch,
+        )
+    ),
+]
+
 
 @router.get('/', response_model=UserList)
-async def index_users(collection: UserCollection):
-    list_users = await collection.find().to_list()
-    return dict(data=list_users)
+async def index_users(
+    collection: UserCollection,
+    pagination: Pagination,
+    selection: UserFields,
+    media_type: StreamMediaType,
+):
+    if media_type is not None:
+        return stream_documents(
+            collection,
+            selection.schema,
+            media_type,
+            projection=selection.projection,
+        )
+
+    return selection.render_page(
+        await paginate(collection, pagination, projection=selection.projection)
+    )
+
+
+@router.get('/batch', response_model=UserBatch)
+async def batch_users(
+    ids: BatchIds, collection: UserCollection, selection: UserFields
+):
+    return selection.render_batch(
+        *await find_batch(collection, ids, selection.projection)
+    )
+
+
+@router.post('/batch', response_model=UserBatch)
+async def batch_users_by_body(
+    batch: BatchInput, collection: UserCollection, selection: UserFields
+):
+    return selection.render_batch(
+        *await find_batch(
+            collection, check_batch_ids(batch.ids), selection.projection
+        )
+    )
 
 
 @router.get('/{user_id}', response_model=UserResponse)
-async def show_user(user_id: str, collection: UserCollection):
-    user = await collection.find_one({'_id': user_id})
+async def show_user(
+    user_id: str,
+    collection: UserCollection,
+    selection: UserFields,
+    conditional: Conditional,
+):
+    if conditional.is_conditional:
+        version = await collection.find_one(
+            {'_id': user_id}, projection={'updated_at': True}
+        )
+        if version is not None and conditional.is_not_modified(version):
+            return not_modified(version)
+
+    user = await collection.find_one(
+        {'_id': user_id}, selection.projection_with('updated_at')
+    )
     if user is None:
         raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail='Usuário não encontrado',
+            status_code=HTTPStatus.NOT_FOUND, detail='Usuário não encontrado'
         )
 
-    return dict(data=user)
+    return selection.render_one(user, get_cache_headers(user))
 
 
 @router.post(
@@ -49,8 +126,9 @@ async def create_user(user_data: UserCreateInput, collection: UserCollection):
             UserType(
                 _id=ulid(),
                 username=user_data.username,
-                password=get_password_hash(user_data.password),
+                password=await password_hasher.hash(user_data.password),
                 role=RoleEnum.READER,
+                token_version=0,
                 created_at=datetime.now(timezone.utc),
                 updated_at=datetime.now(timezone.utc),
             )
@@ -65,11 +143,13 @@ async def create_user(user_data: UserCreateInput, collection: UserCollection):
 
 
 @router.put('/{user_id}', response_model=MessageResponse)
-async def update_user(
+async def update_user(  # noqa: PLR0913, PLR0917
     user_id: str,
     user_data: UserUpdateInput,
     collection: UserCollection,
     current_user: CurrentUser,
+    response: Response,
+    if_match: IfMatch = None,
 ):
     user = await collection.find_one({'_id': user_id})
 
@@ -82,7 +162,10 @@ async def update_user(
         current_user, UserDB.model_validate(user), 'update', 'user'
     )
 
-    if user_data.password is not None and verify_password(
+    if not if_match_satisfied(if_match, user_id, user['updated_at']):
+        raise precondition_failed()
+
+    if user_data.password is not None and await password_hasher.verify(
         user_data.password, user['password']
     ):
         raise HTTPException(
@@ -90,28 +173,32 @@ async def update_user(
             detail='A nova senha não pode ser igual a senha atual!',
         )
 
-    updated_data = user_data.model_dump(
-        exclude_none=True, exclude_unset=True
-    ).copy()
+    updated_data = user_data.model_dump(exclude_none=True, exclude_unset=True)
 
     is_updated = any(user.get(k) != v for k, v in updated_data.items())
-    if is_updated:
-        updated_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-    else:
+    if not is_updated:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST, detail='Nada a ser atualizado!'
         )
 
-    updated_data['password'] = (
-        get_password_hash(updated_data['password'])
-        if 'password' in updated_data
-        else user['password']
-    )
+    updated_data['updated_at'] = datetime.now(timezone.utc)
+    update = {'$set': updated_data}
+    if 'password' in updated_data:
+        updated_data['password'] = await password_hasher.hash(
+            updated_data['password']
+        )
+    # Tokens stateless carregam o username; trocá-lo também os revoga.
+    if updated_data.keys() & {'password', 'username'}:
+        update['$inc'] = {'token_version': 1}
 
+    # A leitura acima é necessária para a autorização; o filtro por
+    # updated_at garante que nenhuma escrita concorrente ocorreu desde então.
     try:
-        await collection.update_one(
-            {'_id': user_id},
-            {'$set': updated_data},
+        user = await collection.find_one_and_update(
+            {'_id': user_id, 'updated_at': user['updated_at']},
+            update,
+            projection={'updated_at': True},
+            return_document=ReturnDocument.AFTER,
         )
     except DuplicateKeyError:
         raise HTTPException(
@@ -119,6 +206,11 @@ async def update_user(
             detail='Username não esta disponível!',
         )
 
+    invalidate_user(user_id)
+    if user is None:
+        raise precondition_failed()
+
+    response.headers['ETag'] = make_etag(user_id, user['updated_at'])
     return dict(message='Usuário atualizado!')
 
 
@@ -138,5 +230,6 @@ async def delete(
     )
 
     await collection.delete_one({'_id': user_id})
+    invalidate_user(user_id)
 
     return dict(message='Usuário deletado!')
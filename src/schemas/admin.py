@@ -0,0 +1,12 @@
+from src.schemas.base import BaseSchema
+
+
+class CacheStatsSchema(BaseSchema):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
+class CacheStatsResponse(BaseSchema):
+    data: dict[str, CacheStatsSchema]
@@ -14,6 +14,19 @@ class ModelSchema(BaseSchema):
     id: str = Field(validation_alias=AliasChoices('id', '_id'))
 
 
+class PageSchema(BaseSchema):
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+
+class BatchSchema(BaseSchema):
+    missing: list[str]
+
+
+class BatchInput(BaseSchema):
+    ids: list[str]
+
+
 class MessageResponse(BaseSchema):
     message: str
 
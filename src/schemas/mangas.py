@@ -1,10 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
-from src.schemas.base import BaseSchema, ModelSchema
+from src.schemas.base import BaseSchema, BatchSchema, ModelSchema, PageSchema
 
 
 class StatusEnum(str, Enum):
@@ -48,6 +48,8 @@ class MangaType(TypedDict):
     state: StateEnum
     created_at: datetime
     updated_at: datetime
+    title_keys: NotRequired[list[str]]
+    views: NotRequired[int]
 
 
 class MangaCreateInput(BaseSchema):
@@ -84,6 +86,7 @@ class MangaSchema(ModelSchema):
     year: int | None = None
     content_rating: ContentRatingEnum
     state: StateEnum
+    views: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -92,5 +95,54 @@ class MangaResponse(BaseSchema):
     data: MangaSchema
 
 
-class MangaList(BaseSchema):
+class MangaList(PageSchema):
     data: list[MangaSchema]
+
+
+class MangaBatch(BatchSchema):
+    data: list[MangaSchema]
+
+
+class MangaSuggestion(ModelSchema):
+    title: str
+
+
+class MangaSuggestionList(BaseSchema):
+    data: list[MangaSuggestion]
+
+
+class MangaFacetsSchema(BaseSchema):
+    total: int
+    status: dict[str, int]
+    content_rating: dict[str, int]
+    state: dict[str, int]
+    publication_demographic: dict[str, int]
+
+
+class MangaFacetsResponse(BaseSchema):
+    data: MangaFacetsSchema
+
+
+class MangaFilters(BaseModel):
+    status: list[StatusEnum] | None = None
+    content_rating: list[ContentRatingEnum] | None = None
+    state: list[StateEnum] | None = None
+    publication_demographic: list[DemographicEnum] | None = None
+    year_from: int | None = Field(default=None, ge=1900)
+    year_to: int | None = Field(default=None, ge=1900)
+
+
+class BulkCreatedSchema(BaseSchema):
+    index: int
+    id: str
+
+
+class BulkErrorSchema(BaseSchema):
+    index: int
+    detail: str | list[dict]
+
+
+class MangaBulkResponse(BaseSchema):
+    created: list[BulkCreatedSchema]
+    conflicts: list[BulkErrorSchema]
+    errors: list[BulkErrorSchema]
@@ -1,10 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 from pydantic import Field
 
-from src.schemas.base import BaseSchema, ModelSchema
+from src.schemas.base import BaseSchema, BatchSchema, ModelSchema, PageSchema
 
 
 class RoleEnum(str, Enum):
@@ -33,7 +33,11 @@ class UserResponse(BaseSchema):
     data: UserSchema
 
 
-class UserList(BaseSchema):
+class UserList(PageSchema):
+    data: list[UserSchema]
+
+
+class UserBatch(BatchSchema):
     data: list[UserSchema]
 
 
@@ -42,13 +46,18 @@ class UserType(TypedDict):
     username: str
     password: str
     role: RoleEnum
+    token_version: NotRequired[int]
     created_at: datetime
     updated_at: datetime
 
 
-class UserDB(ModelSchema):
+class Principal(ModelSchema):
     username: str
-    password: str
     role: RoleEnum = Field(default=RoleEnum.READER)
+    token_version: int = Field(default=0)
+
+
+class UserDB(Principal):
+    password: str
     created_at: datetime
     updated_at: datetime
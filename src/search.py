@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from pymongo.asynchronous.collection import AsyncCollection
+
+from src.pagination import decode_cursor, encode_cursor
+
+SCORE_FIELD = '_score'
+
+
+def encode_search_cursor(score: float, document_id: str) -> str:
+    return encode_cursor(f'{score!r}:{document_id}')
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, str]:
+    score, _, document_id = decode_cursor(cursor).partition(':')
+    try:
+        return float(score), document_id
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Cursor inválido'
+        )
+
+
+async def text_search(
+    collection: AsyncCollection,
+    text: str,
+    limit: int,
+    after: str | None = None,
+    projection: dict | None = None,
+):
+    pipeline = [
+        {'$match': {'$text': {'$search': text}}},
+        {'$addFields': {SCORE_FIELD: {'$meta': 'textScore'}}},
+    ]
+    if after is not None:
+        score, document_id = decode_search_cursor(after)
+        pipeline.append({
+            '$match': {
+                '$or': [
+                    {SCORE_FIELD: {'$lt': score}},
+                    {SCORE_FIELD: score, '_id': {'$gt': document_id}},
+                ]
+            }
+        })
+    pipeline += [
+        {'$sort': {SCORE_FIELD: -1, '_id': 1}},
+        {'$limit': limit + 1},
+    ]
+    if projection is not None:
+        pipeline.append({'$project': projection | {SCORE_FIELD: 1}})
+
+    cursor = await collection.aggregate(pipeline)
+    documents = await cursor.to_list()
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    return dict(
+        data=documents,
+        next_cursor=(
+            encode_search_cursor(
+                documents[-1][SCORE_FIELD], documents[-1]['_id']
+            )
+            if has_more
+            else None
+        ),
+    )
@@ -1,4 +1,8 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from http import HTTPStatus
 from typing import Annotated
 
@@ -7,11 +11,22 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt import DecodeError, ExpiredSignatureError, decode, encode
 from pwdlib import PasswordHash
 
+from src.cache import TTLCache
 from src.database import UserCollection
-from src.schemas.users import UserDB, UserType
+from src.metrics import password_hash_duration
+from src.schemas.users import Principal, RoleEnum, UserDB, UserType
 from src.settings import settings
+from src.timing import phase
 
 pwd_context = PasswordHash.recommended()
+principal_cache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+token_version_cache = TTLCache(
+    max_size=settings.TOKEN_VERSION_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl='auth/token', refreshUrl='auth/refresh'
 )
@@ -25,6 +40,72 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@cache
+def get_dummy_hash() -> str:
+    # Verificar contra este hash custa o mesmo que contra um hash real, então
+    # um username inexistente não responde mais rápido que um existente.
+    return get_password_hash('mangify-dummy-password')
+
+
+def timed(func, *args):
+    # Mede só o argon2, sem o tempo de espera na fila do executor.
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordHasher:
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='argon2'
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Serviço temporariamente indisponível',
+                headers={'Retry-After': '1'},
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(
+                self._get_executor(), timed, func, *args
+            )
+        finally:
+            self.pending -= 1
+
+        password_hash_duration.observe(elapsed, func.__name__)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(
@@ -39,6 +120,38 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
+def get_token_claims(user: Principal) -> dict:
+    claims = dict(sub=user.id)
+    if settings.TOKEN_STATELESS:
+        claims.update(
+            username=user.username,
+            role=user.role.value,
+            ver=user.token_version,
+        )
+    return claims
+
+
+async def get_token_version(
+    collection: UserCollection, user_id: str
+) -> int | None:
+    token_version = token_version_cache.get(user_id)
+    if token_version is not None:
+        return token_version
+
+    document = await collection.find_one({'_id': user_id}, {'token_version': 1})
+    if document is None:
+        return None
+
+    token_version = document.get('token_version', 0)
+    token_version_cache.set(user_id, token_version)
+    return token_version
+
+
+def invalidate_user(user_id: str):
+    principal_cache.invalidate(user_id)
+    token_version_cache.invalidate(user_id)
+
+
 async def get_current_user(
     collection: UserCollection, token: str = Depends(oauth2_scheme)
 ):
@@ -49,11 +162,12 @@ async def get_current_user(
     )
 
     try:
-        payload = decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
+        with phase('jwt'):
+            payload = decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+            )
         subject_id: str = payload.get('sub')
         if subject_id is None:
             raise credentials_exception
@@ -62,12 +176,80 @@ async def get_current_user(
     except ExpiredSignatureError:
         raise credentials_exception
 
-    user = await collection.find_one({'_id': subject_id})
+    with phase('user'):
+        return await load_current_user(
+            collection, subject_id, payload, credentials_exception
+        )
+
+
+async def load_current_user(
+    collection: UserCollection,
+    subject_id: str,
+    payload: dict,
+    credentials_exception: HTTPException,
+) -> Principal:
+    token_version = payload.get('ver')
+    if settings.TOKEN_STATELESS and token_version is not None:
+        if await get_token_version(collection, subject_id) != token_version:
+            raise credentials_exception
 
+        return Principal(
+            id=subject_id,
+            username=payload.get('username'),
+            role=payload.get('role'),
+            token_version=token_version,
+        )
+
+    user = principal_cache.get(subject_id)
     if user is None:
+        document = await collection.find_one({'_id': subject_id})
+        if document is None:
+            raise credentials_exception
+
+        user = UserDB.model_validate(document)
+        principal_cache.set(subject_id, user)
+
+    if token_version is not None and token_version != user.token_version:
         raise credentials_exception
 
-    return UserDB.model_validate(user)
+    return user
 
 
 CurrentUser = Annotated[UserType, Depends(get_current_user)]
+
+
+async def get_current_profile(
+    collection: UserCollection, user: CurrentUser
+) -> UserDB:
+    if isinstance(user, UserDB):
+        return user
+
+    profile = principal_cache.get(user.id)
+    if profile is None:
+        document = await collection.find_one({'_id': user.id})
+        if document is None:
+            raise HTTPException(
+                status_code=HTTPStatus.UNAUTHORIZED,
+                detail='Não foi possível validar as credenciais',
+                headers={'WWW-Authenticate': 'Bearer'},
+            )
+
+        profile = UserDB.model_validate(document)
+        principal_cache.set(user.id, profile)
+
+    return profile
+
+
+CurrentProfile = Annotated[UserType, Depends(get_current_profile)]
+
+
+async def get_admin_user(user: CurrentUser):
+    if user.role != RoleEnum.ADMIN:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Ação não autorizada'
+        )
+
+    return user
+
+
+AdminUser = Annotated[UserType, Depends(get_admin_user)]
@@ -11,9 +11,46 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = Field(init=False)
     DATABASE_NAME: str = Field(init=False)
+    DATABASE_MAX_POOL_SIZE: int = Field(default=100, ge=1)
+    DATABASE_MIN_POOL_SIZE: int = Field(default=0, ge=0)
+    DATABASE_MAX_IDLE_TIME_MS: int | None = Field(default=None, ge=0)
+    DATABASE_CONNECT_TIMEOUT_MS: int = Field(default=5_000, ge=0)
+    DATABASE_SERVER_SELECTION_TIMEOUT_MS: int = Field(default=5_000, ge=0)
+    DATABASE_SOCKET_TIMEOUT_MS: int | None = Field(default=None, ge=0)
+    DATABASE_COMPRESSORS: str = Field(default='')
+    DATABASE_CREATE_INDEXES: bool = Field(default=True)
     SECRET_KEY: str = Field(init=False)
     ALGORITHM: str = Field(init=False)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(init=False)
+    TOKEN_STATELESS: bool = Field(default=False)
+    TOKEN_VERSION_CACHE_MAX_SIZE: int = Field(default=10_000, ge=0)
+    TOKEN_VERSION_CACHE_TTL_SECONDS: float = Field(default=5, ge=0)
+    PASSWORD_HASH_WORKERS: int = Field(default=2, ge=1)
+    PASSWORD_HASH_QUEUE_SIZE: int = Field(default=32, ge=0)
+    LOGIN_MAX_CONCURRENCY: int = Field(default=4, ge=0)
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = Field(default=100_000, ge=0)
+    LOGIN_IP_RATE_PER_SECOND: float = Field(default=1, ge=0)
+    LOGIN_IP_BURST: int = Field(default=20, ge=0)
+    LOGIN_USERNAME_RATE_PER_SECOND: float = Field(default=0.2, ge=0)
+    LOGIN_USERNAME_BURST: int = Field(default=5, ge=0)
+    PRINCIPAL_CACHE_MAX_SIZE: int = Field(default=10_000, ge=0)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = Field(default=30, ge=0)
+    PAGE_SIZE_DEFAULT: int = Field(default=20, ge=1)
+    PAGE_SIZE_MAX: int = Field(default=100, ge=1)
+    STREAM_BATCH_SIZE: int = Field(default=500, ge=1)
+    BULK_MAX_ITEMS: int = Field(default=10_000, ge=1)
+    BULK_MAX_ITEM_BYTES: int = Field(default=16_384, ge=1)
+    BULK_BATCH_SIZE: int = Field(default=1_000, ge=1)
+    BATCH_MAX_IDS: int = Field(default=100, ge=1)
+    MANGA_CACHE_MAX_SIZE: int = Field(default=0, ge=0)
+    VIEW_COUNTER_FLUSH_SECONDS: float = Field(default=5, gt=0)
+    VIEW_COUNTER_MAX_PENDING: int = Field(default=10_000, ge=1)
+    AUTOCOMPLETE_PRELOAD: bool = Field(default=True)
+    AUTOCOMPLETE_REFRESH_SECONDS: float = Field(default=300, gt=0)
+    AUTOCOMPLETE_LIMIT_MAX: int = Field(default=50, ge=1)
+    METRICS_ENABLED: bool = Field(default=True)
+    SERVER_TIMING_ENABLED: bool = Field(default=False)
+    SLOW_REQUEST_THRESHOLD_MS: float | None = Field(default=None, ge=0)
 
 
 settings = Settings()
@@ -0,0 +1,124 @@
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pymongo import ASCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+
+from src.settings import settings
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+JSON_MEDIA_TYPE = 'application/json'
+
+
+def get_stream_media_type(request: Request, stream: bool = False) -> str | None:
+    if NDJSON_MEDIA_TYPE in request.headers.get('accept', ''):
+        return NDJSON_MEDIA_TYPE
+    if stream:
+        return JSON_MEDIA_TYPE
+    return None
+
+
+StreamMediaType = Annotated[str | None, Depends(get_stream_media_type)]
+
+
+async def iter_ndjson(
+    documents: AsyncIterator[dict], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    chunk = []
+    async for document in documents:
+        chunk.append(
+            schema.model_validate(document).model_dump_json(by_alias=True)
+        )
+        if len(chunk) == settings.STREAM_BATCH_SIZE:
+            yield ('\n'.join(chunk) + '\n').encode()
+            chunk.clear()
+
+    if chunk:
+        yield ('\n'.join(chunk) + '\n').encode()
+
+
+async def iter_json_array(
+    documents: AsyncIterator[dict], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    yield b'{"data":['
+    separator = b''
+    async for lines in iter_ndjson(documents, schema):
+        yield separator + lines.rstrip(b'\n').replace(b'\n', b',')
+        separator = b','
+    yield b']}'
+
+
+def stream_documents(
+    collection: AsyncCollection,
+    schema: type[BaseModel],
+    media_type: str,
+    query: dict | None = None,
+    projection: dict | None = None,
+) -> StreamingResponse:
+    async def content():
+        cursor = (
+            collection
+            .find(query or {}, projection)
+            .sort('_id', ASCENDING)
+            .batch_size(settings.STREAM_BATCH_SIZE)
+        )
+        try:
+            iterator = (
+                iter_ndjson(cursor, schema)
+                if media_type == NDJSON_MEDIA_TYPE
+                else iter_json_array(cursor, schema)
+            )
+            async for chunk in iterator:
+                yield chunk
+        finally:
+            await cursor.close()
+
+    return StreamingResponse(content(), media_type=media_type)
+
+
+def payload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail=f'Limite de {max_bytes} bytes excedido',
+    )
+
+
+async def read_chunks(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    content_length = request.headers.get('content-length', '')
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise payload_too_large(max_bytes)
+
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise payload_too_large(max_bytes)
+        yield chunk
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    body = bytearray()
+    async for chunk in read_chunks(request, max_bytes):
+        body += chunk
+    return bytes(body)
+
+
+async def read_ndjson(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in read_chunks(request, max_bytes):
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b'\n', start)) != -1:
+            line = bytes(buffer[start:end])
+            start = end + 1
+            if line.strip():
+                yield line
+        # Só o trecho da última linha incompleta fica no buffer.
+        del buffer[:start]
+
+    if buffer.strip():
+        yield bytes(buffer)
@@ -0,0 +1,119 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self, total: float) -> bytes:
+        phases = [*self.phases.items(), ('app', total)]
+        return ', '.join(
+            f'{name};dur={seconds * 1000:.2f}' for name, seconds in phases
+        ).encode()
+
+
+# O objeto é compartilhado (não substituído) pelas dependências, então as
+# fases registradas em threads do executor também chegam ao middleware.
+request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    'request_timings', default=None
+)
+
+
+@contextmanager
+def phase(name: str):
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+# O driver chama o listener na task que executou o comando, então o
+# contextvar é o da requisição que fez a consulta.
+class QueryTimings(monitoring.CommandListener):
+    def __init__(self, timings: ContextVar = request_timings):
+        self.timings = timings
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.add(event)
+
+    def failed(self, event):
+        self.add(event)
+
+    def add(self, event):
+        timings = self.timings.get()
+        if timings is not None:
+            timings.add('db', event.duration_micros / 1_000_000)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app, slow_request_ms: float | None = None):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                header = timings.header(time.perf_counter() - start)
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (b'server-timing', header),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            self.log_slow_request(scope, status, timings, start)
+
+    def log_slow_request(self, scope, status, timings, start):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.slow_request_ms is None or elapsed_ms < self.slow_request_ms:
+            return
+
+        route = scope.get('route')
+        logger.warning(
+            json.dumps({
+                'event': 'slow_request',
+                'method': scope['method'],
+                'path': scope['path'],
+                'route': getattr(route, 'path', None),
+                'status': status,
+                'duration_ms': round(elapsed_ms, 2),
+                'phases_ms': {
+                    name: round(seconds * 1000, 2)
+                    for name, seconds in timings.phases.items()
+                },
+            })
+        )
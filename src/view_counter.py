@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from collections import Counter
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from src.pagination import decode_cursor, encode_cursor
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+VIEWS_FIELD = 'views'
+
+
+# Visualizações acumulam em memória e viram um `$inc` por manga num
+# bulk_write a cada `flush_seconds` ou ao chegar a `max_pending`. Uma queda
+# sem o lifespan perde no máximo o que estava pendente; um flush que falha
+# devolve os contadores ao buffer.
+class ViewCounter:
+    def __init__(self, flush_seconds: float, max_pending: int):
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.pending: Counter[str] = Counter()
+        self.pending_total = 0
+        self.collection: AsyncCollection | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    def increment(self, manga_id: str, amount: int = 1):
+        self.pending[manga_id] += amount
+        self.pending_total += amount
+        if self._wakeup is not None and self.pending_total >= self.max_pending:
+            self._wakeup.set()
+
+    def take(self) -> Counter[str]:
+        pending, self.pending = self.pending, Counter()
+        self.pending_total = 0
+        return pending
+
+    def restore(self, pending: Counter[str]):
+        self.pending.update(pending)
+        self.pending_total += pending.total()
+
+    def clear(self):
+        self.take()
+
+    async def flush(self, collection: AsyncCollection) -> int:
+        pending = self.take()
+        if not pending:
+            return 0
+
+        items = list(pending.items())
+        operations = [
+            UpdateOne({'_id': manga_id}, {'$inc': {VIEWS_FIELD: amount}})
+            for manga_id, amount in items
+        ]
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as error:
+            # Só as operações que falharam voltam; as outras já somaram.
+            self.restore(
+                Counter(
+                    dict(
+                        items[write_error['index']]
+                        for write_error in error.details['writeErrors']
+                    )
+                )
+            )
+            raise
+        except PyMongoError:
+            self.restore(pending)
+            raise
+        return len(operations)
+
+    def start(self, collection: AsyncCollection):
+        self.collection = collection
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        # Cancelar no meio de um flush perderia os contadores já retirados
+        # do buffer; o loop termina o flush em andamento e sai.
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        self._wakeup = None
+
+        try:
+            await self.flush(self.collection)
+        except PyMongoError as error:
+            logger.error(
+                'Visualizações perdidas no desligamento: %s (%s)',
+                self.pending_total,
+                error,
+            )
+
+    async def run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.flush_seconds
+                )
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush(self.collection)
+            except PyMongoError as error:
+                logger.warning('Falha ao gravar visualizações: %s', error)
+
+
+def encode_views_cursor(views: int, document_id: str) -> str:
+    return encode_cursor(f'{views}:{document_id}')
+
+
+def decode_views_cursor(cursor: str) -> tuple[int, str]:
+    views, _, document_id = decode_cursor(cursor).partition(':')
+    try:
+        return int(views), document_id
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Cursor inválido'
+        )
+
+
+async def find_popular(
+    collection: AsyncCollection,
+    limit: int,
+    after: str | None = None,
+    projection: dict | None = None,
+):
+    # Só entram mangas que já têm o campo; o primeiro flush de um manga
+    # antigo cria `views` e ele passa a aparecer.
+    query = {VIEWS_FIELD: {'$gte': 0}}
+    if after is not None:
+        views, document_id = decode_views_cursor(after)
+        query['$or'] = [
+            {VIEWS_FIELD: {'$lt': views}},
+            {VIEWS_FIELD: views, '_id': {'$gt': document_id}},
+        ]
+
+    documents = (
+        await collection
+        .find(query, projection)
+        .sort([(VIEWS_FIELD, -1), ('_id', 1)])
+        .limit(limit + 1)
+        .to_list()
+    )
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    return dict(
+        data=documents,
+        next_cursor=(
+            encode_views_cursor(
+                documents[-1][VIEWS_FIELD], documents[-1]['_id']
+            )
+            if has_more
+            else None
+        ),
+    )
+
+
+view_counter = ViewCounter(
+    flush_seconds=settings.VIEW_COUNTER_FLUSH_SECONDS,
+    max_pending=settings.VIEW_COUNTER_MAX_PENDING,
+)
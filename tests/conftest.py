@@ -7,17 +7,55 @@ from fastapi.testclient import TestClient
 from ulid import ulid
 
 from src.app import app
-from src.database import DBClient, get_db, get_db_client, get_user_collection
+from src.autocomplete import title_index
+from src.database import (
+    DBClient,
+    create_db_client,
+    create_indexes,
+    get_db,
+    get_manga_collection,
+    get_manga_counts_collection,
+    get_user_collection,
+)
+from src.facets import rebuild_facet_counts
+from src.rate_limit import login_ip_limiter, login_username_limiter
+from src.schemas.mangas import (
+    ContentRatingEnum,
+    DemographicEnum,
+    MangaType,
+    StateEnum,
+    StatusEnum,
+)
 from src.schemas.users import UserType
-from src.security import get_password_hash
+from src.security import (
+    get_password_hash,
+    principal_cache,
+    token_version_cache,
+)
+from src.settings import settings
+from src.view_counter import view_counter
 
 DB_TEST_NAME = 'test_mangify'
 
 
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
 @pytest.fixture
-def db_client():
-    client = get_db_client()
-    return client.get_database(DB_TEST_NAME)
+def timer() -> FakeTimer:
+    return FakeTimer()
+
+
+@pytest_asyncio.fixture
+async def db_client():
+    client = create_db_client()
+    yield client.get_database(DB_TEST_NAME)
+    await client.close()
 
 
 @pytest.fixture
@@ -28,6 +66,7 @@ def client():
     with TestClient(app) as c:
         app.dependency_overrides[get_db] = get_db_test
         yield c
+    app.dependency_overrides.clear()
 
 
 @pytest_asyncio.fixture
@@ -48,6 +87,105 @@ async def user(db_client) -> UserType:
     return user
 
 
+@pytest.fixture
+def make_manga():
+    # Documento completo como gravado no banco, sem inserir; cada teste
+    # sobrescreve só os campos que importam para ele.
+    def make(title: str, **fields) -> MangaType:
+        return (
+            MangaType(
+                _id=ulid(),
+                title=title,
+                alternatives_titles=[],
+                description=None,
+                original_language='ja',
+                publication_demographic=DemographicEnum.SEINEN,
+                status=StatusEnum.COMPLETED,
+                year=1990,
+                content_rating=ContentRatingEnum.SUGGESTIVE,
+                state=StateEnum.DRAFT,
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
+            )
+            | fields
+        )
+
+    return make
+
+
+@pytest_asyncio.fixture
+async def manga(db_client) -> MangaType:
+    collection = await get_manga_collection(db_client)
+    result = await collection.insert_one(
+        MangaType(
+            _id=ulid(),
+            title='Existing Manga',
+            alternatives_titles=['EM', 'ExistM'],
+            description='An existing manga description.',
+            original_language='ja',
+            publication_demographic=DemographicEnum.SHONEN,
+            status=StatusEnum.ONGOING,
+            year=2022,
+            content_rating=ContentRatingEnum.SAFE,
+            state=StateEnum.DRAFT,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    manga = await collection.find_one({'_id': result.inserted_id})
+    if manga is None:
+        pytest.fail('Failed to create test manga')
+    return manga
+
+
+@pytest_asyncio.fixture
+async def manga_other(db_client) -> MangaType:
+    collection = await get_manga_collection(db_client)
+    result = await collection.insert_one(
+        MangaType(
+            _id=ulid(),
+            title='Existing Other Manga',
+            alternatives_titles=['EM', 'ExistM'],
+            description='An existing manga description.',
+            original_language='ja',
+            publication_demographic=DemographicEnum.SHONEN,
+            status=StatusEnum.ONGOING,
+            year=2022,
+            content_rating=ContentRatingEnum.SAFE,
+            state=StateEnum.DRAFT,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    manga = await collection.find_one({'_id': result.inserted_id})
+    if manga is None:
+        pytest.fail('Failed to create test manga')
+    return manga
+
+
+@pytest.fixture
+def create_manga(client):
+    # Passa pela API, que também atualiza contadores e índice de títulos;
+    # a rota de bulk devolve o _id gerado.
+    def create(title: str, **fields) -> str:
+        response = client.post(
+            '/mangas/bulk',
+            json=[
+                dict(
+                    title=title,
+                    originalLanguage='ja',
+                    status='ongoing',
+                    contentRating='safe',
+                )
+                | fields
+            ],
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['created'][0]['id']
+
+    return create
+
+
 @pytest.fixture
 def token(client, user):
     response = client.post(
@@ -61,5 +199,28 @@ def token(client, user):
 
 @pytest_asyncio.fixture(autouse=True)
 async def clear_database():
-    client = get_db_client()
+    client = create_db_client()
     await client.drop_database(DB_TEST_NAME)
+    db = client.get_database(DB_TEST_NAME)
+    await create_indexes(db)
+    await rebuild_facet_counts(
+        await get_manga_collection(db), await get_manga_counts_collection(db)
+    )
+    await client.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    principal_cache.clear()
+    token_version_cache.clear()
+    login_ip_limiter.clear()
+    login_username_limiter.clear()
+    title_index.clear()
+    view_counter.clear()
+
+
+@pytest.fixture(autouse=True)
+def disable_autocomplete_preload(monkeypatch):
+    # O lifespan carregaria os títulos de DATABASE_NAME, não do banco de
+    # teste; os testes de autocomplete montam o índice explicitamente.
+    monkeypatch.setattr(settings, 'AUTOCOMPLETE_PRELOAD', False)
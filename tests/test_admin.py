@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest_asyncio
+
+from src.database import get_user_collection
+from src.schemas.users import RoleEnum, UserType
+
+
+@pytest_asyncio.fixture
+async def admin(db_client, user: UserType) -> UserType:
+    collection = await get_user_collection(db_client)
+    await collection.update_one(
+        {'_id': user['_id']}, {'$set': {'role': RoleEnum.ADMIN}}
+    )
+    return user
+
+
+def test_reload_policies(client, admin: UserType, token):
+    response = client.post(
+        '/admin/policies/reload',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Políticas recarregadas'}
+
+
+def test_reload_unknown_policy(client, admin: UserType, token):
+    response = client.post(
+        '/admin/policies/reload',
+        params={'resource_type': 'unknown'},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Política não encontrada'}
+
+
+def test_reload_policies_requires_admin(client, token):
+    response = client.post(
+        '/admin/policies/reload',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {'detail': 'Ação não autorizada'}
+
+
+def test_cache_stats(client, admin: UserType, token):
+    response = client.get(
+        '/admin/caches', headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.json()['data']) == {'principals', 'mangas'}
+    assert set(response.json()['data']['principals']) == {
+        'size',
+        'maxSize',
+        'hits',
+        'misses',
+    }
+
+
+def test_rebuild_facets(client, admin: UserType, token):
+    response = client.post(
+        '/admin/facets/rebuild',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['data']['total'] == 0
+
+
+def test_rebuild_facets_requires_admin(client, token):
+    response = client.post(
+        '/admin/facets/rebuild',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert response.status_code == HTTPStatus.FORBIDDEN
@@ -1,10 +1,20 @@
 from http import HTTPStatus
 
+import pytest
 from freezegun import freeze_time
 from jwt import encode
+from pymongo.monitoring import CommandListener
 from ulid import ulid
 
-from src.schemas.users import UserType
+from src.app import app
+from src.database import create_db_client, get_db_client
+from src.schemas.users import Principal, RoleEnum, UserType
+from src.security import (
+    get_dummy_hash,
+    get_token_claims,
+    password_hasher,
+    principal_cache,
+)
 from src.settings import settings
 
 
@@ -28,6 +38,38 @@ def test_login_for_access_token_invalid_credentials(client):
     assert response.json() == {'detail': 'Nome de usuário ou senha incorretos'}
 
 
+def test_login_unknown_user_still_verifies(client, monkeypatch):
+    verified = []
+
+    async def verify(plain_password, hashed_password):
+        verified.append(hashed_password)
+        return False
+
+    monkeypatch.setattr(password_hasher, 'verify', verify)
+    response = client.post(
+        '/auth/token',
+        data={'username': 'invaliduser', 'password': 'wrongpassword'},
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert verified == [get_dummy_hash()]
+
+
+def test_login_rate_limited_by_username(client, user: UserType):
+    for _ in range(settings.LOGIN_USERNAME_BURST):
+        response = client.post(
+            '/auth/token',
+            data={'username': user['username'], 'password': 'wrong'},
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user['username'], 'password': 'testpassword'},
+    )
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(response.headers['Retry-After']) >= 1
+
+
 def test_refresh_access_token(client, token):
     headers = {'Authorization': f'Bearer {token}'}
     response = client.post('/auth/refresh', headers=headers)
@@ -135,3 +177,140 @@ def test_malformed_token(client):
     assert response.json() == {
         'detail': 'Não foi possível validar as credenciais'
     }
+
+
+def test_get_me_uses_principal_cache(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/auth/me', headers=headers)
+    hits = principal_cache.hits
+
+    response = client.get('/auth/me', headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert principal_cache.hits == hits + 1
+
+
+def test_deleted_user_is_evicted_from_principal_cache(
+    client, token, user: UserType
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/auth/me', headers=headers).status_code == HTTPStatus.OK
+
+    response = client.delete(f'/users/{user["_id"]}', headers=headers)
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get('/auth/me', headers=headers)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_updated_user_is_reloaded_in_principal_cache(
+    client, token, user: UserType
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/auth/me', headers=headers)
+
+    response = client.put(
+        f'/users/{user["_id"]}',
+        json={'username': 'renamed'},
+        headers=headers,
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get('/auth/me', headers=headers)
+    assert response.json()['data']['username'] == 'renamed'
+
+
+class FindRecorder(CommandListener):
+    def __init__(self):
+        self.finds = 0
+
+    def started(self, event):
+        if event.command_name == 'find':
+            self.finds += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(settings, 'TOKEN_STATELESS', True)
+
+
+def test_get_token_claims_stateless(stateless):
+    user = Principal(id=ulid(), username='reader', role=RoleEnum.READER)
+    assert get_token_claims(user) == {
+        'sub': user.id,
+        'username': 'reader',
+        'role': 'reader',
+        'ver': 0,
+    }
+
+
+def test_get_token_claims_stateful():
+    user = Principal(id=ulid(), username='reader')
+    assert get_token_claims(user) == {'sub': user.id}
+
+
+def test_stateless_token_skips_database(client, stateless, token):
+    recorder = FindRecorder()
+    db_client = create_db_client(event_listeners=[recorder])
+    app.dependency_overrides[get_db_client] = lambda: db_client
+    headers = {'Authorization': f'Bearer {token}'}
+
+    assert client.post('/auth/refresh', headers=headers).status_code == (
+        HTTPStatus.OK
+    )
+    finds = recorder.finds
+    for _ in range(3):
+        response = client.post('/auth/refresh', headers=headers)
+        assert response.status_code == HTTPStatus.OK
+
+    assert recorder.finds == finds
+
+
+def test_stateless_token_revoked_by_password_change(
+    client, stateless, token, user: UserType
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.get('/auth/me', headers=headers).status_code == (
+        HTTPStatus.OK
+    )
+
+    response = client.put(
+        f'/users/{user["_id"]}',
+        json={'password': 'newpassword'},
+        headers=headers,
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.post('/auth/refresh', headers=headers)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_stateless_token_revoked_by_username_change(
+    client, stateless, token, user: UserType
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.put(
+        f'/users/{user["_id"]}',
+        json={'username': 'renamed'},
+        headers=headers,
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get('/auth/me', headers=headers)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_stateless_token_revoked_by_delete(
+    client, stateless, token, user: UserType
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.delete(f'/users/{user["_id"]}', headers=headers)
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.post('/auth/refresh', headers=headers)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
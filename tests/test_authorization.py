@@ -0,0 +1,100 @@
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from ulid import ulid
+
+from src.auth.authorization import (
+    AUTH_PATH,
+    EnforcerRegistry,
+    get_authorization,
+)
+from src.schemas.users import RoleEnum, UserDB
+
+
+def make_user(role: RoleEnum = RoleEnum.READER) -> UserDB:
+    return UserDB(
+        id=ulid(),
+        username=f'user-{ulid()}',
+        password='hash',
+        role=role,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def registry(tmp_path):
+    shutil.copytree(AUTH_PATH / 'models', tmp_path / 'models')
+    shutil.copytree(AUTH_PATH / 'policies', tmp_path / 'policies')
+    return EnforcerRegistry(tmp_path)
+
+
+def touch(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_enforcer(registry):
+    enforcer = await registry.get('user')
+    assert await registry.get('user') is enforcer
+
+
+@pytest.mark.asyncio
+async def test_registry_reloads_when_policy_changes(registry):
+    enforcer = await registry.get('user')
+    _, policy_path = registry.get_paths('user')
+    admin, reader = make_user(RoleEnum.ADMIN), make_user()
+    assert enforcer.enforce(admin, reader, 'update')
+
+    policy_path.write_text('p, admin, user, delete\n', encoding='utf-8')
+    touch(policy_path)
+
+    reloaded = await registry.get('user')
+    assert reloaded is not enforcer
+    assert not reloaded.enforce(admin, reader, 'update')
+
+
+@pytest.mark.asyncio
+async def test_registry_reloads_when_model_changes(registry):
+    enforcer = await registry.get('user')
+    model_path, _ = registry.get_paths('user')
+    touch(model_path)
+
+    assert await registry.get('user') is not enforcer
+
+
+@pytest.mark.asyncio
+async def test_registry_explicit_reload(registry):
+    enforcer = await registry.get('user')
+    assert await registry.reload() == ['user']
+    assert await registry.get('user') is not enforcer
+
+
+@pytest.mark.asyncio
+async def test_registry_ignores_working_directory(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    enforcer = await EnforcerRegistry().get('user')
+    assert enforcer is not None
+
+
+@pytest.mark.asyncio
+async def test_registry_unknown_resource_type(registry):
+    with pytest.raises(FileNotFoundError):
+        await registry.get('unknown')
+
+
+@pytest.mark.asyncio
+async def test_get_authorization_forbidden():
+    with pytest.raises(HTTPException) as exc_info:
+        await get_authorization(make_user(), make_user(), 'delete', 'user')
+    assert exc_info.value.detail == 'Ação não autorizada'
+
+
+@pytest.mark.asyncio
+async def test_get_authorization_allows_self():
+    user = make_user()
+    await get_authorization(user, user, 'delete', 'user')
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+
+from src.autocomplete import (
+    TitleIndex,
+    backfill_title_keys,
+    get_title_keys,
+    load_title_index,
+    normalize_title,
+    title_index,
+)
+from src.database import get_manga_collection
+from src.routers.mangas import update_title_keys
+
+
+def suggest(client, prefix, **params) -> list[str]:
+    response = client.get(
+        '/mangas/autocomplete', params={'prefix': prefix, **params}
+    )
+    assert response.status_code == HTTPStatus.OK
+    return [item['title'] for item in response.json()['data']]
+
+
+def test_normalize_title():
+    assert normalize_title('  Shingeki   no KYOJIN ') == 'shingeki no kyojin'
+    assert (
+        normalize_title('Pokémon Ａｄｖｅｎｔｕｒｅｓ') == 'pokemon adventures'
+    )
+    assert normalize_title('Straße') == 'strasse'
+
+
+def test_get_title_keys_deduplicates():
+    assert get_title_keys('Naruto', ['NARUTO', ' ', 'ナルト']) == [
+        'naruto',
+        'ナルト',
+    ]
+
+
+def test_title_index_search():
+    index = TitleIndex.build([
+        dict(_id='1', title='Dragon Ball', alternatives_titles=['DB']),
+        dict(_id='2', title='Dragon Quest', alternatives_titles=[]),
+        dict(_id='3', title='Drifters', alternatives_titles=['Dragon Drift']),
+    ])
+
+    assert index.search('dragon', 10) == [
+        dict(_id='1', title='Dragon Ball'),
+        dict(_id='3', title='Drifters'),
+        dict(_id='2', title='Dragon Quest'),
+    ]
+    assert index.search('dr', 2) == [
+        dict(_id='1', title='Dragon Ball'),
+        dict(_id='3', title='Drifters'),
+    ]
+    assert index.search('z', 10) == []
+
+
+def test_title_index_add_and_remove():
+    index = TitleIndex()
+    index.add('1', 'Monster', ['monster'])
+    index.add('2', 'Monster Musume', ['monster musume'])
+    index.add('1', 'Monster Perfect', ['monster perfect'])
+
+    assert [item['title'] for item in index.search('monster', 10)] == [
+        'Monster Musume',
+        'Monster Perfect',
+    ]
+
+    index.remove('2')
+    index.remove('unknown')
+    assert index.search('monster', 10) == [
+        dict(_id='1', title='Monster Perfect')
+    ]
+    assert len(index) == 1
+
+
+def test_title_index_replace_keeps_writes_made_during_build():
+    index = TitleIndex()
+    index.add('1', 'Monster', ['monster'])
+    index.start_journal()
+    # Estado lido do banco antes das escritas abaixo.
+    rebuilt = TitleIndex.build([
+        dict(_id='1', title='Monster', alternatives_titles=[]),
+        dict(_id='2', title='Pluto', alternatives_titles=[]),
+    ])
+    index.add('3', 'Monster Musume', ['monster musume'])
+    index.remove('2')
+
+    index.replace(rebuilt)
+
+    assert index.journal is None
+    assert [item['title'] for item in index.search('', 10)] == [
+        'Monster',
+        'Monster Musume',
+    ]
+
+
+def test_title_index_search_deduplicates_ids():
+    index = TitleIndex()
+    index.add('1', 'One Piece', ['one piece', 'one peace'])
+
+    assert index.search('one', 10) == [dict(_id='1', title='One Piece')]
+
+
+def test_autocomplete_cold_path(client, create_manga):
+    create_manga('Berserk', alternativesTitles=['ベルセルク'])
+    create_manga('Bleach')
+
+    assert not title_index.ready
+    assert suggest(client, 'BER') == ['Berserk']
+    assert suggest(client, 'ベル') == ['Berserk']
+    assert suggest(client, 'b', limit=1) == ['Berserk']
+    assert suggest(client, 'x') == []
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_warm_path_tracks_writes(
+    client, db_client, create_manga
+):
+    berserk = create_manga('Berserk')
+    create_manga('Bleach')
+    title_index.replace(
+        await load_title_index(await get_manga_collection(db_client))
+    )
+
+    assert suggest(client, 'b') == ['Berserk', 'Bleach']
+
+    create_manga('Blame!')
+    assert suggest(client, 'bl') == ['Blame!', 'Bleach']
+
+    client.put(f'/mangas/{berserk}', json=dict(title='Claymore'))
+    assert suggest(client, 'b') == ['Blame!', 'Bleach']
+    assert suggest(client, 'clay') == ['Claymore']
+
+    client.delete(f'/mangas/{berserk}')
+    assert suggest(client, 'clay') == []
+
+
+def test_autocomplete_updates_title_keys(client, create_manga):
+    manga_id = create_manga('Vagabond')
+    client.put(
+        f'/mangas/{manga_id}', json=dict(alternativesTitles=['Bagabondo'])
+    )
+
+    assert suggest(client, 'baga') == ['Vagabond']
+
+
+def test_autocomplete_validates_prefix(client):
+    response = client.get('/mangas/autocomplete', params={'prefix': ''})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert suggest(client, '   ') == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_title_keys(db_client):
+    collection = await get_manga_collection(db_client)
+    await collection.insert_many([
+        dict(_id='1', title='Akira', alternatives_titles=['AKIRA']),
+        dict(_id='2', title='Ajin', alternatives_titles=[], title_keys=[]),
+    ])
+
+    assert await backfill_title_keys(collection, batch_size=1) == 1
+    manga = await collection.find_one({'_id': '1'})
+    assert manga['title_keys'] == ['akira']
+
+
+@pytest.mark.asyncio
+async def test_update_title_keys_recomputes_stale_version(db_client):
+    collection = await get_manga_collection(db_client)
+    updated_at = datetime.now(timezone.utc)
+    await collection.insert_one(
+        dict(
+            _id='1',
+            title='Pluto',
+            alternatives_titles=[],
+            updated_at=updated_at,
+        )
+    )
+
+    # Outra atualização gravou Pluto depois da que renomeou para Monster.
+    await update_title_keys(
+        collection,
+        dict(_id='1', title='Monster', alternatives_titles=[]),
+        updated_at - timedelta(seconds=1),
+    )
+
+    document = await collection.find_one({'_id': '1'})
+    assert document['title_keys'] == ['pluto']
+    assert title_index.search('', 10) == [dict(_id='1', title='Pluto')]
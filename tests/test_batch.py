@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from ulid import ulid
+
+from src.batch import check_batch_ids
+from src.schemas.users import UserType
+from src.settings import settings
+
+
+def test_check_batch_ids_deduplicates():
+    assert check_batch_ids(['b', ' a ', '', 'b']) == ['b', 'a']
+
+
+def test_check_batch_ids_empty():
+    with pytest.raises(HTTPException) as exc_info:
+        check_batch_ids([' ', ''])
+    assert exc_info.value.detail == 'Informe ao menos um id'
+
+
+def test_check_batch_ids_limit(monkeypatch):
+    monkeypatch.setattr(settings, 'BATCH_MAX_IDS', 2)
+    with pytest.raises(HTTPException) as exc_info:
+        check_batch_ids(['a', 'b', 'c'])
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
+    assert exc_info.value.detail == 'Limite de 2 ids excedido'
+
+
+def test_batch_mangas_keeps_requested_order(client, create_manga):
+    naruto = create_manga('Naruto')
+    bleach = create_manga('Bleach')
+    unknown = ulid()
+
+    response = client.get(
+        '/mangas/batch', params={'ids': f'{bleach},{unknown},{naruto}'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [manga['title'] for manga in response.json()['data']] == [
+        'Bleach',
+        'Naruto',
+    ]
+    assert response.json()['missing'] == [unknown]
+
+
+def test_batch_mangas_by_body_with_fields(client, create_manga):
+    naruto = create_manga('Naruto')
+
+    response = client.post(
+        '/mangas/batch',
+        params={'fields': 'title'},
+        json={'ids': [naruto, naruto]},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'data': [{'id': naruto, 'title': 'Naruto'}],
+        'missing': [],
+    }
+
+
+def test_batch_users(client, user: UserType):
+    response = client.get(
+        '/users/batch', params={'ids': [user['_id'], 'unknown']}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [item['username'] for item in response.json()['data']] == [
+        user['username']
+    ]
+    assert 'password' not in response.json()['data'][0]
+    assert response.json()['missing'] == ['unknown']
+
+
+def test_batch_users_requires_ids(client):
+    response = client.post('/users/batch', json={'ids': []})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Informe ao menos um id'}
@@ -0,0 +1,115 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from src.schemas.mangas import MangaCreateInput, MangaType
+from src.settings import settings
+from src.streaming import NDJSON_MEDIA_TYPE
+
+
+def make_input(title: str) -> dict:
+    return MangaCreateInput(
+        title=title,
+        original_language='ja',
+        status='ongoing',
+        content_rating='safe',
+    ).model_dump(mode='json', by_alias=True)
+
+
+def test_bulk_create_mangas(client):
+    response = client.post(
+        '/mangas/bulk', json=[make_input('Bulk 1'), make_input('Bulk 2')]
+    )
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [item['index'] for item in body['created']] == [0, 1]
+    assert body['conflicts'] == []
+    assert body['errors'] == []
+
+    created = client.get(f'/mangas/{body["created"][1]["id"]}')
+    assert created.json()['data']['title'] == 'Bulk 2'
+
+
+def test_bulk_create_mangas_reports_each_item(client, manga: MangaType):
+    response = client.post(
+        '/mangas/bulk',
+        json=[
+            make_input('Bulk 1'),
+            {'title': 'Sem idioma'},
+            make_input(manga['title']),
+            make_input('Bulk 1'),
+            make_input('Bulk 2'),
+        ],
+    )
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [item['index'] for item in body['created']] == [0, 4]
+    assert body['conflicts'] == [
+        {'index': 2, 'detail': 'Manga com esse título já existe!'},
+        {'index': 3, 'detail': 'Manga com esse título já existe!'},
+    ]
+    assert [item['index'] for item in body['errors']] == [1]
+    assert {error['loc'][0] for error in body['errors'][0]['detail']} >= {
+        'originalLanguage',
+        'status',
+    }
+
+
+def test_bulk_create_mangas_ndjson(client):
+    lines = [json.dumps(make_input(f'Bulk {n}')) for n in range(3)]
+    response = client.post(
+        '/mangas/bulk',
+        content='\n'.join([*lines, '{invalido']).encode(),
+        headers={'Content-Type': NDJSON_MEDIA_TYPE},
+    )
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert [item['index'] for item in body['created']] == [0, 1, 2]
+    assert [item['index'] for item in body['errors']] == [3]
+
+
+@pytest.mark.parametrize('content', [b'', b'{"title": "x"}'])
+def test_bulk_create_mangas_invalid_body(client, content):
+    response = client.post('/mangas/bulk', content=content)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'O corpo deve ser uma lista JSON ou NDJSON'
+    }
+
+
+def test_bulk_create_mangas_too_many_items(client, monkeypatch):
+    monkeypatch.setattr(settings, 'BULK_MAX_ITEMS', 1)
+    response = client.post(
+        '/mangas/bulk', json=[make_input('Bulk 1'), make_input('Bulk 2')]
+    )
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {'detail': 'Limite de 1 itens excedido'}
+
+
+def test_bulk_create_mangas_in_batches(client, monkeypatch):
+    monkeypatch.setattr(settings, 'BULK_BATCH_SIZE', 2)
+    inputs = [make_input(f'Bulk {n}') for n in range(5)]
+    inputs.append(make_input('Bulk 0'))
+
+    response = client.post('/mangas/bulk', json=inputs)
+    body = response.json()
+    assert [item['index'] for item in body['created']] == [0, 1, 2, 3, 4]
+    assert [item['index'] for item in body['conflicts']] == [5]
+
+
+@pytest.mark.parametrize(
+    'content_type', [NDJSON_MEDIA_TYPE, 'application/json']
+)
+def test_bulk_create_mangas_body_too_large(client, monkeypatch, content_type):
+    monkeypatch.setattr(settings, 'BULK_MAX_ITEMS', 2)
+    monkeypatch.setattr(settings, 'BULK_MAX_ITEM_BYTES', 100)
+    lines = [json.dumps(make_input(f'Bulk {n}')) for n in range(2)]
+
+    response = client.post(
+        '/mangas/bulk',
+        content='\n'.join(lines).encode(),
+        headers={'Content-Type': content_type},
+    )
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {'detail': 'Limite de 200 bytes excedido'}
@@ -0,0 +1,46 @@
+from src.cache import TTLCache
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(max_size=2, ttl=10)
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    assert cache.stats() == dict(size=1, max_size=2, hits=1, misses=1)
+
+
+def test_cache_expires_entries(timer):
+    cache = TTLCache(max_size=2, ttl=10, timer=timer)
+    cache.set('a', 1)
+
+    timer.now = 9.9
+    assert cache.get('a') == 1
+    timer.now = 10
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3  # noqa: PLR2004
+
+
+def test_cache_invalidate():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set('a', 1)
+    cache.invalidate('a')
+    cache.invalidate('missing')
+    assert cache.get('a') is None
+
+
+def test_cache_disabled():
+    cache = TTLCache(max_size=2, ttl=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
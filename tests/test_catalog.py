@@ -0,0 +1,168 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import BulkWriteError
+from ulid import ulid
+
+from src.catalog import (
+    CatalogError,
+    export_collection,
+    get_compression,
+    import_collection,
+    iter_documents,
+    open_catalog,
+    read_checkpoint,
+    write_checkpoint,
+)
+from src.cli import main
+from src.database import get_manga_collection
+
+
+@pytest.mark.parametrize(
+    ('file_name', 'compression'),
+    [('mangas.ndjson', 'none'), ('mangas.ndjson.gz', 'gzip')],
+)
+def test_get_compression(tmp_path, file_name, compression):
+    assert get_compression(tmp_path / file_name) == compression
+
+
+@pytest.mark.parametrize('compression', ['none', 'gzip', 'zstd'])
+def test_open_catalog_round_trip(tmp_path, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    path = tmp_path / 'catalog.ndjson'
+    with open_catalog(path, 'w', compression) as output:
+        output.write('{"_id": "1"}\n')
+    with open_catalog(path, 'a', compression) as output:
+        output.write('{"_id": "2"}\n')
+
+    with open_catalog(path, 'r', compression) as source:
+        assert [
+            document['_id'] for document in iter_documents(source, None)
+        ] == [
+            '1',
+            '2',
+        ]
+
+
+def test_iter_documents_resumes_after_checkpoint(tmp_path):
+    path = tmp_path / 'catalog.ndjson'
+    path.write_text('{"_id": "1"}\n\n{"_id": "2"}\n{"_id": "3"}\n')
+    with open_catalog(path, 'r') as source:
+        assert [
+            document['_id'] for document in iter_documents(source, '1')
+        ] == [
+            '2',
+            '3',
+        ]
+
+
+class FailingCollection:
+    def __init__(self, fail_on_call: int, index: int):
+        self.calls = 0
+        self.fail_on_call = fail_on_call
+        self.index = index
+
+    async def bulk_write(self, operations, ordered):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise BulkWriteError({
+                'writeErrors': [
+                    {'index': self.index, 'code': 2, 'errmsg': 'invalid'}
+                ]
+            })
+
+
+class FakeDatabase:
+    def __init__(self, collection):
+        self.collection = collection
+
+    def get_collection(self, name):
+        return self.collection
+
+
+@pytest.mark.asyncio
+async def test_import_collection_reports_failing_offset(tmp_path):
+    path = tmp_path / 'catalog.ndjson'
+    path.write_text('{"_id": "1"}\n{"_id": "2"}\n{"_id": "3"}\n')
+    checkpoint = tmp_path / 'import.checkpoint'
+    database = FakeDatabase(FailingCollection(fail_on_call=2, index=0))
+
+    with (
+        open_catalog(path, 'r') as source,
+        pytest.raises(CatalogError) as exc_info,
+    ):
+        await import_collection(
+            database, 'mangas', source, batch_size=2, checkpoint=checkpoint
+        )
+
+    assert str(exc_info.value) == (
+        'Falha ao importar mangas no documento 2 (_id 3): invalid'
+    )
+    assert read_checkpoint(checkpoint) == '2'
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = tmp_path / 'checkpoint'
+    assert read_checkpoint(path) is None
+    assert read_checkpoint(None) is None
+
+    write_checkpoint(path, 'abc')
+    assert read_checkpoint(path) == 'abc'
+
+
+async def insert_mangas(db_client, *titles: str) -> list[dict]:
+    collection = await get_manga_collection(db_client)
+    documents = [
+        {
+            '_id': ulid(),
+            'title': title,
+            'created_at': datetime.now(timezone.utc),
+        }
+        for title in titles
+    ]
+    await collection.insert_many(documents)
+    return await collection.find().sort('_id', 1).to_list()
+
+
+@pytest.mark.asyncio
+async def test_export_and_import_collection(tmp_path, db_client):
+    mangas = await insert_mangas(db_client, 'Berserk', 'Vagabond')
+    path = tmp_path / 'mangas.ndjson.gz'
+    checkpoint = tmp_path / 'export.checkpoint'
+    with open_catalog(path, 'w') as output:
+        exported = await export_collection(
+            db_client, 'mangas', output, batch_size=1, checkpoint=checkpoint
+        )
+    assert exported == len(mangas)
+    assert read_checkpoint(checkpoint) == mangas[-1]['_id']
+
+    collection = await get_manga_collection(db_client)
+    await collection.delete_many({})
+    with open_catalog(path, 'r') as source:
+        imported = await import_collection(
+            db_client, 'mangas', source, batch_size=10
+        )
+    assert imported == len(mangas)
+    assert await collection.find().sort('_id', 1).to_list() == mangas
+
+
+@pytest.mark.asyncio
+async def test_export_resumes_from_checkpoint(tmp_path, db_client):
+    first, later = await insert_mangas(db_client, 'Berserk', 'Vagabond')
+    path = tmp_path / 'mangas.ndjson'
+    checkpoint = tmp_path / 'export.checkpoint'
+    write_checkpoint(checkpoint, first['_id'])
+
+    with open_catalog(path, 'w') as output:
+        exported = await export_collection(
+            db_client, 'mangas', output, batch_size=10, checkpoint=checkpoint
+        )
+    assert exported == 1
+    assert read_checkpoint(checkpoint) == later['_id']
+
+
+def test_cli_requires_known_collection(capsys):
+    with pytest.raises(SystemExit):
+        main(['export', 'chapters', 'out.ndjson'])
+    assert 'invalid choice' in capsys.readouterr().err
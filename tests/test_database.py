@@ -1,10 +1,100 @@
+from datetime import datetime, timezone
+
+import pytest
+from pymongo import AsyncMongoClient
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.monitoring import CommandListener
 
-from src.database import get_db, get_db_client
+from src.app import app
+from src.database import (
+    INDEXES,
+    create_db_client,
+    create_indexes,
+    get_db,
+    get_db_client,
+    get_manga_collection,
+    migrate_updated_at,
+)
+from src.settings import settings
 
 
 def test_get_database():
-    client = get_db_client()
+    client = create_db_client()
     db = get_db(client)
     assert db.name == 'mangify'
     assert isinstance(db, AsyncDatabase)
+
+
+def test_create_db_client_uses_settings():
+    client = create_db_client()
+    pool_options = client.options.pool_options
+    assert pool_options.max_pool_size == settings.DATABASE_MAX_POOL_SIZE
+    assert pool_options.min_pool_size == settings.DATABASE_MIN_POOL_SIZE
+
+
+def test_create_db_client_overrides():
+    client = create_db_client(maxPoolSize=7)
+    assert client.options.pool_options.max_pool_size == 7  # noqa: PLR2004
+
+
+def test_lifespan_shares_db_client(client):
+    db_client = app.state.db_client
+    assert isinstance(db_client, AsyncMongoClient)
+
+    client.get('/')
+    client.get('/')
+    assert app.state.db_client is db_client
+
+
+class CommandRecorder(CommandListener):
+    def __init__(self):
+        self.commands: list[str] = []
+
+    def started(self, event):
+        self.commands.append(event.command_name)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_create_indexes_is_idempotent(db_client):
+    await create_indexes(db_client)
+    await create_indexes(db_client)
+
+    for collection_name, indexes in INDEXES.items():
+        information = await db_client.get_collection(
+            collection_name
+        ).index_information()
+        for index in indexes:
+            assert index.document['name'] in information
+
+
+def test_request_path_sends_no_list_indexes(client):
+    recorder = CommandRecorder()
+    db_client = create_db_client(event_listeners=[recorder])
+    app.dependency_overrides[get_db_client] = lambda: db_client
+
+    client.get('/mangas/')
+    client.get('/users/')
+
+    assert 'find' in recorder.commands
+    assert 'listIndexes' not in recorder.commands
+    assert 'createIndexes' not in recorder.commands
+
+
+@pytest.mark.asyncio
+async def test_migrate_updated_at(db_client):
+    collection = await get_manga_collection(db_client)
+    updated_at = datetime(2024, 5, 1, 12, 30, 15, 123000, tzinfo=timezone.utc)
+    await collection.insert_many([
+        dict(_id='1', title='Legacy', updated_at=updated_at.isoformat()),
+        dict(_id='2', title='Current', updated_at=updated_at),
+    ])
+
+    assert await migrate_updated_at(collection, batch_size=1) == 1
+    manga = await collection.find_one({'_id': '1'})
+    assert manga['updated_at'] == updated_at.replace(tzinfo=None)
@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+
+from src.etag import (
+    ConditionalGet,
+    as_utc,
+    build_if_match_filter,
+    get_cache_headers,
+    if_match_satisfied,
+    legacy_version_pattern,
+    make_etag,
+    parse_etag,
+)
+
+DOCUMENT_ID = '01HX0000000000000000000000'
+UPDATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+DOCUMENT = {'_id': DOCUMENT_ID, 'updated_at': UPDATED_AT}
+ETAG = make_etag(DOCUMENT_ID, UPDATED_AT)
+
+
+def test_make_etag_round_trips_with_millisecond_precision():
+    assert parse_etag(ETAG) == (
+        DOCUMENT_ID,
+        UPDATED_AT.replace(microsecond=123000),
+    )
+    assert make_etag(DOCUMENT_ID, UPDATED_AT.replace(tzinfo=None)) == ETAG
+
+
+def test_parse_etag_rejects_weak_and_malformed_tags():
+    assert parse_etag(f'W/{ETAG}') is None
+    assert parse_etag('"abc.xyz"') is None
+    assert parse_etag('abc') is None
+
+
+def test_build_if_match_filter():
+    assert build_if_match_filter(None, DOCUMENT_ID) == {}
+    assert build_if_match_filter('*', DOCUMENT_ID) == {}
+    version, pattern = build_if_match_filter(f'"other.0", {ETAG}', DOCUMENT_ID)[
+        'updated_at'
+    ]['$in']
+    assert version == UPDATED_AT.replace(microsecond=123000)
+    assert pattern.match(UPDATED_AT.isoformat())
+    assert not pattern.match(UPDATED_AT.replace(microsecond=124000).isoformat())
+    assert build_if_match_filter(f'W/{ETAG}', DOCUMENT_ID) == {
+        'updated_at': {'$in': []}
+    }
+
+
+def test_legacy_version_pattern_without_fraction():
+    version = UPDATED_AT.replace(microsecond=0)
+    pattern = legacy_version_pattern(version)
+    assert pattern.match(version.isoformat())
+    assert pattern.match(version.replace(microsecond=400).isoformat())
+    assert not pattern.match(version.replace(microsecond=1000).isoformat())
+
+
+def test_if_match_satisfied():
+    assert if_match_satisfied(None, DOCUMENT_ID, UPDATED_AT)
+    assert if_match_satisfied('*', DOCUMENT_ID, UPDATED_AT)
+    assert if_match_satisfied(f'"x.0", {ETAG}', DOCUMENT_ID, UPDATED_AT)
+    assert not if_match_satisfied(f'"{DOCUMENT_ID}.0"', DOCUMENT_ID, UPDATED_AT)
+
+
+def test_get_cache_headers():
+    assert get_cache_headers(DOCUMENT) == {
+        'ETag': ETAG,
+        'Last-Modified': 'Wed, 01 May 2024 12:30:15 GMT',
+    }
+
+
+def test_legacy_string_updated_at():
+    legacy = {'_id': DOCUMENT_ID, 'updated_at': UPDATED_AT.isoformat()}
+    assert as_utc(legacy['updated_at']) == UPDATED_AT
+    assert get_cache_headers(legacy) == get_cache_headers(DOCUMENT)
+    assert ConditionalGet(ETAG, None).is_not_modified(legacy)
+    assert if_match_satisfied(ETAG, DOCUMENT_ID, legacy['updated_at'])
+
+
+def test_conditional_get_if_none_match():
+    assert not ConditionalGet(None, None).is_conditional
+    assert ConditionalGet(ETAG, None).is_not_modified(DOCUMENT)
+    assert ConditionalGet(f'W/{ETAG}', None).is_not_modified(DOCUMENT)
+    assert ConditionalGet('*', None).is_not_modified(DOCUMENT)
+    assert not ConditionalGet(f'"{DOCUMENT_ID}.0"', None).is_not_modified(
+        DOCUMENT
+    )
+
+
+def test_conditional_get_if_modified_since():
+    assert ConditionalGet(
+        None, 'Wed, 01 May 2024 12:30:15 GMT'
+    ).is_not_modified(DOCUMENT)
+    assert not ConditionalGet(
+        None, 'Wed, 01 May 2024 12:30:14 GMT'
+    ).is_not_modified(DOCUMENT)
+    assert not ConditionalGet(None, 'not a date').is_conditional
+
+
+def test_conditional_get_prefers_if_none_match():
+    conditional = ConditionalGet(
+        f'"{DOCUMENT_ID}.0"', 'Wed, 01 May 2024 12:30:15 GMT'
+    )
+    assert not conditional.is_not_modified(DOCUMENT)
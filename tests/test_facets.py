@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+
+from src.database import get_manga_collection, get_manga_counts_collection
+from src.facets import (
+    ensure_facet_counts,
+    facet_key,
+    get_facet_counts,
+    get_increments,
+    rebuild_facet_counts,
+)
+from src.schemas.mangas import StatusEnum
+
+
+def get_facets(client) -> dict:
+    response = client.get('/mangas/facets')
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['data']
+
+
+def test_facet_key():
+    assert facet_key(StatusEnum.ONGOING) == 'ongoing'
+    assert facet_key('safe') == 'safe'
+    assert facet_key(None) == 'none'
+
+
+def test_get_increments():
+    document = dict(status='ongoing', content_rating='safe', state='draft')
+    assert get_increments(document, -1) == {
+        'total': -1,
+        'status.ongoing': -1,
+        'content_rating.safe': -1,
+        'state.draft': -1,
+        'publication_demographic.none': -1,
+    }
+
+
+def test_facets_empty(client):
+    assert get_facets(client) == {
+        'total': 0,
+        'status': {},
+        'contentRating': {},
+        'state': {},
+        'publicationDemographic': {},
+    }
+
+
+def test_facets_track_writes(client, create_manga):
+    naruto = create_manga('Naruto', publicationDemographic='shonen')
+    client.post(
+        '/mangas/',
+        json=dict(
+            title='Monster',
+            originalLanguage='ja',
+            status='completed',
+            contentRating='safe',
+        ),
+    )
+    client.post(
+        '/mangas/bulk',
+        json=[
+            dict(
+                title='Berserk',
+                originalLanguage='ja',
+                status='hiatus',
+                contentRating='suggestive',
+            ),
+            dict(title='Invalid'),
+        ],
+    )
+
+    assert get_facets(client) == {
+        'total': 3,
+        'status': {'ongoing': 1, 'completed': 1, 'hiatus': 1},
+        'contentRating': {'safe': 2, 'suggestive': 1},
+        'state': {'draft': 3},
+        'publicationDemographic': {'shonen': 1, 'none': 2},
+    }
+
+    client.put(f'/mangas/{naruto}', json=dict(status='completed'))
+    client.put(f'/mangas/{naruto}', json=dict(description='Ninjas'))
+    client.delete(f'/mangas/{naruto}')
+
+    facets = get_facets(client)
+    assert facets['total'] == 2  # noqa: PLR2004
+    assert facets['status'] == {'ongoing': 0, 'completed': 1, 'hiatus': 1}
+    assert facets['publicationDemographic'] == {'shonen': 0, 'none': 2}
+
+
+def test_index_mangas_total_count(client, create_manga):
+    create_manga('Naruto')
+    create_manga('Monster', status='completed')
+    create_manga('Berserk', status='hiatus')
+
+    response = client.get('/mangas/')
+    assert response.headers['X-Total-Count'] == '3'
+
+    response = client.get(
+        '/mangas/', params={'status': ['ongoing', 'hiatus'], 'limit': 1}
+    )
+    assert response.headers['X-Total-Count'] == '2'
+
+    response = client.get(
+        '/mangas/', params={'status': 'ongoing', 'year_from': 2000}
+    )
+    assert 'X-Total-Count' not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_rebuild_facet_counts(client, db_client, create_manga):
+    create_manga('Naruto')
+    create_manga('Monster', status='completed')
+    counts = await get_manga_counts_collection(db_client)
+    await counts.delete_many({})
+    collection = await get_manga_collection(db_client)
+    await collection.insert_one(
+        dict(_id='1', title='Akira', status='completed')
+    )
+
+    await rebuild_facet_counts(collection, counts)
+
+    facets = await get_facet_counts(counts)
+    assert facets['total'] == 3  # noqa: PLR2004
+    assert facets['status'] == {'ongoing': 1, 'completed': 2}
+    assert facets['state'] == {'draft': 2, 'none': 1}
+
+
+@pytest.mark.asyncio
+async def test_total_count_waits_for_rebuild(client, db_client, create_manga):
+    counts = await get_manga_counts_collection(db_client)
+    await counts.delete_many({})
+    create_manga('Naruto')
+
+    response = client.get('/mangas/', params={'status': 'ongoing'})
+    assert 'X-Total-Count' not in response.headers
+
+    collection = await get_manga_collection(db_client)
+    assert await ensure_facet_counts(collection, counts)
+    assert not await ensure_facet_counts(collection, counts)
+
+    response = client.get('/mangas/', params={'status': 'ongoing'})
+    assert response.headers['X-Total-Count'] == '1'
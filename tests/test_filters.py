@@ -0,0 +1,155 @@
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+
+from src.database import get_manga_collection
+from src.routers.mangas import build_manga_filter
+from src.schemas.mangas import (
+    ContentRatingEnum,
+    DemographicEnum,
+    MangaFilters,
+    MangaType,
+    StateEnum,
+    StatusEnum,
+)
+
+
+@pytest_asyncio.fixture
+async def catalog(db_client, make_manga) -> list[MangaType]:
+    mangas = [make_manga(f'Manga {position}') for position in range(200)]
+    mangas += [
+        make_manga(
+            'Manga 200',
+            state=StateEnum.PUBLISHED,
+            content_rating=ContentRatingEnum.SAFE,
+            status=StatusEnum.ONGOING,
+            publication_demographic=DemographicEnum.SHONEN,
+            year=2020,
+        ),
+        make_manga(
+            'Manga 201',
+            state=StateEnum.PUBLISHED,
+            content_rating=ContentRatingEnum.SAFE,
+            status=StatusEnum.HIATUS,
+            year=2010,
+        ),
+    ]
+    collection = await get_manga_collection(db_client)
+    await collection.insert_many(mangas)
+    return mangas
+
+
+def plan_details(plan: dict) -> tuple[set[str], set[str]]:
+    stages, indexes = set(), set()
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+        elif isinstance(node, dict):
+            if 'stage' in node:
+                stages.add(node['stage'])
+            if 'indexName' in node:
+                indexes.add(node['indexName'])
+            pending.extend(node.values())
+    return stages, indexes
+
+
+def test_build_manga_filter():
+    filters = MangaFilters(
+        status=[StatusEnum.ONGOING, StatusEnum.HIATUS],
+        state=[StateEnum.PUBLISHED],
+        year_from=2000,
+        year_to=2020,
+    )
+    assert build_manga_filter(filters) == {
+        'status': {'$in': [StatusEnum.ONGOING, StatusEnum.HIATUS]},
+        'state': StateEnum.PUBLISHED,
+        'year': {'$gte': 2000, '$lte': 2020},
+    }
+
+
+def test_build_manga_filter_empty():
+    assert not build_manga_filter(MangaFilters())
+
+
+def test_index_mangas_filters_by_state_and_rating(client, catalog):
+    response = client.get(
+        '/mangas/', params={'state': 'published', 'content_rating': 'safe'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert [manga['title'] for manga in response.json()['data']] == [
+        'Manga 200',
+        'Manga 201',
+    ]
+
+
+def test_index_mangas_filters_multi_value(client, catalog):
+    response = client.get(
+        '/mangas/', params=[('status', 'ongoing'), ('status', 'hiatus')]
+    )
+    assert len(response.json()['data']) == 2  # noqa: PLR2004
+
+
+def test_index_mangas_filters_year_range(client, catalog):
+    response = client.get(
+        '/mangas/', params={'year_from': 2015, 'year_to': 2025}
+    )
+    assert [manga['title'] for manga in response.json()['data']] == [
+        'Manga 200'
+    ]
+
+
+def test_index_mangas_invalid_filter(client):
+    response = client.get('/mangas/', params={'status': 'unknown'})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ('filters', 'index_name'),
+    [
+        (
+            MangaFilters(
+                state=[StateEnum.PUBLISHED],
+                content_rating=[ContentRatingEnum.SAFE],
+            ),
+            'idx_state_content_rating',
+        ),
+        (
+            MangaFilters(
+                state=[StateEnum.PUBLISHED],
+                content_rating=[
+                    ContentRatingEnum.SAFE,
+                    ContentRatingEnum.SUGGESTIVE,
+                ],
+                status=[StatusEnum.ONGOING],
+            ),
+            None,
+        ),
+        (MangaFilters(status=[StatusEnum.ONGOING]), 'idx_status'),
+        (
+            MangaFilters(publication_demographic=[DemographicEnum.SHONEN]),
+            'idx_publication_demographic',
+        ),
+        (MangaFilters(year_from=2015), 'idx_year'),
+    ],
+)
+async def test_common_filters_use_indexes(
+    db_client, catalog, filters, index_name
+):
+    explanation = await (
+        await get_manga_collection(db_client)
+        .find(build_manga_filter(filters))
+        .sort('_id', 1)
+        .limit(21)
+        .explain()
+    )
+    stages, indexes = plan_details(explanation['queryPlanner']['winningPlan'])
+
+    assert 'COLLSCAN' not in stages
+    assert 'IXSCAN' in stages
+    assert indexes - {'_id_'}
+    if index_name is not None:
+        assert index_name in indexes
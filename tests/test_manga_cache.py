@@ -0,0 +1,255 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from pymongo import AsyncMongoClient, MongoClient
+from ulid import ulid
+
+from src.manga_cache import ChangeStreamWatcher, MangaCache
+
+REPLICA_SET_IMAGE = 'mongo:8.0'
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = 0
+        self.on_find = None
+
+    async def find_one(self, query):
+        self.calls += 1
+        document = self.documents.get(query['_id'])
+        if self.on_find is not None:
+            self.on_find()
+        return document
+
+
+def active_cache(max_size=2) -> MangaCache:
+    cache = MangaCache(max_size)
+    cache.ready = True
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_find_one_reads_through():
+    cache = active_cache()
+    collection = FakeCollection({'a': {'_id': 'a'}})
+
+    assert await cache.find_one(collection, 'a') == {'_id': 'a'}
+    assert await cache.find_one(collection, 'a') == {'_id': 'a'}
+    assert collection.calls == 1
+    assert await cache.find_one(collection, 'missing') is None
+
+
+@pytest.mark.asyncio
+async def test_find_one_bypasses_cache_until_ready():
+    cache = MangaCache(2)
+    collection = FakeCollection({'a': {'_id': 'a'}})
+
+    await cache.find_one(collection, 'a')
+    await cache.find_one(collection, 'a')
+    assert collection.calls == 2  # noqa: PLR2004
+    assert cache.stats()['size'] == 0
+
+
+@pytest.mark.asyncio
+async def test_find_one_discards_reads_raced_by_invalidation():
+    cache = active_cache()
+    collection = FakeCollection({'a': {'_id': 'a'}})
+    collection.on_find = lambda: cache.invalidate('a')
+
+    await cache.find_one(collection, 'a')
+    assert cache.stats()['size'] == 0
+
+
+def test_apply_change():
+    cache = active_cache()
+    cache.set('a', {'_id': 'a'}, cache.generation)
+    cache.set('b', {'_id': 'b'}, cache.generation)
+
+    cache.apply_change({'operationType': 'update', 'documentKey': {'_id': 'a'}})
+    assert cache.get('a') is None
+    assert cache.get('b') == {'_id': 'b'}
+
+    cache.apply_change({'operationType': 'drop'})
+    assert cache.stats()['size'] == 0
+
+
+def test_evicts_least_recently_used():
+    cache = active_cache(max_size=2)
+    for key in ('a', 'b'):
+        cache.set(key, {'_id': key}, cache.generation)
+    cache.get('a')
+    cache.set('c', {'_id': 'c'}, cache.generation)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'_id': 'a'}
+
+
+@pytest.fixture(scope='module')
+def replica_set_url():
+    container_module = pytest.importorskip('testcontainers.core.container')
+    docker_errors = pytest.importorskip('docker.errors')
+    container = (
+        container_module
+        .DockerContainer(REPLICA_SET_IMAGE)
+        .with_command('--replSet rs0 --bind_ip_all')
+        .with_exposed_ports(27017)
+    )
+    try:
+        container.start()
+    except docker_errors.DockerException as error:
+        pytest.skip(f'Docker indisponível: {error}')
+
+    try:
+        url = (
+            f'mongodb://{container.get_container_host_ip()}:'
+            f'{container.get_exposed_port(27017)}/?directConnection=true'
+        )
+        wait_for_primary(container, url)
+        yield url
+    finally:
+        container.stop()
+
+
+def wait_for_primary(container, url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    with MongoClient(url, serverSelectionTimeoutMS=1_000) as client:
+        while time.monotonic() < deadline:
+            container.exec([
+                'mongosh',
+                '--quiet',
+                '--eval',
+                'try { rs.status() } catch (e) { rs.initiate() }',
+            ])
+            try:
+                if client.admin.command('hello').get('isWritablePrimary'):
+                    return
+            except Exception:  # noqa: BLE001
+                pass
+            time.sleep(0.5)
+    pytest.fail('Replica set não ficou pronto')
+
+
+async def wait_until(condition, timeout: float = 10):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.05)
+
+
+@pytest_asyncio.fixture
+async def replica_collection(replica_set_url):
+    client = AsyncMongoClient(replica_set_url)
+    collection = client.get_database('test_mangify').get_collection(
+        f'mangas_{ulid()}'
+    )
+    yield collection
+    await collection.drop()
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_watcher_invalidates_updated_documents(replica_collection):
+    manga_id = ulid()
+    await replica_collection.insert_one({'_id': manga_id, 'title': 'A'})
+    cache = MangaCache(10)
+    watcher = ChangeStreamWatcher(replica_collection, cache)
+    watcher.start()
+    try:
+        await wait_until(lambda: cache.ready)
+        await cache.find_one(replica_collection, manga_id)
+        assert cache.stats()['size'] == 1
+
+        await replica_collection.update_one(
+            {'_id': manga_id}, {'$set': {'title': 'B'}}
+        )
+        await wait_until(lambda: cache.stats()['size'] == 0)
+        assert await cache.find_one(replica_collection, manga_id) == {
+            '_id': manga_id,
+            'title': 'B',
+        }
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_watcher_keeps_stale_views_in_cache(replica_collection):
+    viewed, edited = ulid(), ulid()
+    await replica_collection.insert_many([
+        {'_id': viewed, 'title': 'A', 'views': 0},
+        {'_id': edited, 'title': 'B', 'views': 0},
+    ])
+    cache = MangaCache(10)
+    watcher = ChangeStreamWatcher(replica_collection, cache)
+    watcher.start()
+    try:
+        await wait_until(lambda: cache.ready)
+        await cache.find_one(replica_collection, viewed)
+        await cache.find_one(replica_collection, edited)
+
+        await replica_collection.update_one(
+            {'_id': viewed}, {'$inc': {'views': 5}}
+        )
+        await replica_collection.update_one(
+            {'_id': edited}, {'$set': {'title': 'C'}}
+        )
+        await wait_until(lambda: cache.stats()['size'] == 1)
+        # Defasagem aceita: o cache segue com o views da carga.
+        assert cache.get(viewed) == {'_id': viewed, 'title': 'A', 'views': 0}
+        document = await replica_collection.find_one({'_id': viewed})
+        assert document['views'] == 5  # noqa: PLR2004
+
+        await replica_collection.update_one(
+            {'_id': viewed}, {'$set': {'title': 'D'}}
+        )
+        await wait_until(lambda: cache.stats()['size'] == 0)
+        document = await cache.find_one(replica_collection, viewed)
+        assert document['views'] == 5  # noqa: PLR2004
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_watcher_resumes_from_token(replica_collection):
+    manga_id = ulid()
+    await replica_collection.insert_one({'_id': manga_id, 'title': 'A'})
+    cache = MangaCache(10)
+    watcher = ChangeStreamWatcher(replica_collection, cache)
+    watcher.start()
+    await wait_until(lambda: cache.ready)
+    await cache.find_one(replica_collection, manga_id)
+    await watcher.stop()
+
+    await replica_collection.update_one(
+        {'_id': manga_id}, {'$set': {'title': 'B'}}
+    )
+    assert cache.stats()['size'] == 1
+
+    watcher = ChangeStreamWatcher(
+        replica_collection, cache, resume_token=watcher.resume_token
+    )
+    watcher.start()
+    try:
+        await wait_until(lambda: cache.ready)
+        assert cache.stats()['size'] == 0
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_watcher_clears_cache_on_drop(replica_collection):
+    manga_id = ulid()
+    await replica_collection.insert_one({'_id': manga_id, 'title': 'A'})
+    cache = MangaCache(10)
+    watcher = ChangeStreamWatcher(replica_collection, cache)
+    watcher.start()
+    try:
+        await wait_until(lambda: cache.ready)
+        await cache.find_one(replica_collection, manga_id)
+
+        await replica_collection.drop()
+        await wait_until(lambda: cache.stats()['size'] == 0)
+        await wait_until(lambda: cache.ready)
+    finally:
+        await watcher.stop()
@@ -1,18 +1,16 @@
-from datetime import datetime, timezone
 from http import HTTPStatus
 
 import pytest
-import pytest_asyncio
 from ulid import ulid
 
 from src.database import get_manga_collection
+from src.etag import make_etag
 from src.schemas.mangas import (
     ContentRatingEnum,
     DemographicEnum,
     MangaCreateInput,
     MangaType,
     MangaUpdateInput,
-    StateEnum,
     StatusEnum,
 )
 
@@ -31,60 +29,14 @@ def manga_data():
     )
 
 
-@pytest_asyncio.fixture
-async def manga(db_client) -> MangaType:
-    collection = await get_manga_collection(db_client)
-    result = await collection.insert_one(
-        MangaType(
-            _id=ulid(),
-            title='Existing Manga',
-            alternatives_titles=['EM', 'ExistM'],
-            description='An existing manga description.',
-            original_language='ja',
-            publication_demographic=DemographicEnum.SHONEN,
-            status=StatusEnum.ONGOING,
-            year=2022,
-            content_rating=ContentRatingEnum.SAFE,
-            state=StateEnum.DRAFT,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-        )
-    )
-    manga = await collection.find_one({'_id': result.inserted_id})
-    if manga is None:
-        pytest.fail('Failed to create test manga')
-    return manga
-
-
-@pytest_asyncio.fixture
-async def manga_other(db_client) -> MangaType:
-    collection = await get_manga_collection(db_client)
-    result = await collection.insert_one(
-        MangaType(
-            _id=ulid(),
-            title='Existing Other Manga',
-            alternatives_titles=['EM', 'ExistM'],
-            description='An existing manga description.',
-            original_language='ja',
-            publication_demographic=DemographicEnum.SHONEN,
-            status=StatusEnum.ONGOING,
-            year=2022,
-            content_rating=ContentRatingEnum.SAFE,
-            state=StateEnum.DRAFT,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-        )
-    )
-    manga = await collection.find_one({'_id': result.inserted_id})
-    if manga is None:
-        pytest.fail('Failed to create test manga')
-    return manga
-
-
 def test_index_mangas(client):
     response = client.get('/mangas/')
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'data': []}
+    assert response.json() == {
+        'data': [],
+        'nextCursor': None,
+        'previousCursor': None,
+    }
 
 
 def test_create_manga(client, manga_data):
@@ -130,12 +82,36 @@ def test_show_manga(client, manga: MangaType):
             'year': manga['year'],
             'contentRating': manga['content_rating'],
             'state': manga['state'],
+            'views': 0,
             'createdAt': manga['created_at'].isoformat(),
             'updatedAt': manga['updated_at'].isoformat(),
         }
     }
 
 
+@pytest.mark.asyncio
+async def test_show_manga_with_legacy_string_updated_at(
+    client, db_client, manga: MangaType
+):
+    collection = await get_manga_collection(db_client)
+    await collection.update_one(
+        {'_id': manga['_id']},
+        {'$set': {'updated_at': manga['updated_at'].isoformat()}},
+    )
+
+    response = client.get(f'/mangas/{manga["_id"]}')
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] == make_etag(
+        manga['_id'], manga['updated_at']
+    )
+
+    response = client.get(
+        f'/mangas/{manga["_id"]}',
+        headers={'If-None-Match': response.headers['ETag']},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
 def test_show_nonexistent_manga(client):
     response = client.get(f'/mangas/{ulid()}')
     assert response.status_code == HTTPStatus.NOT_FOUND
@@ -174,6 +150,80 @@ def test_update_nonexistent_manga(client):
     assert response.json() == {'detail': 'Manga não encontrado'}
 
 
+def test_show_manga_conditional_get(client, manga: MangaType):
+    response = client.get(f'/mangas/{manga["_id"]}')
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers['ETag']
+    assert etag == make_etag(manga['_id'], manga['updated_at'])
+
+    response = client.get(
+        f'/mangas/{manga["_id"]}', headers={'If-None-Match': etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+    assert not response.content
+
+    last_modified = response.headers['Last-Modified']
+    response = client.get(
+        f'/mangas/{manga["_id"]}', headers={'If-Modified-Since': last_modified}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = client.put(
+        f'/mangas/{manga["_id"]}', json=dict(title='Updated Manga Title')
+    )
+    response = client.get(
+        f'/mangas/{manga["_id"]}', headers={'If-None-Match': etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] != etag
+
+
+def test_show_manga_partial_has_etag(client, manga: MangaType):
+    response = client.get(f'/mangas/{manga["_id"]}?fields=title')
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] == make_etag(
+        manga['_id'], manga['updated_at']
+    )
+    assert response.json() == {
+        'data': {'id': manga['_id'], 'title': manga['title']}
+    }
+
+
+def test_update_manga_returns_etag(client, manga: MangaType):
+    response = client.put(
+        f'/mangas/{manga["_id"]}',
+        json=dict(title='Updated Manga Title'),
+        headers={'If-Match': make_etag(manga['_id'], manga['updated_at'])},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['ETag'] != make_etag(
+        manga['_id'], manga['updated_at']
+    )
+
+    response = client.put(
+        f'/mangas/{manga["_id"]}',
+        json=dict(title='Another Title'),
+        headers={'If-Match': response.headers['ETag']},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_update_manga_with_stale_etag(client, manga: MangaType):
+    response = client.put(
+        f'/mangas/{manga["_id"]}',
+        json=dict(title='Updated Manga Title'),
+        headers={'If-Match': '"0"'},
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+    assert response.json() == {
+        'detail': 'O recurso foi modificado por outra requisição'
+    }
+
+    response = client.get(f'/mangas/{manga["_id"]}')
+    assert response.json()['data']['title'] == manga['title']
+
+
 def test_delete_manga(client, manga: MangaType):
     response_delete = client.delete(f'/mangas/{manga["_id"]}')
     assert response_delete.status_code == HTTPStatus.OK
@@ -210,10 +260,13 @@ def test_index_mangas_with_existing(client, manga: MangaType):
                 'year': manga['year'],
                 'contentRating': manga['content_rating'],
                 'state': manga['state'],
+                'views': 0,
                 'createdAt': manga['created_at'].isoformat(),
                 'updatedAt': manga['updated_at'].isoformat(),
             }
-        ]
+        ],
+        'nextCursor': None,
+        'previousCursor': None,
     }
 
 
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import app
+from src.metrics import (
+    CommandMetrics,
+    Gauge,
+    Histogram,
+    PoolMetrics,
+    format_labels,
+    registry,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    registry.clear()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram('latency', 'Latência.', ('route',), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, '/a')
+
+    assert list(histogram.render()) == [
+        '# HELP latency Latência.',
+        '# TYPE latency histogram',
+        'latency_bucket{route="/a",le="0.1"} 2',
+        'latency_bucket{route="/a",le="1.0"} 3',
+        'latency_bucket{route="/a",le="+Inf"} 4',
+        'latency_sum{route="/a"} 3.65',
+        'latency_count{route="/a"} 4',
+    ]
+
+
+def test_gauge_inc_and_dec():
+    gauge = Gauge('connections', 'Conexões.', ('state',))
+    gauge.inc('open')
+    gauge.inc('open')
+    gauge.dec('open')
+    assert list(gauge.render())[-1] == 'connections{state="open"} 1'
+
+
+def test_format_labels_escapes_values():
+    assert format_labels(('a',), ('x"y\\z\n',)) == r'{a="x\"y\\z\n"}'
+
+
+def test_mongodb_listeners():
+    duration = Histogram('commands', 'Comandos.', ('command', 'outcome'))
+    listener = CommandMetrics(duration)
+    listener.succeeded(
+        SimpleNamespace(duration_micros=1500, command_name='find')
+    )
+    listener.failed(SimpleNamespace(duration_micros=10, command_name='insert'))
+    assert duration.series[('find', 'succeeded')][1] == pytest.approx(0.0015)
+    assert duration.series[('insert', 'failed')][2] == 1
+
+    checkout = Histogram('checkout', 'Checkout.', ('outcome',))
+    connections = Gauge('connections', 'Conexões.', ('state',))
+    pool = PoolMetrics(checkout, connections)
+    pool.connection_created(None)
+    pool.connection_checked_out(SimpleNamespace(duration=0.002))
+    assert connections.values == {('open',): 1, ('checked_out',): 1}
+    pool.connection_checked_in(None)
+    assert connections.values[('checked_out',)] == 0
+
+
+def test_metrics_endpoint_uses_route_templates():
+    client = TestClient(app)
+    client.get('/')
+    client.get('/does-not-exist')
+
+    response = client.get('/metrics')
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'mangify_http_request_duration_seconds_count'
+        '{method="GET",route="/",status="200"} 1'
+    ) in response.text
+    assert 'route="<unmatched>",status="404"' in response.text
+    assert 'mangify_http_requests_in_progress 1' in response.text
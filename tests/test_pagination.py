@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from ulid import ulid
+
+from src.database import get_manga_collection
+from src.pagination import decode_cursor, encode_cursor
+from src.schemas.mangas import (
+    ContentRatingEnum,
+    MangaType,
+    StateEnum,
+    StatusEnum,
+)
+from src.settings import settings
+
+
+@pytest_asyncio.fixture
+async def manga_ids(db_client) -> list[str]:
+    collection = await get_manga_collection(db_client)
+    ids = sorted(ulid() for _ in range(5))
+    await collection.insert_many([
+        MangaType(
+            _id=manga_id,
+            title=f'Manga {position}',
+            alternatives_titles=[],
+            description=None,
+            original_language='ja',
+            publication_demographic=None,
+            status=StatusEnum.ONGOING,
+            year=None,
+            content_rating=ContentRatingEnum.SAFE,
+            state=StateEnum.DRAFT,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+        for position, manga_id in enumerate(ids)
+    ])
+    return ids
+
+
+def page_ids(response) -> list[str]:
+    return [manga['id'] for manga in response.json()['data']]
+
+
+def test_cursor_round_trip():
+    manga_id = ulid()
+    assert decode_cursor(encode_cursor(manga_id)) == manga_id
+
+
+def test_paginate_forward(client, manga_ids):
+    first = client.get('/mangas/', params={'limit': 2})
+    assert first.status_code == HTTPStatus.OK
+    assert page_ids(first) == manga_ids[:2]
+    assert first.json()['previousCursor'] is None
+
+    second = client.get(
+        '/mangas/',
+        params={'limit': 2, 'after': first.json()['nextCursor']},
+    )
+    assert page_ids(second) == manga_ids[2:4]
+
+    last = client.get(
+        '/mangas/',
+        params={'limit': 2, 'after': second.json()['nextCursor']},
+    )
+    assert page_ids(last) == manga_ids[4:]
+    assert last.json()['nextCursor'] is None
+    assert last.json()['previousCursor'] is not None
+
+
+def test_paginate_backward(client, manga_ids):
+    response = client.get(
+        '/mangas/',
+        params={'limit': 2, 'before': encode_cursor(manga_ids[4])},
+    )
+    assert page_ids(response) == manga_ids[2:4]
+
+    previous = client.get(
+        '/mangas/',
+        params={'limit': 2, 'before': response.json()['previousCursor']},
+    )
+    assert page_ids(previous) == manga_ids[:2]
+    assert previous.json()['previousCursor'] is None
+    assert previous.json()['nextCursor'] == encode_cursor(manga_ids[1])
+
+
+def test_paginate_default_limit(client, manga_ids):
+    response = client.get('/mangas/')
+    assert len(response.json()['data']) == min(
+        len(manga_ids), settings.PAGE_SIZE_DEFAULT
+    )
+
+
+def test_paginate_limit_above_max(client):
+    response = client.get(
+        '/mangas/', params={'limit': settings.PAGE_SIZE_MAX + 1}
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize('cursor', ['%%%', 'gA'])
+def test_paginate_invalid_cursor(client, cursor):
+    response = client.get('/users/', params={'after': cursor})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Cursor inválido'}
+
+
+def test_paginate_both_cursors(client):
+    cursor = encode_cursor(ulid())
+    response = client.get('/users/', params={'after': cursor, 'before': cursor})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {
+        'detail': 'Use apenas um dos cursores: after ou before'
+    }
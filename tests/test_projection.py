@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from src.projection import FieldSelection, get_partial_schema, parse_fields
+from src.schemas.mangas import MangaSchema, MangaType
+from src.schemas.users import UserSchema, UserType
+
+
+def test_parse_fields_accepts_names_and_aliases():
+    assert parse_fields('title, contentRating,status', MangaSchema) == (
+        'content_rating',
+        'id',
+        'status',
+        'title',
+    )
+    assert parse_fields('content_rating', MangaSchema) == (
+        'content_rating',
+        'id',
+    )
+
+
+def test_parse_fields_without_fields():
+    assert parse_fields(None, MangaSchema) is None
+
+
+def test_parse_fields_invalid_field():
+    with pytest.raises(HTTPException) as exc_info:
+        parse_fields('username,password', UserSchema)
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
+    assert exc_info.value.detail == 'Campo inválido: password'
+
+
+def test_field_selection_projection():
+    selection = FieldSelection(MangaSchema, ('id', 'title'))
+    assert selection.projection == {'_id': 1, 'title': 1}
+    assert set(selection.schema.model_fields) == {'id', 'title'}
+
+
+def test_field_selection_excluded_fields():
+    selection = FieldSelection(UserSchema, None, excluded=('password',))
+    assert selection.projection == {'password': 0}
+    assert selection.schema is UserSchema
+
+
+def test_partial_schema_is_cached():
+    fields = ('id', 'title')
+    assert get_partial_schema(MangaSchema, fields) is get_partial_schema(
+        MangaSchema, fields
+    )
+
+
+def test_index_mangas_with_fields(client, manga: MangaType):
+    response = client.get(
+        '/mangas/', params={'fields': 'title,status,contentRating'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'nextCursor': None,
+        'previousCursor': None,
+        'data': [
+            {
+                'id': manga['_id'],
+                'title': manga['title'],
+                'status': manga['status'],
+                'contentRating': manga['content_rating'],
+            }
+        ],
+    }
+
+
+def test_show_manga_with_fields(client, manga: MangaType):
+    response = client.get(f'/mangas/{manga["_id"]}', params={'fields': 'title'})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'data': {'id': manga['_id'], 'title': manga['title']}
+    }
+
+
+def test_show_manga_with_invalid_field(client, manga: MangaType):
+    response = client.get(
+        f'/mangas/{manga["_id"]}', params={'fields': 'titulo'}
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Campo inválido: titulo'}
+
+
+def test_show_user_with_fields(client, user: UserType):
+    response = client.get(
+        f'/users/{user["_id"]}', params={'fields': 'username'}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'data': {'id': user['_id'], 'username': user['username']}
+    }
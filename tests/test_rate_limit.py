@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from src.rate_limit import ConcurrencyLimiter, RateLimiter, too_many_requests
+
+
+def test_rate_limiter_allows_burst_then_refills(timer):
+    limiter = RateLimiter(rate=0.5, burst=2, max_keys=10, timer=timer)
+
+    assert limiter.acquire('a') == 0
+    assert limiter.acquire('a') == 0
+    assert limiter.acquire('a') == pytest.approx(2)
+    assert limiter.acquire('b') == 0
+
+    timer.now = 2
+    assert limiter.acquire('a') == 0
+    assert limiter.acquire('a') == pytest.approx(2)
+
+
+def test_rate_limiter_memory_is_bounded(timer):
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2, timer=timer)
+    for key in ('a', 'b', 'c'):
+        limiter.acquire(key)
+
+    assert len(limiter) == 2  # noqa: PLR2004
+    # 'a' foi despejada e volta com o balde cheio.
+    assert limiter.acquire('a') == 0
+    assert limiter.acquire('c') > 0
+
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(rate=0, burst=0, max_keys=10)
+    assert not limiter.enabled
+    assert all(limiter.acquire('a') == 0 for _ in range(100))
+    assert len(limiter) == 0
+
+
+def test_too_many_requests_rounds_retry_after_up():
+    error = too_many_requests(0.2)
+    assert error.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert error.headers == {'Retry-After': '1'}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limiter_rejects_when_full():
+    limiter = ConcurrencyLimiter(1)
+    async with limiter:
+        with pytest.raises(HTTPException) as exc_info:
+            async with limiter:
+                pass
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert limiter.active == 0
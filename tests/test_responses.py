@@ -0,0 +1,40 @@
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from src.responses import ModelResponse, get_adapter
+from src.schemas.mangas import MangaList, MangaResponse
+
+BERSERK = dict(
+    alternatives_titles=['ベルセルク'],
+    updated_at=datetime(2024, 5, 1, 12, 30),
+    password='ignored',
+)
+
+
+def test_model_response_matches_response_model_serialization(make_manga):
+    page = dict(
+        data=[make_manga('Berserk', **BERSERK), make_manga('Vagabond')],
+        next_cursor='abc',
+    )
+    response = ModelResponse(MangaList, page)
+
+    expected = jsonable_encoder(MangaList.model_validate(page), by_alias=True)
+    assert json.loads(response.body) == expected
+    assert set(expected['data'][0]) >= {'alternativesTitles', 'createdAt'}
+    assert expected['nextCursor'] == 'abc'
+    assert response.media_type == 'application/json'
+
+
+def test_model_response_keeps_headers_and_unicode(make_manga):
+    document = make_manga('Berserk', **BERSERK)
+    response = ModelResponse(
+        MangaResponse, dict(data=document), headers={'ETag': '"x"'}
+    )
+    assert response.headers['ETag'] == '"x"'
+    assert 'ベルセルク'.encode() in response.body
+
+
+def test_adapter_is_cached():
+    assert get_adapter(MangaList) is get_adapter(MangaList)
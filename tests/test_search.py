@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from ulid import ulid
+
+from src.database import get_manga_collection
+from src.pagination import encode_cursor
+from src.schemas.mangas import (
+    ContentRatingEnum,
+    MangaType,
+    StateEnum,
+    StatusEnum,
+)
+from src.search import decode_search_cursor, encode_search_cursor
+
+PUBLISHED = dict(
+    publication_demographic=None,
+    status=StatusEnum.ONGOING,
+    year=None,
+    content_rating=ContentRatingEnum.SAFE,
+    state=StateEnum.PUBLISHED,
+)
+
+
+@pytest_asyncio.fixture
+async def catalog(db_client, make_manga) -> list[MangaType]:
+    mangas = [
+        make_manga(
+            'Dragon Quest', description='Aventura clássica.', **PUBLISHED
+        ),
+        make_manga(
+            'Slime Story',
+            alternatives_titles=['Dragon Slime'],
+            description='Um slime curioso.',
+            **PUBLISHED,
+        ),
+        make_manga(
+            'Cooking Days',
+            description='Receitas com carne de dragon.',
+            **PUBLISHED,
+        ),
+        make_manga('Quiet Garden', description='Nada a ver.', **PUBLISHED),
+    ]
+    collection = await get_manga_collection(db_client)
+    await collection.insert_many(mangas)
+    return mangas
+
+
+def test_search_cursor_round_trip():
+    manga_id = ulid()
+    assert decode_search_cursor(encode_search_cursor(1.25, manga_id)) == (
+        1.25,
+        manga_id,
+    )
+
+
+def test_search_cursor_invalid():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_search_cursor(encode_cursor('score:id'))
+    assert exc_info.value.detail == 'Cursor inválido'
+
+
+def test_search_ranks_by_text_score(client, catalog):
+    response = client.get('/mangas/search', params={'q': 'dragon'})
+    assert response.status_code == HTTPStatus.OK
+    assert [manga['title'] for manga in response.json()['data']] == [
+        'Dragon Quest',
+        'Slime Story',
+        'Cooking Days',
+    ]
+    assert response.json()['nextCursor'] is None
+
+
+def test_search_paginates(client, catalog):
+    titles = []
+    params = {'q': 'dragon', 'limit': 1, 'fields': 'title'}
+    while True:
+        response = client.get('/mangas/search', params=params)
+        assert response.status_code == HTTPStatus.OK
+        page = response.json()
+        titles += [manga['title'] for manga in page['data']]
+        assert all(set(manga) == {'id', 'title'} for manga in page['data'])
+        if page['nextCursor'] is None:
+            break
+        params['after'] = page['nextCursor']
+
+    assert titles == ['Dragon Quest', 'Slime Story', 'Cooking Days']
+
+
+def test_search_without_results(client, catalog):
+    response = client.get('/mangas/search', params={'q': 'inexistente'})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['data'] == []
+
+
+def test_search_requires_query(client):
+    response = client.get('/mangas/search', params={'q': ''})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -1,7 +1,12 @@
+import asyncio
+from http import HTTPStatus
+
 import pytest
+from fastapi import HTTPException
 from pwdlib.exceptions import UnknownHashError
 
 from src.security import (  # ajuste o import conforme seu projeto
+    PasswordHasher,
     get_password_hash,
     verify_password,
 )
@@ -44,3 +49,29 @@ def test_verify_password_with_invalid_hash():
         ),
     ):
         verify_password(password, fake_hash)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_hash_and_verify():
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+    hashed = await hasher.hash('senha123')
+
+    assert await hasher.verify('senha123', hashed) is True
+    assert await hasher.verify('senha_errada', hashed) is False
+    assert hasher.pending == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=1, max_queue=0)
+    running = asyncio.create_task(hasher.hash('senha123'))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.hash('outra_senha')
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert exc_info.value.headers == {'Retry-After': '1'}
+    assert isinstance(await running, str)
+    hasher.shutdown()
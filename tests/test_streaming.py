@@ -0,0 +1,117 @@
+import json
+from datetime import datetime, timezone
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from ulid import ulid
+
+from src.schemas.users import RoleEnum, UserSchema, UserType
+from src.settings import settings
+from src.streaming import (
+    NDJSON_MEDIA_TYPE,
+    iter_json_array,
+    iter_ndjson,
+    read_ndjson,
+)
+
+
+def make_users(count: int) -> list[dict]:
+    return [
+        dict(
+            _id=ulid(),
+            username=f'user-{position}',
+            role=RoleEnum.READER,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+        for position in range(count)
+    ]
+
+
+async def as_async(documents):
+    for document in documents:
+        yield document
+
+
+async def collect(iterator) -> bytes:
+    return b''.join([chunk async for chunk in iterator])
+
+
+def make_request(chunks: list[bytes]):
+    return SimpleNamespace(headers={}, stream=lambda: as_async(chunks))
+
+
+@pytest.mark.asyncio
+async def test_read_ndjson_joins_lines_across_chunks():
+    request = make_request([b'{"a": 1}\n{"b"', b': 2}\n\n', b'{"c": 3}'])
+    lines = [line async for line in read_ndjson(request, max_bytes=100)]
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+@pytest.mark.asyncio
+async def test_read_ndjson_rejects_large_body():
+    request = make_request([b'{"a": 1}\n', b'{"b": 2}\n'])
+    with pytest.raises(HTTPException) as exc_info:
+        _ = [line async for line in read_ndjson(request, max_bytes=12)]
+    assert exc_info.value.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_writes_one_document_per_line():
+    users = make_users(settings.STREAM_BATCH_SIZE + 1)
+    chunks = [chunk async for chunk in iter_ndjson(as_async(users), UserSchema)]
+    assert len(chunks) == 2  # noqa: PLR2004
+
+    lines = b''.join(chunks).decode().splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [
+        user['_id'] for user in users
+    ]
+    assert 'createdAt' in json.loads(lines[0])
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array():
+    users = make_users(3)
+    body = json.loads(
+        await collect(iter_json_array(as_async(users), UserSchema))
+    )
+    assert [user['id'] for user in body['data']] == [
+        user['_id'] for user in users
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_empty():
+    body = await collect(iter_json_array(as_async([]), UserSchema))
+    assert json.loads(body) == {'data': []}
+
+
+def test_index_users_ndjson(client, user: UserType):
+    response = client.get('/users/', headers={'Accept': NDJSON_MEDIA_TYPE})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == NDJSON_MEDIA_TYPE
+
+    lines = response.text.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == {
+        'id': user['_id'],
+        'username': user['username'],
+        'role': RoleEnum.READER,
+        'createdAt': user['created_at'].isoformat(),
+        'updatedAt': user['updated_at'].isoformat(),
+    }
+
+
+def test_index_users_stream_json_array(client, user: UserType):
+    response = client.get('/users/', params={'stream': True})
+    assert response.status_code == HTTPStatus.OK
+    assert [item['id'] for item in response.json()['data']] == [user['_id']]
+    assert 'nextCursor' not in response.json()
+
+
+def test_index_mangas_ndjson_empty(client):
+    response = client.get('/mangas/', headers={'Accept': NDJSON_MEDIA_TYPE})
+    assert response.status_code == HTTPStatus.OK
+    assert not response.text
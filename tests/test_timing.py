@@ -0,0 +1,87 @@
+import json
+import logging
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.responses import ModelResponse
+from src.schemas.base import MessageResponse
+from src.timing import (
+    QueryTimings,
+    RequestTimings,
+    ServerTimingMiddleware,
+    phase,
+    request_timings,
+)
+
+
+def create_app(slow_request_ms: float | None = None) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware, slow_request_ms=slow_request_ms)
+
+    @app.get('/items/{item_id}')
+    async def show_item(item_id: str):
+        with phase('jwt'):
+            pass
+        QueryTimings().succeeded(SimpleNamespace(duration_micros=2_000))
+        return ModelResponse(MessageResponse, dict(message=item_id))
+
+    return app
+
+
+def test_phase_without_request_is_noop():
+    with phase('jwt'):
+        pass
+    assert request_timings.get() is None
+
+
+def test_phase_accumulates():
+    timings = RequestTimings()
+    token = request_timings.set(timings)
+    try:
+        with phase('db'):
+            pass
+        with phase('db'):
+            pass
+    finally:
+        request_timings.reset(token)
+    assert list(timings.phases) == ['db']
+
+
+def test_header_format():
+    timings = RequestTimings()
+    timings.add('jwt', 0.0001)
+    timings.add('db', 0.002)
+    assert timings.header(0.01) == b'jwt;dur=0.10, db;dur=2.00, app;dur=10.00'
+
+
+def test_server_timing_header():
+    client = TestClient(create_app())
+    response = client.get('/items/1')
+
+    phases = [
+        entry.split(';')[0]
+        for entry in response.headers['Server-Timing'].split(', ')
+    ]
+    assert phases == ['jwt', 'db', 'serialize', 'app']
+    assert 'db;dur=2.00' in response.headers['Server-Timing']
+
+
+def test_slow_request_log(caplog):
+    client = TestClient(create_app(slow_request_ms=0))
+    with caplog.at_level(logging.WARNING, logger='src.timing'):
+        client.get('/items/1')
+
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry['event'] == 'slow_request'
+    assert entry['route'] == '/items/{item_id}'
+    assert entry['status'] == 200  # noqa: PLR2004
+    assert set(entry['phases_ms']) == {'jwt', 'db', 'serialize'}
+
+
+def test_fast_request_is_not_logged(caplog):
+    client = TestClient(create_app(slow_request_ms=60_000))
+    with caplog.at_level(logging.WARNING, logger='src.timing'):
+        client.get('/items/1')
+    assert not caplog.records
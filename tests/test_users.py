@@ -3,6 +3,7 @@ from http import HTTPStatus
 import pytest
 from ulid import ulid
 
+from src.etag import make_etag
 from src.schemas.users import UserCreateInput, UserType, UserUpdateInput
 
 
@@ -14,7 +15,11 @@ def user_data():
 def test_index_users(client):
     response = client.get('/users')
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'data': []}
+    assert response.json() == {
+        'data': [],
+        'nextCursor': None,
+        'previousCursor': None,
+    }
 
 
 def test_create_user(client, user_data):
@@ -53,6 +58,17 @@ def test_show_nonexistent_user(client):
     assert response.json() == {'detail': 'Usuário não encontrado'}
 
 
+def test_show_user_conditional_get(client, user: UserType):
+    response = client.get(f'/users/{user["_id"]}')
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get(
+        f'/users/{user["_id"]}',
+        headers={'If-None-Match': response.headers['ETag']},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
 def test_update_user(client, user: UserType):
     new_username = 'updateduser'
     response_update = client.put(
@@ -113,6 +129,26 @@ def test_update_user_nothing_changed(client, user: UserType):
     assert response.json() == {'detail': 'Nada a ser atualizado!'}
 
 
+def test_update_user_with_stale_etag(client, user: UserType, token: str):
+    response = client.put(
+        f'/users/{user["_id"]}',
+        json=UserUpdateInput(username='updateduser').model_dump(),
+        headers={'Authorization': f'Bearer {token}', 'If-Match': '"0"'},
+    )
+    assert response.status_code == HTTPStatus.PRECONDITION_FAILED
+
+    response = client.put(
+        f'/users/{user["_id"]}',
+        json=UserUpdateInput(username='updateduser').model_dump(),
+        headers={
+            'Authorization': f'Bearer {token}',
+            'If-Match': make_etag(user['_id'], user['updated_at']),
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert 'ETag' in response.headers
+
+
 def test_delete_user(client, user: UserType):
     response = client.delete(f'/users/{user["_id"]}')
     assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,186 @@
+import asyncio
+from contextlib import suppress
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from src.database import get_manga_collection
+from src.view_counter import (
+    ViewCounter,
+    decode_views_cursor,
+    encode_views_cursor,
+    view_counter,
+)
+
+
+class FakeCollection:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.writes: list[list[UpdateOne]] = []
+
+    async def bulk_write(self, operations, ordered):
+        assert not ordered
+        if self.error is not None:
+            raise self.error
+        self.writes.append(operations)
+
+
+def inc(manga_id: str, amount: int) -> UpdateOne:
+    return UpdateOne({'_id': manga_id}, {'$inc': {'views': amount}})
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_increments():
+    counter = ViewCounter(flush_seconds=60, max_pending=100)
+    collection = FakeCollection()
+    for manga_id in ['a', 'b', 'a', 'a']:
+        counter.increment(manga_id)
+
+    assert await counter.flush(collection) == 2  # noqa: PLR2004
+    assert collection.writes == [[inc('a', 3), inc('b', 1)]]
+    assert await counter.flush(collection) == 0
+    assert collection.writes == [[inc('a', 3), inc('b', 1)]]
+
+
+@pytest.mark.asyncio
+async def test_flush_failure_keeps_counts():
+    counter = ViewCounter(flush_seconds=60, max_pending=100)
+    counter.increment('a', 2)
+
+    with pytest.raises(AutoReconnect):
+        await counter.flush(FakeCollection(AutoReconnect('down')))
+
+    assert counter.pending == {'a': 2}
+    assert counter.pending_total == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_flush_partial_failure_keeps_failed_counts():
+    counter = ViewCounter(flush_seconds=60, max_pending=100)
+    counter.increment('a', 2)
+    counter.increment('b', 5)
+    error = BulkWriteError({'writeErrors': [{'index': 1, 'code': 1}]})
+
+    with pytest.raises(BulkWriteError):
+        await counter.flush(FakeCollection(error))
+
+    assert counter.pending == {'b': 5}
+
+
+@pytest.mark.asyncio
+async def test_crash_loses_at_most_max_pending():
+    counter = ViewCounter(flush_seconds=60, max_pending=10)
+    collection = FakeCollection()
+    counter.start(collection)
+
+    for amount in [10, 10, 5]:
+        for _ in range(amount):
+            counter.increment('a')
+        await asyncio.sleep(0.01)
+
+    # Simula a queda: a task morre sem o flush do lifespan.
+    counter._task.cancel()
+    with suppress(asyncio.CancelledError):
+        await counter._task
+    assert collection.writes == [[inc('a', 10)], [inc('a', 10)]]
+    assert counter.pending_total == 5  # noqa: PLR2004
+    assert counter.pending_total < counter.max_pending
+
+
+@pytest.mark.asyncio
+async def test_periodic_flush():
+    counter = ViewCounter(flush_seconds=0.01, max_pending=100)
+    collection = FakeCollection()
+    counter.start(collection)
+    counter.increment('a')
+
+    await asyncio.sleep(0.05)
+    await counter.stop()
+
+    assert collection.writes == [[inc('a', 1)]]
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending():
+    counter = ViewCounter(flush_seconds=60, max_pending=100)
+    collection = FakeCollection()
+    counter.start(collection)
+    counter.increment('a')
+    counter.increment('b')
+
+    await counter.stop()
+
+    assert collection.writes == [[inc('a', 1), inc('b', 1)]]
+    assert not counter.pending
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_flush_in_progress():
+    class SlowCollection(FakeCollection):
+        async def bulk_write(self, operations, ordered):
+            started.set()
+            await asyncio.sleep(0.01)
+            await super().bulk_write(operations, ordered)
+
+    started = asyncio.Event()
+    counter = ViewCounter(flush_seconds=60, max_pending=1)
+    collection = SlowCollection()
+    counter.start(collection)
+    counter.increment('a')
+    await started.wait()
+
+    await counter.stop()
+
+    assert collection.writes == [[inc('a', 1)]]
+    assert not counter.pending
+
+
+def test_views_cursor_round_trip():
+    assert decode_views_cursor(encode_views_cursor(42, 'abc')) == (42, 'abc')
+
+
+def test_views_cursor_invalid():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_views_cursor(encode_views_cursor('x', 'abc'))
+    assert exc_info.value.detail == 'Cursor inválido'
+
+
+def test_show_manga_not_modified_is_not_a_view(client, create_manga):
+    manga_id = create_manga('Naruto')
+    response = client.get(f'/mangas/{manga_id}')
+    assert view_counter.pending == {manga_id: 1}
+
+    response = client.get(
+        f'/mangas/{manga_id}',
+        headers={'If-None-Match': response.headers['ETag']},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert view_counter.pending == {manga_id: 1}
+
+
+@pytest.mark.asyncio
+async def test_show_manga_counts_views(client, db_client, create_manga):
+    naruto = create_manga('Naruto')
+    bleach = create_manga('Bleach')
+    create_manga('Monster')
+    for manga_id in [naruto, bleach, naruto, naruto]:
+        client.get(f'/mangas/{manga_id}')
+
+    await view_counter.flush(await get_manga_collection(db_client))
+
+    response = client.get(f'/mangas/{naruto}')
+    assert response.json()['data']['views'] == 3  # noqa: PLR2004
+
+    response = client.get('/mangas/popular', params={'limit': 2})
+    assert [
+        (manga['title'], manga['views']) for manga in response.json()['data']
+    ] == [('Naruto', 3), ('Bleach', 1)]
+
+    response = client.get(
+        '/mangas/popular', params={'after': response.json()['nextCursor']}
+    )
+    assert [manga['title'] for manga in response.json()['data']] == ['Monster']
+    assert response.json()['nextCursor'] is None